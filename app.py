@@ -17,341 +17,524 @@ Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
 '''
 
 
-import json
-import re
+import time
 
-import google.generativeai as genai
 import pandas as pd
-import plotly.express as px
 import streamlit as st
 
-from config import GEMINI_API_KEY
-from scrapers.cost_of_living import fetch_pittsburgh_cost_of_living
+from config import GEMINI_API_KEY, STUDENTS_PATH, EXPENSES_PATH
+from scrapers.cost_of_living import load_cost_of_living
+from scrapers.loans import MAX_PLAUSIBLE_APR, fetch_loans_overview
 # NEW IMPORTS for student expense audit + comparison
 from scrapers.cost_of_living import (
+    ledger_monthly,
     render_cost_of_living_comparison
 )
-from scrapers.news import fetch_news
-from utils.tuition import (
-    load_tuition_excel,
-    normalize_tuition_units,
-    dedupe_tuition,
-    filter_by_school_and_known_units
+from services.budget_engine import optimize_budget, SPENDING_CATEGORIES
+from services.cashflow import CashFlow
+from services.cohort_stats import get_cohort_stats, flatten_monthly
+from services.gemini_client import build_chat_prompt, configure_gemini
+from services.repayment import (
+    income_driven_plan, principal_from_student, rates_from_loans_overview,
+    simulate_variable_rate, standard_plan, summarize_paths,
 )
+from utils.lazy import lazy_import
+from utils.metrics import REGISTRY, record_llm
+from utils.sources import describe_age
+from utils.roster import load_roster
+from utils.students import student_segments
+from utils.tracing import span, start_trace, finish_trace, trace_frame
+from utils.tuition import load_tuition, get_tuition_for_student
+from utils.tuition_diff import academic_years, diff_academic_years, diff_crawls, shares_fees, summarize_diff
+
+# Heavy subsystems load on first use: the Gemini SDK only when a chat message
+# is sent, Plotly only when a chart is drawn. The News page, the multi-city
+# comparison and the Admin page import their modules inside their branches.
+# Check the cold-start cost with: python -m benchmarks.startup_imports
+genai = lazy_import("google.generativeai")
+px = lazy_import("plotly.express")
+
+# Every rerun is traced; sections below open nested spans (see utils/tracing.py)
+rerun_trace = start_trace("rerun")
+try:
+    # ------------------------------------
+    #  Streamlit Setup
+    # ------------------------------------
+    st.set_page_config(page_title="🎓 brok@CMU", layout="wide")
+    st.markdown(
+        "<h1 style='text-align:center; color:#A40000;'>CMU Student Financial Advisor Dashboard</h1>",
+        unsafe_allow_html=True
+    )
+
+    # ------------------------------------
+    #  Load Data
+    # ------------------------------------
+    with span("load data"):
+        # One column-wise copy per process, shared by every session
+        roster = load_roster(STUDENTS_PATH, EXPENSES_PATH)
+        # Latest crawl from the refresher, else the preprocessed Excel file
+        tuition_clean = load_tuition()
+
+    # ------------------------------------
+    #  Sidebar Navigation
+    # ------------------------------------
+    st.sidebar.header("🎓 Select Student")
+    student_row = st.sidebar.selectbox("Choose Student", range(len(roster)), format_func=roster.name)
+    student = roster.student(student_row)
+    selected_name = roster.name(student_row)
+    expense_record = roster.expense_for(student_row)
+    # Hidden admin page: append ?admin=1 to the URL
+    nav_pages = ["Overview", "News"]
+    if st.query_params.get("admin") == "1":
+        nav_pages.append("Admin")
+    page = st.sidebar.radio("Navigate", nav_pages)
+
+    # ------------------------------------
+    #  Helper Functions
+    # ------------------------------------
+    def fmt_money(x):
+        try:
+            return f"${float(x):,.0f}"
+        except:
+            return "—"
+
+    # ------------------------------------
+    #  Overview Page (Merged with Finances)
+    # ------------------------------------
+    if page == "Overview":
+        prog = student.get("program", {})
+        fin = student.get("financials", {})
+        tuition_df, matched_key = get_tuition_for_student(tuition_clean, student)
 
-# ------------------------------------
-#  Streamlit Setup
-# ------------------------------------
-st.set_page_config(page_title="🎓 brok@CMU", layout="wide")
-st.markdown(
-    "<h1 style='text-align:center; color:#A40000;'>CMU Student Financial Advisor Dashboard</h1>",
-    unsafe_allow_html=True
-)
-
-# ------------------------------------
-#  Load Data
-# ------------------------------------
-STUDENTS_PATH = "data/cmu_mock_students.json"
-TUITION_PATH  = "data/cmu_tuition_clean_processed.xlsx"
-
-students = json.load(open(STUDENTS_PATH))
-tuition_raw = load_tuition_excel(TUITION_PATH)
-tuition_clean = dedupe_tuition(normalize_tuition_units(tuition_raw))
-
-# NEW: Load student expense audit data
-EXPENSES_PATH = "data/cmu_mock_expenses_audit.json"
-student_expenses = json.load(open(EXPENSES_PATH))
-
-# ------------------------------------
-#  Sidebar Navigation
-# ------------------------------------
-st.sidebar.header("🎓 Select Student")
-student_names = [s.get("name", "Unknown") for s in students]
-selected_name = st.sidebar.selectbox("Choose Student", student_names)
-student = next(s for s in students if s.get("name") == selected_name)
-expense_record = next((e for e in student_expenses if e.get("name") == selected_name), None)
-page = st.sidebar.radio("Navigate", ["Overview", "News"])
-
-# ------------------------------------
-#  Helper Functions
-# ------------------------------------
-def fmt_money(x):
-    try:
-        return f"${float(x):,.0f}"
-    except:
-        return "—"
-
-def extract_numeric(val):
-    """Extract numeric value from strings like '$1,200' or '58.8 miles'."""
-    if pd.isna(val):
-        return None
-    s = re.sub(r"[\$,]", "", str(val))
-    match = re.search(r"(\d+(\.\d+)?)", s)
-    return float(match.group(1)) if match else None
-
-def get_student_keywords(student):
-    p = student.get("program", {})
-    kws = set()
-    for key in ["school", "department", "level"]:
-        v = p.get(key)
-        if v:
-            kws.add(v.lower())
-    for c in p.get("courses", []):
-        kws.add(re.sub(r"\W+", " ", c.lower()))
-    return list(kws)
-
-def get_tuition_for_student(df, student):
-    p = student.get("program", {})
-    school, dept = p.get("school", ""), p.get("department", "")
-    subset = filter_by_school_and_known_units(df, school, dept)
-    if not subset.empty:
-        return subset, school
-    for kw in get_student_keywords(student):
-        match = df[df["program"].astype(str).str.contains(kw, case=False, na=False)]
-        if not match.empty:
-            return match, kw
-    return pd.DataFrame(columns=df.columns), "—"
-
-# ------------------------------------
-#  Overview Page (Merged with Finances)
-# ------------------------------------
-if page == "Overview":
-    prog = student.get("program", {})
-    fin = student.get("financials", {})
-    tuition_df, matched_key = get_tuition_for_student(tuition_clean, student)
-
-    st.subheader(f"👤 {student.get('name','—')}")
-    c1, c2, c3 = st.columns(3)
-    with c1:
-        st.markdown(f"**ID:** {student.get('student_id','—')}")
-        st.markdown(f"**Email:** {student.get('email','—')}")
-        st.markdown(f"**Nationality:** {student.get('nationality','—')}")
-    with c2:
-        st.markdown(f"**School:** {prog.get('school','—')}")
-        st.markdown(f"**Department:** {prog.get('department','—')}")
-        st.markdown(f"**Level:** {prog.get('level','—')}")
-    with c3:
-        st.markdown(f"**GPA:** {prog.get('gpa','—')}")
-        st.markdown(f"**Expected Grad:** {prog.get('expected_grad_year','—')}")
-        st.markdown(f"**Status:** {student.get('status','—')}")
-    st.markdown("**Courses:** " + ", ".join(prog.get("courses", []) or ["—"]))
-    st.divider()
-
-    # ---- Finances Tabs ----
-    tab1, tab2, tab3 = st.tabs(["🎓 Scholarships & Invoices", "🏙️ Cost of Living", "📊 Tuition"])
-
-    # ---- Scholarships ----
-    with tab1:
-        st.markdown("#### Financial Summary")
-        tuition_sem = fin.get("tuition_per_semester", 0)
-        schol = fin.get("scholarship") or {}
-        schol_amt = schol.get("amount", 0)
-        schol_type = schol.get("type", "—")
-        schol_pct = round((schol_amt / tuition_sem) * 100, 2) if tuition_sem else 0
+        st.subheader(f"👤 {student.get('name','—')}")
         c1, c2, c3 = st.columns(3)
-        with c1: st.metric("Tuition / Semester", fmt_money(tuition_sem))
-        with c2: st.metric("Scholarship", f"{fmt_money(schol_amt)} ({schol_pct}%)", schol_type)
+        with c1:
+            st.markdown(f"**ID:** {student.get('student_id','—')}")
+            st.markdown(f"**Email:** {student.get('email','—')}")
+            st.markdown(f"**Nationality:** {student.get('nationality','—')}")
+        with c2:
+            st.markdown(f"**School:** {prog.get('school','—')}")
+            st.markdown(f"**Department:** {prog.get('department','—')}")
+            st.markdown(f"**Level:** {prog.get('level','—')}")
         with c3:
-            assistantship = fin.get("assistantship")
-
-            if isinstance(assistantship, dict):
-                role = assistantship.get("role", "—")
-                stipend = assistantship.get("stipend", 0)
-                st.metric("Assistantship", fmt_money(stipend), role)
-            elif assistantship:
-                st.metric("Assistantship", assistantship)
+            st.markdown(f"**GPA:** {prog.get('gpa','—')}")
+            st.markdown(f"**Expected Grad:** {prog.get('expected_grad_year','—')}")
+            st.markdown(f"**Status:** {student.get('status','—')}")
+        st.markdown("**Courses:** " + ", ".join(prog.get("courses", []) or ["—"]))
+        st.divider()
+
+        # ---- Finances Tabs ----
+        tab1, tab2, tab3, tab4 = st.tabs(["🎓 Scholarships & Invoices", "🏙️ Cost of Living", "📊 Tuition", "👥 Peers"])
+
+        # ---- Scholarships ----
+        with tab1, span("tab: scholarships"):
+            st.markdown("#### Financial Summary")
+            tuition_sem = fin.get("tuition_per_semester", 0)
+            schol = fin.get("scholarship") or {}
+            schol_amt = schol.get("amount", 0)
+            schol_type = schol.get("type", "—")
+            schol_pct = round((schol_amt / tuition_sem) * 100, 2) if tuition_sem else 0
+            c1, c2, c3 = st.columns(3)
+            with c1: st.metric("Tuition / Semester", fmt_money(tuition_sem))
+            with c2: st.metric("Scholarship", f"{fmt_money(schol_amt)} ({schol_pct}%)", schol_type)
+            with c3:
+                assistantship = fin.get("assistantship")
+
+                if isinstance(assistantship, dict):
+                    role = assistantship.get("role", "—")
+                    stipend = assistantship.get("stipend", 0)
+                    st.metric("Assistantship", fmt_money(stipend), role)
+                elif assistantship:
+                    st.metric("Assistantship", assistantship)
+                else:
+                    st.metric("Assistantship", "—")
+
+            inv_df = pd.DataFrame(fin.get("invoices", []))
+            if not inv_df.empty:
+                inv_df["due"] = inv_df["due"].apply(fmt_money)
+                inv_df["paid"] = inv_df["paid"].apply(fmt_money)
+                inv_df["balance"] = inv_df["balance"].apply(fmt_money)
+                st.dataframe(inv_df, use_container_width=True)
+
+            st.markdown("#### 📈 Cash-Flow Forecast")
+            with span("cash-flow forecast"):
+                cf_key = f"cashflow:{selected_name}"
+                if cf_key not in st.session_state:
+                    st.session_state[cf_key] = CashFlow.for_student(student, expense_record)
+                cashflow = st.session_state[cf_key]
+                current_spend = float(-cashflow.streams["living"][0]) if len(cashflow.months) else 0.0
+                spend = st.number_input("Monthly spending (USD)", min_value=0.0, value=current_spend, step=50.0,
+                                        key=f"{cf_key}:spend")
+                cashflow.set_monthly_spend(spend)  # only months whose spend changed are recomputed
+                cf_df = cashflow.to_frame()
+                if not cf_df.empty:
+                    st.line_chart(cf_df["balance"], height=260)
+                    low = cf_df["balance"].idxmin()
+                    st.caption(f"Projected balance through graduation: lowest {fmt_money(cf_df['balance'].min())} "
+                               f"in {low:%b %Y}, {fmt_money(cf_df['balance'].iloc[-1])} at {cf_df.index[-1]:%b %Y}.")
+
+            st.markdown("#### 💳 Loan Repayment")
+            with span("loan repayment"):
+                loans_df = fetch_loans_overview()
+                rates = rates_from_loans_overview(loans_df)
+                if age_note := describe_age(loans_df):
+                    st.caption(f"⏳ {age_note}")
+                lr_key = f"loans:{selected_name}"
+                c1, c2, c3 = st.columns(3)
+                with c1:
+                    principal = st.slider("Amount borrowed (USD)", 0, 300_000, step=1_000, key=f"{lr_key}:principal",
+                                          value=min(300_000, int(round(principal_from_student(student), -3))))
+                with c2:
+                    # Scraped rates can reach MAX_PLAUSIBLE_APR; a default outside the range would raise
+                    apr = st.slider("APR (%)", 0.0, MAX_PLAUSIBLE_APR, step=0.05, key=f"{lr_key}:apr",
+                                    value=min(MAX_PLAUSIBLE_APR, max(0.0, float(round(rates["federal_fixed"], 2)))))
+                with c3:
+                    term = st.slider("Term (years)", 5, 25, 10, key=f"{lr_key}:term")
+                income = st.slider("Starting salary (USD / year)", 20_000, 250_000, 85_000, step=5_000,
+                                   key=f"{lr_key}:income")
+                plan = standard_plan(principal, apr, term).iloc[0]
+                idr = income_driven_plan(principal, apr, income).iloc[0]
+                paths = summarize_paths(simulate_variable_rate(principal, apr, years=term, n_paths=20_000, seed=0),
+                                        principal)
+                c1, c2, c3 = st.columns(3)
+                with c1:
+                    st.metric("Standard plan / month", fmt_money(plan["monthly_payment"]),
+                              f"{fmt_money(plan['total_interest'])} interest", delta_color="off")
+                with c2:
+                    st.metric("Income-driven / month (year 1)", fmt_money(idr["first_monthly_payment"]),
+                              f"{fmt_money(idr['forgiven'])} forgiven", delta_color="off")
+                with c3:
+                    st.metric("Variable rate, median total", fmt_money(paths["p50"]),
+                              f"{fmt_money(paths['p5'])}–{fmt_money(paths['p95'])} (90%)", delta_color="off")
+                st.caption("Borrowed amount defaults to net tuition for every semester of the program. "
+                           "Variable-rate outcomes simulate yearly APR moves from the chosen starting rate.")
+
+        # ---- Cost of Living ----
+        with tab2, span("tab: cost of living"):
+            cost_model = load_cost_of_living()
+            st.markdown("### 💵 Your Monthly Spending vs. Pittsburgh Average")
+            if age_note := describe_age(cost_model.items):
+                st.caption(f"⏳ {age_note}")
+
+            if expense_record:
+                render_cost_of_living_comparison(student, expense_record, cost_model)
+
+                st.markdown("### 🎯 Suggested Monthly Plan")
+                with span("optimize budget"):
+                    plan = optimize_budget(student, expense_record, dict(cost_model.category_avg),
+                                           monthly=dict(cost_model.monthly))
+                plan_df = pd.DataFrame({
+                    "Category": SPENDING_CATEGORIES + ["Savings"],
+                    "Plan": [plan[f"plan_{c.lower()}"] for c in SPENDING_CATEGORIES] + [plan["plan_savings"]],
+                    "Change": [plan[f"change_{c.lower()}"] for c in SPENDING_CATEGORIES] + [None],
+                })
+                st.dataframe(plan_df.style.format({"Plan": "${:,.0f}", "Change": "{:+,.0f}"}, na_rep="—"),
+                             use_container_width=True, hide_index=True)
+                st.caption(f"Closest plan to your current spending within {fmt_money(plan['income'])}/month income, "
+                           f"keeping a {fmt_money(plan['savings_target'])} savings target and Pittsburgh minimums.")
+                if not plan["feasible"]:
+                    st.warning(f"Income can't cover Pittsburgh minimums plus savings; short by {fmt_money(plan['shortfall'])}/month.")
             else:
-                st.metric("Assistantship", "—")
-
-        inv_df = pd.DataFrame(fin.get("invoices", []))
-        if not inv_df.empty:
-            inv_df["due"] = inv_df["due"].apply(fmt_money)
-            inv_df["paid"] = inv_df["paid"].apply(fmt_money)
-            inv_df["balance"] = inv_df["balance"].apply(fmt_money)
-            st.dataframe(inv_df, use_container_width=True)
-
-    # ---- Cost of Living ----
-    with tab2:
-        col_df = fetch_pittsburgh_cost_of_living()
-        st.markdown("### 💵 Your Monthly Spending vs. Pittsburgh Average")
-
-        if expense_record:
-            render_cost_of_living_comparison(student, expense_record, col_df)
-        else:
-            st.warning("No expense data found for this student.")
-
-        if not col_df.empty:
-            col_df.columns = [c.lower().strip() for c in col_df.columns]
-            col_df.rename(columns={"item": "label", "cost": "value"}, inplace=True)
-            col_df["value_num"] = col_df["value"].apply(extract_numeric)
-            col_df = col_df.dropna(subset=["value_num"])
-
-            # Group categories
-            group_keywords = {
-                "Food": ["meal", "restaurant", "groceries"],
-                "Rent": ["apartment", "rent", "housing"],
-                "Transport": ["transport", "bus", "taxi"],
-                "Utilities": ["electricity", "internet"]
-            }
-            col_df["category"] = "Other"
-            for cat, kws in group_keywords.items():
-                mask = col_df["label"].str.contains("|".join(kws), case=False, na=False)
-                col_df.loc[mask, "category"] = cat
-
-            avg_df = col_df.groupby("category", as_index=False)["value_num"].mean()
-
-            fig2 = px.pie(
-                avg_df,
-                names="category",
-                values="value_num",
-                title="Average Monthly Expenses — Pittsburgh",
-                color_discrete_sequence=px.colors.sequential.Tealgrn
-            )
-            st.plotly_chart(fig2, use_container_width=True)
-            st.dataframe(col_df[["label", "value", "category"]], use_container_width=True)
-            st.divider()
-
-    # ---- Tuition ----
-    with tab3:
-        st.markdown(f"#### Tuition Data (matched with: <span style='color:green;font-weight:600'>{matched_key}</span>)", unsafe_allow_html=True)
-        if tuition_df.empty:
-            st.warning("No tuition info found for this program.")
+                st.warning("No expense data found for this student.")
+
+            if not cost_model.empty:
+                avg_df = cost_model.averages
+
+                with span("plotly: cost pie"):
+                    fig2 = px.pie(
+                        avg_df,
+                        names="category",
+                        values="value_num",
+                        title="Average Monthly Expenses — Pittsburgh",
+                        color_discrete_sequence=px.colors.sequential.Tealgrn
+                    )
+                    st.plotly_chart(fig2, use_container_width=True)
+                st.dataframe(cost_model.items[["label", "value", "category"]], use_container_width=True)
+
+            # Other cities are fetched only on request (concurrently, each cached)
+            if st.toggle("🌆 Compare with other cities", key="compare_cities"):
+                from scrapers.city_costs import load_city_matrix, spending_vector
+
+                matrix = load_city_matrix()
+                st.markdown("#### Monthly Cost per Student by City")
+                st.dataframe(matrix.frame().style.format("${:,.2f}", na_rep="—"), use_container_width=True)
+                if expense_record:
+                    st.markdown("#### Your Spending vs. Each City (% above / below its monthly cost)")
+                    st.dataframe(
+                        matrix.compare(spending_vector(student, expense_record))
+                        .style.format("{:+.0f}%", na_rep="—"),
+                        use_container_width=True,
+                    )
+                st.caption("Rent and utilities assume one roommate; Fun is a gym membership; "
+                           "Numbeo lists no monthly food cost.")
+                if matrix.stale.any():
+                    st.caption("⏳ Some cities are showing saved or no data; refreshing in the background.")
+                st.divider()
+
+        # ---- Tuition ----
+        with tab3, span("tab: tuition"):
+            student_schools = set(tuition_df["school"].dropna())
+            st.markdown(f"#### Tuition Data (matched with: <span style='color:green;font-weight:600'>{matched_key}</span>)", unsafe_allow_html=True)
+            if tuition_df.empty:
+                st.warning("No tuition info found for this program.")
+            else:
+                tuition_df["amount"] = pd.to_numeric(tuition_df["amount"], errors="coerce")
+                exclude_words = ["search", "office of enrollment", "financial services", "student financial", "university —"]
+                mask = ~tuition_df["item"].astype(str).str.lower().str.contains("|".join(exclude_words))
+                tuition_df = tuition_df[mask].dropna(subset=["amount"])
+
+                def classify(x):
+                    x = str(x).lower()
+                    if "tuition" in x: return "Tuition"
+                    if "fee" in x: return "Fees"
+                    if any(k in x for k in ["living", "meal", "housing", "food"]): return "Living"
+                    return "Other"
+
+                tuition_df["category"] = tuition_df["item"].apply(classify)
+                tuition_df["unit_clean"] = tuition_df["unit"].str.title().fillna("Per Year")
+                unit_filter = "per"
+                tuition_df = tuition_df[tuition_df["unit_clean"].str.lower().str.contains(unit_filter)]
+
+                tuition_df = (
+                    tuition_df.sort_values("amount", ascending=False)
+                    .drop_duplicates(subset=["school", "unit_clean", "category"])
+                )
+                tuition_df["amount_fmt"] = tuition_df["amount"].apply(fmt_money)
+
+                st.dataframe(tuition_df[["school", "category", "item", "amount_fmt", "unit_clean"]], use_container_width=True)
+
+                chart_df = tuition_df.groupby(["unit_clean", "category"], as_index=False)["amount"].mean()
+                with span("plotly: tuition bars"):
+                    fig = px.bar(
+                        chart_df,
+                        x="unit_clean",
+                        y="amount",
+                        color="category",
+                        barmode="group",
+                        text_auto=".2s",
+                        title=f"Average Tuition & Fee Breakdown — {prog.get('school','')}",
+                        color_discrete_sequence=px.colors.qualitative.Bold
+                    )
+                    fig.update_layout(yaxis_title="USD", height=420)
+                    st.plotly_chart(fig, use_container_width=True)
+
+            with st.expander("🆕 What changed this year"), span("tuition diff"):
+                # Only offer comparisons whose two sides share fees; otherwise every row is "added"
+                years = academic_years(tuition_clean)
+                crawl_diff, crawl_versions = diff_crawls(include_unchanged=True)
+                if crawl_diff is not None and not shares_fees(crawl_diff):
+                    crawl_diff = None
+                sources = (["Last two crawls"] if crawl_diff is not None else []) + (["Academic years"] if len(years) >= 2 else [])
+                if not sources:
+                    st.info("Need two academic years or two saved crawls with fees in common to compare.")
+                else:
+                    source = st.radio("Compare", sources, horizontal=True, key="tuition_diff_source")
+                    if source == "Academic years":
+                        c1, c2 = st.columns(2)
+                        with c1: old_year = st.selectbox("From", years, index=len(years) - 2, key="tuition_diff_from")
+                        with c2: new_year = st.selectbox("To", years, index=len(years) - 1, key="tuition_diff_to")
+                        diff = diff_academic_years(tuition_clean, old_year, new_year, include_unchanged=True)
+                    else:
+                        diff = crawl_diff
+                        st.caption(f"Crawl {crawl_versions[0]} → {crawl_versions[1]}")
+                    if not shares_fees(diff):
+                        st.info("These two have no fees in common, so there is nothing to compare.")
+                    else:
+                        diff = diff[diff["status"] != "unchanged"]
+                        if student_schools and not st.checkbox("All schools", key="tuition_diff_all"):
+                            diff = diff[diff["school"].isin(student_schools)]
+                        summary = summarize_diff(diff)
+                        c1, c2, c3, c4 = st.columns(4)
+                        with c1: st.metric("Changed", summary["changed"])
+                        with c2: st.metric("Added", summary["added"])
+                        with c3: st.metric("Removed", summary["removed"])
+                        with c4: st.metric("Median change", f"{summary['median_pct_change']:+.1f}%" if summary["median_pct_change"] is not None else "—")
+                        if diff.empty:
+                            st.caption("No differences for these fees.")
+                        else:
+                            st.dataframe(
+                                diff.style.format({"old_amount": fmt_money, "new_amount": fmt_money, "change": fmt_money,
+                                                   "pct_change": "{:+.1f}%"}, na_rep="—"),
+                                use_container_width=True,
+                            )
+
+        # ---- Peers ----
+        with tab4, span("tab: peers"):
+            st.markdown("#### 👥 Your Spending vs. Your Cohort")
+            if not expense_record:
+                st.warning("No expense data found for this student.")
+            else:
+                with span("cohort stats"):
+                    cohort_stats = get_cohort_stats()
+                dims = {"All students": "all", "Level": "level", "School": "school", "Department": "department"}
+                dim_label = st.radio("Compare with", list(dims), horizontal=True, key="cohort_dim")
+                dim = dims[dim_label]
+                cohort_value = None if dim == "all" else (prog.get(dim) or "Unknown")
+                # "You" is the ledger's latest month, the same totals the Cost of Living tab shows
+                you = flatten_monthly(ledger_monthly(student, expense_record))
+                peer_df = cohort_stats.compare(you, dim, cohort_value)
+                if peer_df.empty:
+                    st.info("No peers found for this cohort.")
+                else:
+                    top = peer_df[~peer_df["field"].str.contains(".", regex=False)]
+                    st.caption(f"{dim_label}{'' if cohort_value is None else ': ' + cohort_value} · "
+                               f"{int(peer_df['cohort_size'].iloc[0])} students")
+                    with span("plotly: peer bars"):
+                        fig4 = px.bar(
+                            top.melt(id_vars="field", value_vars=["you", "p50"], var_name="Who", value_name="USD")
+                               .replace({"Who": {"you": "You", "p50": "Cohort median"}}),
+                            x="field", y="USD", color="Who", barmode="group",
+                            title="Monthly Spending — You vs. Cohort Median",
+                            color_discrete_sequence=px.colors.qualitative.Set2,
+                        )
+                        fig4.update_layout(xaxis_title="", height=380)
+                        st.plotly_chart(fig4, use_container_width=True)
+                    st.dataframe(
+                        peer_df.drop(columns=["cohort_size"]).style.format(
+                            {c: "${:,.0f}" for c in peer_df.columns if c not in ("field", "your_percentile", "cohort_size")}
+                            | {"your_percentile": "{:.0f}th"}),
+                        use_container_width=True, hide_index=True,
+                    )
+
+        st.divider()
+
+        # --------------------------------------------------
+        # 💬 Interactive Advisory Chat (after all finances)
+        # --------------------------------------------------
+        st.subheader("💬 Student Advisory Chat")
+
+        if "chat_history" not in st.session_state:
+            st.session_state.chat_history = []
+        if "active_student" not in st.session_state:
+            st.session_state.active_student = selected_name
+
+        if st.session_state.active_student != selected_name:
+            st.session_state.chat_history = []
+            st.session_state.active_student = selected_name
+
+        for msg in st.session_state.chat_history:
+            with st.chat_message(msg["role"]):
+                st.markdown(msg["content"])
+
+        if prompt := st.chat_input("Ask about your finances, tuition, or CMU life..."):
+            st.chat_message("user").markdown(prompt)
+            st.session_state.chat_history.append({"role": "user", "content": prompt})
+
+            with span("chat context"):
+                tuition_df, matched_key = get_tuition_for_student(tuition_clean, student)
+                full_prompt = build_chat_prompt(student, expense_record, tuition_df, load_cost_of_living(), prompt)
+
+            if GEMINI_API_KEY:
+                configure_gemini()
+                with st.chat_message("assistant"):
+                    with st.spinner("Thinking..."):
+                        model = genai.GenerativeModel("gemini-2.5-pro")
+                        start = time.perf_counter()
+                        with span("gemini.generate_content", model="gemini-2.5-pro"):
+                            res = model.generate_content(full_prompt)
+                        response_text = res.text or "No response generated."
+                        record_llm("gemini-2.5-pro", time.perf_counter() - start, full_prompt, response_text)
+                        st.markdown(response_text)
+                        st.session_state.chat_history.append({"role": "assistant", "content": response_text})
+            else:
+                st.warning("⚠️ Please configure your GEMINI_API_KEY to enable the chat advisor.")
+
+
+    # ------------------------------------
+    #  News Page
+    # ------------------------------------
+    elif page == "News":
+        from scrapers.news import fetch_news, NEWS_WINDOW
+        from utils.article_store import store_version, articles_page, ranked_page, has_ranked
+        from utils.news_feed import render_news_feed, frame_pager
+
+        st.markdown("### 🗞️ CMU & Pittsburgh Updates")
+        news_df = fetch_news()
+        if age_note := describe_age(news_df):
+            st.caption(f"⏳ {age_note}")
+        # Relevance is scored at ingest; the personalized feed pages through the score index
+        with span("news feed"):
+            segments = student_segments(student)
+            version = store_version()
+            total_articles = version[0]
+            if total_articles and has_ranked(segments):
+                st.caption(f"Ranked for {student.get('name','—')} · {student.get('program', {}).get('department','')}")
+                render_news_feed(f"news:ranked:{selected_name}",
+                                 lambda cursor, limit: ranked_page(segments, cursor, limit), version=version)
+            elif total_articles:
+                render_news_feed("news:latest", articles_page, version=version)
+            else:
+                # No article store yet: filter the feed window in memory
+                news_df = news_df.rename(columns=str.lower)
+                if not news_df.empty:
+                    news_df = news_df[news_df["title"].str.contains(
+                        r"(Carnegie Mellon|CMU|Pittsburgh|tuition|scholarship|student|financial aid)",
+                        case=False, na=False
+                    )]
+                render_news_feed("news:window", frame_pager(news_df))
+
+        if total_articles > NEWS_WINDOW:
+            with st.expander(f"📚 All articles ({total_articles}), newest first"):
+                render_news_feed("news:archive", articles_page, page_size=25, version=version)
+
+
+    # ------------------------------------
+    #  Admin Page (hidden, ?admin=1)
+    # ------------------------------------
+    elif page == "Admin":
+        from services.refresher import load_run_metrics
+        from utils.lazy import LOAD_TIMES
+
+        st.markdown("### 🛠️ Cache & Fetch Metrics")
+        st.caption("In-process since server start. Use these to tune TTLs and spot slow sources.")
+
+        counters = pd.DataFrame(REGISTRY.counter_rows())
+        hists = pd.DataFrame(REGISTRY.histogram_rows())
+
+        st.markdown("#### Counters")
+        if counters.empty:
+            st.info("No cache or fetch activity recorded yet.")
         else:
-            tuition_df["amount"] = pd.to_numeric(tuition_df["amount"], errors="coerce")
-            exclude_words = ["search", "office of enrollment", "financial services", "student financial", "university —"]
-            mask = ~tuition_df["item"].astype(str).str.lower().str.contains("|".join(exclude_words))
-            tuition_df = tuition_df[mask].dropna(subset=["amount"])
-
-            def classify(x):
-                x = str(x).lower()
-                if "tuition" in x: return "Tuition"
-                if "fee" in x: return "Fees"
-                if any(k in x for k in ["living", "meal", "housing", "food"]): return "Living"
-                return "Other"
-
-            tuition_df["category"] = tuition_df["item"].apply(classify)
-            tuition_df["unit_clean"] = tuition_df["unit"].str.title().fillna("Per Year")
-            unit_filter = "per"
-            tuition_df = tuition_df[tuition_df["unit_clean"].str.lower().str.contains(unit_filter)]
-
-            tuition_df = (
-                tuition_df.sort_values("amount", ascending=False)
-                .drop_duplicates(subset=["school", "unit_clean", "category"])
-            )
-            tuition_df["amount_fmt"] = tuition_df["amount"].apply(fmt_money)
-
-            st.dataframe(tuition_df[["school", "category", "item", "amount_fmt", "unit_clean"]], use_container_width=True)
-
-            chart_df = tuition_df.groupby(["unit_clean", "category"], as_index=False)["amount"].mean()
-            fig = px.bar(
-                chart_df,
-                x="unit_clean",
-                y="amount",
-                color="category",
-                barmode="group",
-                text_auto=".2s",
-                title=f"Average Tuition & Fee Breakdown — {prog.get('school','')}",
-                color_discrete_sequence=px.colors.qualitative.Bold
-            )
-            fig.update_layout(yaxis_title="USD", height=420)
-            st.plotly_chart(fig, use_container_width=True)
-
-    st.divider()
-
-    # --------------------------------------------------
-    # 💬 Interactive Advisory Chat (after all finances)
-    # --------------------------------------------------
-    st.subheader("💬 Student Advisory Chat")
-
-    if "chat_history" not in st.session_state:
-        st.session_state.chat_history = []
-    if "active_student" not in st.session_state:
-        st.session_state.active_student = selected_name
-
-    if st.session_state.active_student != selected_name:
-        st.session_state.chat_history = []
-        st.session_state.active_student = selected_name
-
-    for msg in st.session_state.chat_history:
-        with st.chat_message(msg["role"]):
-            st.markdown(msg["content"])
-
-    if prompt := st.chat_input("Ask about your finances, tuition, or CMU life..."):
-        st.chat_message("user").markdown(prompt)
-        st.session_state.chat_history.append({"role": "user", "content": prompt})
-
-        prog = student.get("program", {})
-        fin = student.get("financials", {})
+            st.dataframe(counters, use_container_width=True)
 
-        student_context = f"""
-        Student: {student.get('name')}
-        ID: {student.get('student_id')}
-        Level: {prog.get('level')}
-        Department: {prog.get('department')}
-        School: {prog.get('school')}
-        GPA: {prog.get('gpa')}
-        Tuition per semester: {fin.get('tuition_per_semester')}
-        Scholarship: {fin.get('scholarship')}
-        Assistantship: {fin.get('assistantship')}
-        Invoices: {fin.get('invoices')}
-        """
-
-        tuition_df, matched_key = get_tuition_for_student(tuition_clean, student)
-        col_df = fetch_pittsburgh_cost_of_living()
-
-        tuition_context = tuition_df.head(5).to_dict(orient="records") if not tuition_df.empty else "N/A"
-        col_context = col_df.head(5).to_dict(orient="records") if not col_df.empty else "N/A"
-        expense_context = expense_record["expenses"]["monthly"] if expense_record else "N/A"
-
-        full_prompt = f"""
-        You are Brok, an academic and financial advisor for Carnegie Mellon students.
-        Use the student's data and context to give clear, factual advice.
-
-        Student context:
-        {student_context}
-
-        Monthly Expense context (from audit data):
-        {json.dumps(expense_context, indent=2)}
-
-        Tuition context:
-        {tuition_context}
+        st.markdown("#### Latency & Payload Histograms")
+        if hists.empty:
+            st.info("No fetches or LLM calls recorded yet.")
+        else:
+            st.dataframe(hists, use_container_width=True)
 
-        Cost of living (Pittsburgh averages):
-        {col_context}
+        runs = load_run_metrics()
+        if runs:
+            st.markdown("#### Background Refresher Runs")
+            st.dataframe(pd.DataFrame.from_dict(runs, orient="index"), use_container_width=True)
 
-        Student's input:
-        {prompt}
-        """
+        if LOAD_TIMES:
+            st.markdown("#### Deferred Imports (first use)")
+            st.dataframe(pd.DataFrame({"module": list(LOAD_TIMES), "seconds": list(LOAD_TIMES.values())}),
+                         use_container_width=True, hide_index=True)
 
-        if GEMINI_API_KEY:
-            genai.configure(api_key=GEMINI_API_KEY)
-            with st.chat_message("assistant"):
-                with st.spinner("Thinking..."):
-                    model = genai.GenerativeModel("gemini-2.5-pro")
-                    res = model.generate_content(full_prompt)
-                    response_text = res.text or "No response generated."
-                    st.markdown(response_text)
-                    st.session_state.chat_history.append({"role": "assistant", "content": response_text})
-        else:
-            st.warning("⚠️ Please configure your GEMINI_API_KEY to enable the chat advisor.")
+        if st.button("📤 Export Prometheus file"):
+            path = REGISTRY.export_prometheus()
+            st.success(f"Wrote metrics to `{path}`")
+        with st.expander("Prometheus text"):
+            st.code(REGISTRY.to_prometheus(), language="text")
+finally:
+    # Written even when the rerun stops early (st.rerun / st.stop) or raises
+    finish_trace(rerun_trace)
 
 
 # ------------------------------------
-#  News Page
+#  Render Profile (optional sidebar overlay)
 # ------------------------------------
-elif page == "News":
-    st.markdown("### 🗞️ CMU & Pittsburgh Updates")
-    news_df = fetch_news()
-    if news_df.empty:
-        st.info("No recent news found.")
-    else:
-        news_df.columns = [c.lower().strip() for c in news_df.columns]
-        mask = news_df["title"].str.contains(
-            r"(Carnegie Mellon|CMU|Pittsburgh|tuition|scholarship|student|financial aid)",
-            case=False, na=False
-        )
-        subset = news_df[mask].head(12)
-        for _, row in subset.iterrows():
-            st.markdown(f"**[{row['title']}]({row['link']})**  \n*{row.get('pubdate','')} — {row.get('source','')}*")
-            st.markdown(f"<p style='color:gray'>{row.get('summary','')}</p>", unsafe_allow_html=True)
-            st.markdown("---")
+if st.sidebar.checkbox("⏱️ Show render profile", key="trace_overlay"):
+    st.sidebar.caption(f"Rerun {rerun_trace.trace_id} · {rerun_trace.duration * 1e3:,.0f} ms")
+    st.sidebar.dataframe(
+        trace_frame(rerun_trace),
+        column_config={
+            "span": st.column_config.TextColumn("Span", width="medium"),
+            "ms": st.column_config.NumberColumn("ms", format="%.1f"),
+            "self_ms": st.column_config.NumberColumn("self", format="%.1f"),
+            "share": st.column_config.ProgressColumn("share", min_value=0.0, max_value=100.0, format="%.0f%%"),
+        },
+        hide_index=True, use_container_width=True,
+    )
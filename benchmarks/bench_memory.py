@@ -0,0 +1,99 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        bench_memory.py
+Purpose:     Memory benchmark for the student/expense representation: bytes
+             per student held as the JSON lists of nested dicts (what every
+             session loaded before) against the column-wise `utils.roster`
+             `Roster`, plus what N concurrent sessions cost when each holds
+             its own dict copy versus sharing one roster. Also times the
+             field access the dashboard does per rerun on both forms.
+             Input is synthetic (benchmarks/synthetic.py), measured with
+             tracemalloc.
+
+             Run from the repository root:
+                 python -m benchmarks.bench_memory
+                 python -m benchmarks.bench_memory --students 1000,50000 --sessions 16
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import argparse
+import gc
+import json
+import time
+import tracemalloc
+
+from benchmarks.synthetic import synthetic_expenses, synthetic_students
+from utils.roster import Roster
+
+
+def _retained(build):
+    """(result, bytes still allocated once `build` returns and garbage is collected)."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return result, size
+
+
+def _touch(students, expenses_for):
+    """The fields one rerun reads for a student: profile, program, aid, invoices, monthly expenses."""
+    for i, s in enumerate(students):
+        prog, fin = s.get("program", {}), s.get("financials", {})
+        (s.get("name"), prog.get("school"), prog.get("level"), prog.get("courses"),
+         fin.get("scholarship"), fin.get("invoices"))
+        e = expenses_for(i)
+        if e:
+            e["expenses"]["monthly"]
+
+
+def measure(n, sessions):
+    students = synthetic_students(n, seed=7)
+    student_text = json.dumps(students)
+    expense_text = json.dumps(synthetic_expenses(students, seed=7))
+    del students
+
+    (dict_students, dict_expenses), dict_bytes = _retained(lambda: (json.loads(student_text), json.loads(expense_text)))
+    roster, roster_bytes = _retained(lambda: Roster(json.loads(student_text), json.loads(expense_text)))
+    assert all(roster.student(i) == dict_students[i] for i in range(0, n, max(n // 100, 1)))
+
+    start = time.perf_counter()
+    by_id = {e["student_id"]: e for e in dict_expenses}
+    _touch(dict_students, lambda i: by_id.get(dict_students[i]["student_id"]))
+    dict_sec = time.perf_counter() - start
+    start = time.perf_counter()
+    _touch((roster.student(i) for i in range(len(roster))), roster.expense_for)
+    roster_sec = time.perf_counter() - start
+
+    return {"students": n, "dict_b": dict_bytes / n, "roster_b": roster_bytes / n,
+            "sessions_dict_mb": dict_bytes * sessions / 2 ** 20, "sessions_roster_mb": roster_bytes / 2 ** 20,
+            "dict_us": dict_sec / n * 1e6, "roster_us": roster_sec / n * 1e6}
+
+
+def run(sizes=(1_000, 10_000, 50_000), sessions=8):
+    results = [measure(n, sessions) for n in sizes]
+    print(f"Students + expense audits: nested dicts vs. column-wise Roster ({sessions} sessions)\n")
+    print(f"{'students':>9}{'dict B/student':>16}{'roster B/student':>18}{'ratio':>7}"
+          f"{f'{sessions} x dicts MB':>16}{'1 roster MB':>13}{'dict us/read':>14}{'roster us/read':>16}")
+    for r in results:
+        print(f"{r['students']:>9,}{r['dict_b']:>16,.0f}{r['roster_b']:>18,.0f}{r['dict_b'] / r['roster_b']:>6.1f}x"
+              f"{r['sessions_dict_mb']:>16.1f}{r['sessions_roster_mb']:>13.1f}{r['dict_us']:>14.2f}{r['roster_us']:>16.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Bytes per student: nested dicts vs. the column-wise roster.")
+    ap.add_argument("--students", default="1000,10000,50000", help="comma-separated population sizes")
+    ap.add_argument("--sessions", type=int, default=8, help="concurrent sessions for the shared-copy column")
+    args = ap.parse_args()
+    run([int(n) for n in args.students.split(",") if n.strip()], args.sessions)
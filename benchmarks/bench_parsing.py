@@ -0,0 +1,121 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        bench_parsing.py
+Purpose:     Micro-benchmarks for utils/parsing: the single-pass `scan`
+             against the previous three separate regex scans per line (money,
+             unit, academic year) used by the tuition crawler, and the
+             Series helpers (one pass over the joined text; extract-then-
+             strip for numbers) against row-wise `.apply`. Per line, `scan`
+             returns every token of every type and runs at about the cost
+             of the three first-match scans; the gain is on Series input.
+             Input is synthetic text shaped like the CMU tuition and Numbeo
+             pages.
+
+             Run from the repository root:  python -m benchmarks.bench_parsing
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import random
+import re
+import statistics
+import timeit
+
+import pandas as pd
+
+from utils.parsing import scan, scan_series, extract_numeric, extract_numeric_series
+
+# The patterns the scrapers used before the unified scanner
+LEGACY_MONEY_RX = re.compile(r"\$[\s]*[\d,]+(?:\.\d{2})?")
+LEGACY_UNIT_RX = re.compile(r"per\s*(year|semester|unit|credit|course|term)", re.I)
+LEGACY_AY_RX = re.compile(r"\b(\d{2})(\d{2})\b")
+
+_FEES = ["Tuition", "Technology Fee", "Student Activities Fee", "Transportation Fee", "Health Insurance",
+         "Wellness Fee", "Program Fee", "Enrollment Deposit", "Housing & Dining", "Books & Supplies"]
+_UNITS = ["per year", "per semester", "per unit", "per credit", "per course", "", ""]
+_FILLER = ("Charges are billed to the student account and are subject to change by the Board of Trustees. "
+           "See the Student Financial Services handbook for refund policies and payment deadlines.")
+
+
+def tuition_lines(n, seed=0):
+    """Lines like the crawler sees: label, amount, optional unit, sometimes an AY token or prose."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(n):
+        amount = f"${rng.randint(50, 65000):,}" + (".00" if rng.random() < 0.3 else "")
+        line = f"{rng.choice(_FEES)} | {amount} {rng.choice(_UNITS)}".strip()
+        if rng.random() < 0.3:
+            line += f" (AY {rng.choice(['2425', '2526', '2627'])})"
+        if rng.random() < 0.4:
+            line += " " + _FILLER[: rng.randint(40, len(_FILLER))]
+        lines.append(line)
+    return lines
+
+
+def numbeo_values(n, seed=0):
+    rng = random.Random(seed)
+    return [rng.choice([f"{rng.uniform(1, 3000):,.2f} $", f"${rng.uniform(1, 300):.2f}", "?", "58.8 miles"])
+            for _ in range(n)]
+
+
+def legacy_line(line):
+    m = LEGACY_MONEY_RX.search(line)
+    amt = float(m.group(0).replace("$", "").replace(",", "").strip()) if m else None
+    u = LEGACY_UNIT_RX.search(line)
+    unit = f"per_{u.group(1).lower()}" if u else "unknown"
+    ay = next((f"20{a}-{b}" for a, b in LEGACY_AY_RX.findall(line)), "")
+    before = LEGACY_MONEY_RX.split(line, maxsplit=1)[0]
+    return amt, unit, ay, before
+
+
+def unified_line(line):
+    sc = scan(line)
+    before = line[:sc.money_start] if sc.money else line
+    return sc.first_amount, sc.unit or "unknown", sc.academic_year, before
+
+
+def legacy_extract_numeric(val):
+    if pd.isna(val):
+        return None
+    s = re.sub(r"[\$,]", "", str(val))
+    match = re.search(r"(\d+(\.\d+)?)", s)
+    return float(match.group(1)) if match else None
+
+
+def run(n_lines=20_000, rounds=15):
+    lines = tuition_lines(n_lines)
+    series = pd.Series(lines)
+    values = pd.Series(numbeo_values(n_lines))
+
+    cases = [
+        ("per-line: 3 regex scans (legacy)", lambda: [legacy_line(l) for l in lines]),
+        ("per-line: unified scan", lambda: [unified_line(l) for l in lines]),
+        ("Series: apply(legacy per line)", lambda: series.apply(legacy_line)),
+        ("Series: scan_series", lambda: scan_series(series)),
+        ("numbers: apply(extract_numeric, legacy)", lambda: values.apply(legacy_extract_numeric)),
+        ("numbers: apply(extract_numeric)", lambda: values.apply(extract_numeric)),
+        ("numbers: extract_numeric_series", lambda: extract_numeric_series(values)),
+    ]
+    # Cases take turns each round so load on a shared box hits all of them alike
+    times = {name: [] for name, _ in cases}
+    for _ in range(rounds):
+        for name, fn in cases:
+            times[name].append(timeit.timeit(fn, number=1))
+    results = [(name, min(t), statistics.median(t)) for name, t in times.items()]
+
+    print(f"{n_lines:,} lines of synthetic tuition / Numbeo text ({rounds} interleaved rounds)\n")
+    print(f"{'case':<42}{'best ms':>10}{'us/line':>10}{'median us':>11}")
+    for name, best, median in results:
+        print(f"{name:<42}{best * 1e3:>10.1f}{best / n_lines * 1e6:>10.2f}{median / n_lines * 1e6:>11.2f}")
+    return results
+
+
+if __name__ == "__main__":
+    run()
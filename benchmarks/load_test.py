@@ -0,0 +1,247 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        load_test.py
+Purpose:     Headless multi-session load test for the Streamlit dashboard.
+             Each simulated user drives its own `streamlit.testing` AppTest
+             session through a random mix of actions (switch student, flip
+             the city comparison, change the peer cohort, open the News page,
+             send a chat message) against local stand-ins for Numbeo, Google
+             News and Gemini (benchmarks/standins.py). For every concurrency
+             level it reports p50/p95/p99 rerun latency (overall and per
+             action), errors and throughput; memory per session is measured
+             separately as the RSS added by each extra session in one warmed
+             process.
+
+             AppTest drives the script runtime through process-wide state
+             and is not safe to run from several threads, so each user gets
+             its own process; sessions therefore share no in-memory caches,
+             only the SQLite/snapshot files under the run's temp directory.
+             Contention between sessions of one server (the GIL, shared
+             caches and thread pools) is not modeled; latencies under load
+             reflect CPU sharing between processes only.
+
+             Run from the repository root:
+                 python -m benchmarks.load_test                       # 1, 4, 8 users
+                 python -m benchmarks.load_test --users 1,2 --actions 10 --llm-latency 1.5
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import argparse
+import multiprocessing as mp
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.standins import StandIns, standin_env
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP_PATH = os.path.join(ROOT, "app.py")
+ACTIONS = {"switch student": 4, "compare cities": 2, "peer cohort": 2, "news page": 1, "chat": 1}
+COHORTS = ["All students", "Level", "School", "Department"]
+QUESTIONS = ["How much should I save each month?", "Can I afford to live alone?",
+             "What scholarships could lower my tuition?", "Is my food budget reasonable?"]
+
+
+def _rss_mb():
+    """Current resident set size; falls back to the peak where /proc is missing."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2 ** 20
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 2 ** 20 if sys.platform == "darwin" else peak / 1024
+
+
+def _act(at, action, rng):
+    """Apply one user action to the session; returns the widget to rerun from."""
+    if action == "switch student":
+        box = at.sidebar.selectbox[0]
+        return box.set_value(rng.choice([i for i in range(len(box.options)) if i != box.value]))
+    if action == "compare cities":
+        toggle = at.toggle(key="compare_cities")
+        return toggle.set_value(not toggle.value)
+    if action == "peer cohort":
+        return at.radio(key="cohort_dim").set_value(rng.choice(COHORTS))
+    if action == "news page":
+        return at.sidebar.radio[0].set_value("News")
+    if action == "chat":
+        return at.chat_input[0].set_value(rng.choice(QUESTIONS))
+    raise ValueError(f"Unknown action: {action}")
+
+
+def run_session(user, n_actions, seed, timeout):
+    """One simulated user in this process. Returns latency samples and memory."""
+    from streamlit.testing.v1 import AppTest
+
+    # Library deprecation/copy warnings would repeat once per rerun and bury the report
+    warnings.simplefilter("ignore")
+    rng = random.Random(seed * 1000 + user)
+    names, weights = zip(*ACTIONS.items())
+    samples = []
+    rss_start = _rss_mb()
+
+    def timed(action, rerun):
+        start = time.perf_counter()
+        error = None
+        try:
+            rerun()
+            if at.exception:
+                error = at.exception[0].message.splitlines()[0][:120]
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"[:120]
+        samples.append({"user": user, "action": action, "seconds": time.perf_counter() - start,
+                        "error": error, "at": time.time()})
+        return error is None
+
+    at = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    started = time.time()
+    ok = timed("first load", at.run)
+    rss_loaded = _rss_mb()
+    for _ in range(n_actions if ok else 0):
+        action = rng.choices(names, weights)[0]
+        # News is its own page; come back to the Overview before other actions
+        if action != "news page" and at.sidebar.radio[0].value != "Overview":
+            if not timed("overview page", lambda: at.sidebar.radio[0].set_value("Overview").run()):
+                break
+        if action == "news page" and at.sidebar.radio[0].value == "News":
+            action = "switch student"
+        timed(action, lambda: _act(at, action, rng).run())
+    return {"user": user, "samples": samples, "started": started, "finished": time.time(),
+            "rss_start_mb": rss_start, "rss_loaded_mb": rss_loaded, "rss_end_mb": _rss_mb()}
+
+
+def _run_session(args):
+    return run_session(*args)
+
+
+def session_memory(n_sessions, timeout):
+    """
+    RSS of one process warmed by a first session, and the mean RSS each of
+    `n_sessions` more sessions adds on top (they stay alive, as open browser
+    tabs would). The warmed process holds the interpreter, imports and
+    process-wide caches once, as a real server does.
+    """
+    from streamlit.testing.v1 import AppTest
+
+    warnings.simplefilter("ignore")
+    sessions = [AppTest.from_file(APP_PATH, default_timeout=timeout).run()]
+    warm = _rss_mb()
+    for _ in range(n_sessions):
+        sessions.append(AppTest.from_file(APP_PATH, default_timeout=timeout).run())
+    return {"process_mb": warm, "per_session_mb": (_rss_mb() - warm) / max(n_sessions, 1),
+            "sessions": n_sessions}
+
+
+def measure_memory(n_sessions, timeout) -> dict:
+    with mp.get_context("spawn").Pool(1) as pool:
+        return pool.apply(session_memory, (n_sessions, timeout))
+
+
+def run_level(users, n_actions, seed, timeout) -> list:
+    # Spawn, not fork: every session starts from a cold interpreter like a fresh server would
+    with mp.get_context("spawn").Pool(users) as pool:
+        return pool.map(_run_session, [(u, n_actions, seed, timeout) for u in range(users)])
+
+
+def _pct(series, q):
+    return float(np.percentile(series, q)) * 1e3 if len(series) else float("nan")
+
+
+def summarize(users, sessions) -> dict:
+    samples = pd.DataFrame([s for sess in sessions for s in sess["samples"]])
+    warm = samples[samples["action"] != "first load"]
+    ok = warm[warm["error"].isna()]["seconds"]
+    wall = max(s["finished"] for s in sessions) - min(s["started"] for s in sessions)
+    return {
+        "users": users,
+        "reruns": len(samples),
+        "errors": int(samples["error"].notna().sum()),
+        "first_load_ms": samples.loc[samples["action"] == "first load", "seconds"].median() * 1e3,
+        "p50_ms": _pct(ok, 50), "p95_ms": _pct(ok, 95), "p99_ms": _pct(ok, 99),
+        "reruns_per_sec": len(samples) / wall if wall else float("nan"),
+        # Growth of each user's process over its run (caches, session state), not an interpreter size
+        "rss_growth_mb": float(np.mean([s["rss_end_mb"] - s["rss_loaded_mb"] for s in sessions])),
+        "per_action": warm.groupby("action")["seconds"].agg(
+            count="size", p50_ms=lambda x: _pct(x, 50), p95_ms=lambda x: _pct(x, 95), p99_ms=lambda x: _pct(x, 99)),
+        "error_messages": samples["error"].dropna().value_counts().head(5),
+    }
+
+
+def report(summaries, memory=None):
+    print("\nEach user runs in its own process: contention between sessions of one server "
+          "(GIL, shared caches, thread pools) is not modeled.")
+    if memory:
+        print(f"Memory: warmed process {memory['process_mb']:.0f} MB; each additional session "
+              f"adds {memory['per_session_mb']:.1f} MB (mean over {memory['sessions']}).")
+    print(f"\n{'users':>5}{'reruns':>8}{'errors':>8}{'first ms':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'reruns/s':>10}{'growth MB':>11}")
+    for s in summaries:
+        print(f"{s['users']:>5}{s['reruns']:>8}{s['errors']:>8}{s['first_load_ms']:>10.0f}{s['p50_ms']:>9.0f}"
+              f"{s['p95_ms']:>9.0f}{s['p99_ms']:>9.0f}{s['reruns_per_sec']:>10.2f}{s['rss_growth_mb']:>11.1f}")
+    for s in summaries:
+        print(f"\n{s['users']} user(s), warm reruns by action:")
+        print(s["per_action"].round(0).to_string())
+        if len(s["error_messages"]):
+            print("errors:")
+            print(s["error_messages"].to_string())
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Headless multi-session load test against local stand-ins.")
+    ap.add_argument("--users", default="1,4,8", help="comma-separated concurrency levels")
+    ap.add_argument("--actions", type=int, default=20, help="actions per simulated user after the first load")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--timeout", type=float, default=60, help="seconds one rerun may take before it errors")
+    ap.add_argument("--fetch-latency", type=float, default=0.05, help="stand-in latency per page fetch (s)")
+    ap.add_argument("--llm-latency", type=float, default=0.8, help="stand-in latency per Gemini call (s)")
+    ap.add_argument("--memory-sessions", type=int, default=4,
+                    help="extra sessions opened in one warmed process to measure memory per session (0 skips)")
+    ap.add_argument("--keep-data", action="store_true", help="keep the run's temp data directory")
+    args = ap.parse_args(argv)
+
+    servers = StandIns(fetch_latency=args.fetch_latency, llm_latency=args.llm_latency).start()
+    data_dir = tempfile.mkdtemp(prefix="brok-load-")
+    # Sessions inherit this environment; config.py reads it when they import the app
+    os.environ.update(standin_env(servers.base_url))
+    os.environ.update({
+        "SNAPSHOT_DIR": os.path.join(data_dir, "snapshots"),
+        "EXPENSE_LEDGER_PATH": os.path.join(data_dir, "ledger.sqlite"),
+        "NEWS_DB_PATH": os.path.join(data_dir, "news.sqlite"),
+        "METRICS_EXPORT_PATH": os.path.join(data_dir, "metrics.prom"),
+        "TRACE_ENABLED": "0",
+    })
+    print(f"Stand-ins on {servers.base_url}; data in {data_dir}", file=sys.stderr)
+    summaries, memory = [], None
+    try:
+        if args.memory_sessions > 0:
+            print(f"  memory: {args.memory_sessions} session(s) in one warmed process ...", file=sys.stderr)
+            memory = measure_memory(args.memory_sessions, args.timeout)
+        for users in [int(u) for u in args.users.split(",") if u.strip()]:
+            print(f"  {users} user(s) x {args.actions} actions ...", file=sys.stderr)
+            summaries.append(summarize(users, run_level(users, args.actions, args.seed, args.timeout)))
+    finally:
+        servers.stop()
+        if not args.keep_data:
+            shutil.rmtree(data_dir, ignore_errors=True)
+    report(summaries, memory)
+    return 1 if any(s["errors"] for s in summaries) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        standins.py
+Purpose:     Local HTTP stand-ins for the dashboard's external services so it
+             can be exercised offline and under load: Numbeo city pages
+             (synthetic price tables), the Google News RSS feed and Gemini's
+             generateContent REST endpoint (canned advice). Each can add a
+             fixed latency to mimic the real network. `standin_env()` gives
+             the environment variables that point config.py at the server.
+
+             Run the dashboard against them by hand:
+                 python -m benchmarks.standins --port 8765
+                 # then, in another shell, export the printed variables and
+                 streamlit run app.py
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import argparse
+import json
+import threading
+import time
+import zlib
+from email.utils import formatdate
+from functools import lru_cache
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from xml.sax.saxutils import escape
+
+NEWS_ITEMS = 40
+ADVICE = ("Here is a plan based on your numbers:\n\n"
+          "- Keep rent under a third of your monthly income.\n"
+          "- Move $150/month from dining out to savings.\n"
+          "- Check the scholarship deadlines listed by Student Financial Services.")
+_HEADLINES = ["CMU announces new scholarship fund", "Pittsburgh rents rise again this fall",
+              "Tuition and fees for 2026-27 published", "Student financial aid office extends hours",
+              "Carnegie Mellon researchers win grant", "Port Authority changes student bus passes"]
+
+
+@lru_cache(maxsize=64)
+def _numbeo_page(city):
+    # Imported here so config.py is read only after the caller set the stand-in env
+    from benchmarks.synthetic import BASE_NUMBEO_ROWS, numbeo_html
+    return numbeo_html(BASE_NUMBEO_ROWS, seed=zlib.crc32(city.encode())).encode()
+
+
+def _news_feed(now):
+    # One new item every ten minutes, so repeated fetches see a moving feed
+    newest = int(now // 600)
+    items = []
+    for k in range(newest, newest - NEWS_ITEMS, -1):
+        title = f"{_HEADLINES[k % len(_HEADLINES)]} ({k})"
+        items.append(
+            f"<item><title>{escape(title)}</title><link>https://news.example/{k}</link>"
+            f"<guid>standin-{k}</guid><pubDate>{formatdate(k * 600)}</pubDate><source>Stand-in</source>"
+            f"<description>{escape('<p>' + title + ' — CMU students and Pittsburgh tuition news.</p>')}"
+            f"</description></item>"
+        )
+    return ("<?xml version=\"1.0\"?><rss version=\"2.0\"><channel><title>Stand-in News</title>"
+            + "".join(items) + "</channel></rss>").encode()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "BrokStandIn/1.0"
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(self.server.fetch_latency)
+        if self.path.startswith("/numbeo/"):
+            self._send(200, _numbeo_page(self.path.split("/")[2]), "text/html; charset=utf-8")
+        elif self.path.startswith("/news/rss"):
+            self._send(200, _news_feed(time.time()), "application/rss+xml")
+        else:
+            self._send(404, b"not found", "text/plain")
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if ":generateContent" not in self.path:
+            self._send(404, b"{}", "application/json")
+            return
+        time.sleep(self.server.llm_latency)
+        body = {"candidates": [{"content": {"parts": [{"text": ADVICE}], "role": "model"},
+                                "finishReason": "STOP", "index": 0}]}
+        self._send(200, json.dumps(body).encode(), "application/json")
+
+    def log_message(self, *args):
+        pass
+
+
+class StandIns:
+    """The stand-in server on a background thread; port 0 picks a free port."""
+
+    def __init__(self, port=0, fetch_latency=0.0, llm_latency=0.0):
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.httpd.daemon_threads = True
+        self.httpd.fetch_latency = fetch_latency
+        self.httpd.llm_latency = llm_latency
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="brok-standins", daemon=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}"
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def standin_env(base_url) -> dict:
+    """Environment that points config.py's external URLs at `base_url`."""
+    return {
+        "NUMBEO_PITTSBURGH": f"{base_url}/numbeo/Pittsburgh",
+        "NUMBEO_CITY_URL": f"{base_url}/numbeo/{{city}}",
+        "GOOGLE_NEWS_RSS": f"{base_url}/news/rss",
+        "GEMINI_API_ENDPOINT": base_url,
+        "GEMINI_API_KEY": "stand-in",
+    }
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Serve local stand-ins for Numbeo, Google News and Gemini.")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--fetch-latency", type=float, default=0.0, help="seconds added to each page fetch")
+    ap.add_argument("--llm-latency", type=float, default=0.5, help="seconds added to each Gemini call")
+    args = ap.parse_args()
+    server = StandIns(args.port, args.fetch_latency, args.llm_latency)
+    for key, value in standin_env(server.base_url).items():
+        print(f"export {key}='{value}'")
+    print(f"Serving on {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,132 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        startup_imports.py
+Purpose:     Cold-start import profiler for the Streamlit entry point. Reads
+             the module-level imports of app.py (without running the
+             script), imports them in a fresh interpreter under
+             `python -X importtime`, and summarizes the raw trace: total
+             cold-start import time, the slowest direct imports, and self
+             time rolled up per top-level package. With --budget it doubles
+             as a regression check, exiting non-zero when the cold start is
+             over budget (default STARTUP_IMPORT_BUDGET_SEC).
+
+             Run from the repository root:
+                 python -m benchmarks.startup_imports
+                 python -m benchmarks.startup_imports --budget 1.2 --runs 5
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+
+import pandas as pd
+
+from config import STARTUP_IMPORT_BUDGET_SEC
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# "import time:       503 |     380869 | pandas"  (microseconds; indentation = depth)
+_LINE_RX = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)$")
+
+
+def entry_imports(path=os.path.join(ROOT, "app.py")) -> list:
+    """Modules imported at module level by `path`, in order (nested imports excluded)."""
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.module and not node.level:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def parse_importtime(stderr: str) -> pd.DataFrame:
+    """One row per imported module: self/cumulative seconds and nesting depth."""
+    rows = []
+    for line in stderr.splitlines():
+        m = _LINE_RX.match(line)
+        if m:
+            self_us, cum_us, indent, name = m.groups()
+            rows.append({"module": name, "depth": len(indent) // 2,
+                         "self_s": int(self_us) / 1e6, "cumulative_s": int(cum_us) / 1e6})
+    return pd.DataFrame(rows, columns=["module", "depth", "self_s", "cumulative_s"])
+
+
+def profile_once(modules) -> pd.DataFrame:
+    """Import `modules` in a fresh interpreter and return its parsed trace."""
+    code = "\n".join(f"import {m}" for m in modules)
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"import failed:\n{proc.stderr.strip().splitlines()[-1]}")
+    return parse_importtime(proc.stderr)
+
+
+def summarize(trace: pd.DataFrame, modules, top=15) -> dict:
+    direct = (trace[trace["module"].isin(modules) & (trace["depth"] == 0)]
+              .sort_values("cumulative_s", ascending=False))
+    packages = (trace.assign(package=trace["module"].str.split(".").str[0])
+                .groupby("package", as_index=False)
+                .agg(self_s=("self_s", "sum"), modules=("module", "count"))
+                .sort_values("self_s", ascending=False))
+    return {
+        "total_s": float(trace.loc[trace["depth"] == 0, "cumulative_s"].sum()),
+        "modules": len(trace),
+        "direct": direct[["module", "cumulative_s"]].head(top),
+        "packages": packages.head(top),
+    }
+
+
+def profile(modules, runs=3, top=15) -> dict:
+    """Best (fastest) of `runs` cold starts; the spread shows how noisy the box is."""
+    summaries = [summarize(profile_once(modules), modules, top) for _ in range(runs)]
+    best = min(summaries, key=lambda s: s["total_s"])
+    best["runs_s"] = [s["total_s"] for s in summaries]
+    return best
+
+
+def report(result, budget=None):
+    runs = ", ".join(f"{t:.3f}" for t in result["runs_s"])
+    print(f"Cold-start imports: {result['total_s']:.3f}s best ({runs}) · {result['modules']} modules\n")
+    print("Slowest direct imports (cumulative):")
+    for row in result["direct"].itertuples():
+        print(f"  {row.module:<44}{row.cumulative_s * 1e3:>9.1f} ms")
+    print("\nSelf time by top-level package:")
+    for row in result["packages"].itertuples():
+        print(f"  {row.package:<32}{row.self_s * 1e3:>9.1f} ms  ({row.modules} modules)")
+    if budget is not None:
+        verdict = "OK" if result["total_s"] <= budget else "OVER BUDGET"
+        print(f"\nBudget {budget:.3f}s: {verdict}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Summarize cold-start import time of the app entry point.")
+    ap.add_argument("--entry", default=os.path.join(ROOT, "app.py"), help="script whose imports to profile")
+    ap.add_argument("--module", action="append", help="profile these modules instead (repeatable)")
+    ap.add_argument("--runs", type=int, default=3)
+    ap.add_argument("--top", type=int, default=15)
+    ap.add_argument("--budget", type=float, default=STARTUP_IMPORT_BUDGET_SEC,
+                    help="seconds; exit 1 when the best cold start is slower")
+    args = ap.parse_args(argv)
+
+    modules = args.module or entry_imports(args.entry)
+    result = profile(modules, runs=args.runs, top=args.top)
+    report(result, args.budget)
+    return 0 if result["total_s"] <= args.budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,252 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        suite.py
+Purpose:     Scaling benchmarks for the dashboard's hot paths on synthetic
+             data (benchmarks/synthetic.py) at multiples of today's data
+             volume: tuition normalization, dedupe, fee keys, year-over-year
+             diffs and school matching, Numbeo parsing and city cost
+             summaries, the tuition crawler's page parsers and the
+             advisory-chat context builder. Each case
+             reports best-of-N wall time, throughput and peak traced memory,
+             and is compared against a stored baseline (baseline.json) so
+             regressions show up as ratios.
+
+             Run from the repository root:
+                 python -m benchmarks.suite                      # 10x, 100x, 1000x
+                 python -m benchmarks.suite --scales 10,100 --case tuition
+                 python -m benchmarks.suite --save-baseline
+                 python -m benchmarks.suite --check              # exit 1 on regression
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+from bs4 import BeautifulSoup
+
+from benchmarks.synthetic import (
+    BASE_NUMBEO_ROWS, BASE_TUITION_PAGE_ROWS, BASE_TUITION_ROWS,
+    numbeo_html, numbeo_rows, synthetic_expenses, synthetic_students, synthetic_tuition, tuition_page_html,
+)
+from scrapers.cmu_tuition import parse_inline_fees, parse_tables_generic
+from scrapers.cost_of_living import build_cost_model, parse_numbeo_html, summarize_city_costs
+from services.gemini_client import build_chat_prompt
+from utils.tuition import (
+    dedupe_tuition, fee_keys, filter_by_school_and_known_units, get_tuition_for_student, normalize_tuition_units,
+)
+from utils.tuition_diff import diff_tuition
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+DEFAULT_SCALES = (10, 100, 1000)
+PAGE_CONTEXT = {"level": "Graduate", "school": "Synthetic School", "program": None, "academic_year": ""}
+
+
+@dataclass
+class Case:
+    name: str
+    base: int                        # items at 1x (today's data volume)
+    unit: str                        # what one item is, for throughput
+    setup: Callable[[int], tuple]    # n -> state, built once per scale
+    run: Callable                    # state -> None; may not mutate state
+    max_scale: int = max(DEFAULT_SCALES)
+
+
+# ---- case definitions (setup builds inputs once; run is what is timed) ----
+
+def _tuition_raw(n):
+    return (synthetic_tuition(n),)
+
+
+def _tuition_normalized(n):
+    return (normalize_tuition_units(synthetic_tuition(n)),)
+
+
+def _match_state(n):
+    df = dedupe_tuition(normalize_tuition_units(synthetic_tuition(n)))
+    return df, synthetic_students(5, seed=1)
+
+
+def _match(state):
+    df, students = state
+    for s in students:
+        p = s["program"]
+        filter_by_school_and_known_units(df, p["school"], p["department"])
+
+
+def _chat_state(n):
+    df = dedupe_tuition(normalize_tuition_units(synthetic_tuition(n)))
+    students = synthetic_students(5, seed=2)
+    expenses = {e["student_id"]: e for e in synthetic_expenses(students, seed=2)}
+    return df, students, expenses, build_cost_model(numbeo_rows(BASE_NUMBEO_ROWS))
+
+
+def _chat(state):
+    df, students, expenses, cost_model = state
+    for s in students:
+        tuition_df, _ = get_tuition_for_student(df, s)
+        build_chat_prompt(s, expenses.get(s["student_id"]), tuition_df, cost_model, "How much should I save?")
+
+
+def _diff_state(n):
+    """Last year's table and this year's: 10% of fees repriced, 2% dropped, 2% new."""
+    old = normalize_tuition_units(synthetic_tuition(n))
+    rng = np.random.default_rng(1)
+    new = old[rng.random(n) > 0.02].copy()
+    repriced = rng.random(len(new)) < 0.10
+    new.loc[repriced, "amount"] = (new.loc[repriced, "amount"] * 1.04).round()
+    extra = normalize_tuition_units(synthetic_tuition(max(n // 50, 1), seed=2))
+    extra["item"] = extra["item"].astype(str) + " (new)"
+    return old, pd.concat([new, extra], ignore_index=True)
+
+
+def _tuition_page(state):
+    html, = state
+    soup = BeautifulSoup(html, "html.parser")
+    parse_tables_generic(soup, PAGE_CONTEXT, "https://www.cmu.edu/sfs/tuition/graduate/2526.html")
+    parse_inline_fees(soup, PAGE_CONTEXT, "https://www.cmu.edu/sfs/tuition/graduate/2526.html")
+
+
+CASES = [
+    Case("tuition.normalize_tuition_units", BASE_TUITION_ROWS, "rows", _tuition_raw,
+         lambda st: normalize_tuition_units(st[0].copy())),
+    Case("tuition.dedupe_tuition", BASE_TUITION_ROWS, "rows", _tuition_normalized,
+         lambda st: dedupe_tuition(st[0])),
+    Case("tuition.fee_keys", BASE_TUITION_ROWS, "rows", _tuition_normalized,
+         lambda st: fee_keys(st[0])),
+    Case("tuition_diff.diff_tuition", BASE_TUITION_ROWS, "rows", _diff_state,
+         lambda st: diff_tuition(st[0], st[1])),
+    # 5 students matched against the whole table; items = table rows
+    Case("tuition.filter_by_school_and_known_units x5", BASE_TUITION_ROWS, "rows", _match_state, _match),
+    Case("chat context (match + prompt) x5", BASE_TUITION_ROWS, "rows", _chat_state, _chat),
+    Case("cost_of_living.parse_numbeo_html", BASE_NUMBEO_ROWS, "rows",
+         lambda n: (numbeo_html(n),), lambda st: parse_numbeo_html(st[0])),
+    Case("cost_of_living.summarize_city_costs", BASE_NUMBEO_ROWS, "rows",
+         lambda n: (numbeo_rows(n),), lambda st: summarize_city_costs(st[0])),
+    # pd.read_html + iterrows per table row: 1000x (30k rows) takes minutes
+    Case("cmu_tuition page parsers", BASE_TUITION_PAGE_ROWS, "rows",
+         lambda n: (tuition_page_html(n),), _tuition_page, max_scale=100),
+]
+
+
+def measure(case: Case, scale: int, repeat: int) -> dict:
+    n = case.base * scale
+    state = case.setup(n)
+    times = []
+    # The scrapers print progress and skipped tables; keep that out of the report
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(repeat):
+            start = time.perf_counter()
+            case.run(state)
+            times.append(time.perf_counter() - start)
+        # Peak memory in a separate run so tracing overhead doesn't skew timings
+        tracemalloc.start()
+        case.run(state)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    best = min(times)
+    return {"case": case.name, "scale": scale, "n": n, "seconds": best,
+            "per_sec": n / best if best else float("inf"), "unit": case.unit, "peak_mb": peak / 2 ** 20}
+
+
+def run_suite(scales=DEFAULT_SCALES, only=None, repeat=3) -> list:
+    results = []
+    for case in CASES:
+        if only and not any(o.lower() in case.name.lower() for o in only):
+            continue
+        for scale in scales:
+            if scale > case.max_scale:
+                continue
+            # A single timed run is plenty once one run takes seconds
+            r = measure(case, scale, repeat if scale <= 100 else 1)
+            results.append(r)
+            print(f"  {r['case']:<46}{scale:>6}x  {r['seconds'] * 1e3:>10.1f} ms", file=sys.stderr)
+    return results
+
+
+def _key(r):
+    return f"{r['case']}@{r['scale']}x"
+
+
+def load_baseline(path=BASELINE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return {_key(r): r for r in json.load(f).get("results", [])}
+
+
+def save_baseline(results, path=BASELINE_PATH):
+    payload = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}",
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(payload, f, indent=1)
+
+
+def report(results, baseline, tolerance) -> list:
+    """Print the table; returns the results slower than baseline by more than `tolerance`."""
+    regressions = []
+    print(f"{'case':<46}{'scale':>7}{'n':>10}{'ms':>11}{'throughput':>18}{'peak MB':>10}{'vs base':>9}")
+    for r in results:
+        base = baseline.get(_key(r))
+        ratio = r["seconds"] / base["seconds"] if base and base["seconds"] else None
+        flag = ""
+        if ratio is not None and ratio > 1 + tolerance:
+            regressions.append((r, ratio))
+            flag = " !"
+        vs = f"{ratio:.2f}x{flag}" if ratio is not None else "—"
+        thru = f"{r['per_sec']:,.0f} {r['unit']}/s"
+        print(f"{r['case']:<46}{r['scale']:>6}x{r['n']:>10,}{r['seconds'] * 1e3:>11.1f}{thru:>18}"
+              f"{r['peak_mb']:>10.1f}{vs:>9}")
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Scaling benchmarks on synthetic data.")
+    ap.add_argument("--scales", default=",".join(map(str, DEFAULT_SCALES)),
+                    help="comma-separated multiples of today's data volume")
+    ap.add_argument("--case", action="append", help="only cases whose name contains this (repeatable)")
+    ap.add_argument("--repeat", type=int, default=3, help="timed runs per case at scales up to 100x")
+    ap.add_argument("--baseline", default=BASELINE_PATH)
+    ap.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown vs baseline (0.25 = 25%%)")
+    ap.add_argument("--check", action="store_true", help="exit 1 if any case regressed past the tolerance")
+    args = ap.parse_args(argv)
+
+    scales = [int(s) for s in args.scales.split(",") if s.strip()]
+    results = run_suite(scales, args.case, args.repeat)
+    regressions = report(results, load_baseline(args.baseline), args.tolerance)
+    if args.save_baseline:
+        merged = {**load_baseline(args.baseline), **{_key(r): r for r in results}}
+        save_baseline(list(merged.values()), args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+    if regressions:
+        print(f"\n{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}:")
+        for r, ratio in regressions:
+            print(f"  {_key(r)}: {ratio:.2f}x")
+    return 1 if args.check and regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        synthetic.py
+Purpose:     Synthetic data generators for the benchmark suite, shaped like
+             the repository's real inputs so hot paths can be timed at 10x to
+             1000x today's volume: student profiles and expense audits
+             (schemas of data/cmu_mock_*.json, programs drawn from the real
+             students), tuition rows (columns of the processed workbook,
+             bootstrapped from it with jittered amounts and a growing set of
+             schools/programs), and HTML pages like the ones the Numbeo and
+             CMU tuition scrapers parse. Every generator is seeded.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import html
+import random
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config import STUDENTS_PATH, TUITION_PATH
+from utils.students import load_students
+
+# Row counts of today's real inputs; benchmark scales multiply these
+BASE_STUDENTS = 50
+BASE_TUITION_ROWS = 1005
+BASE_NUMBEO_ROWS = 55
+BASE_TUITION_PAGE_ROWS = 30
+
+_FIRST = ["Alex", "Priya", "Wei", "Maria", "Jordan", "Aisha", "Diego", "Yuki", "Sam", "Fatima", "Liam", "Mei"]
+_LAST = ["Chen", "Patel", "Garcia", "Smith", "Kim", "Nguyen", "Okafor", "Rossi", "Silva", "Cohen", "Singh", "Lee"]
+_NATIONS = ["United States", "India", "China", "Portugal", "Brazil", "Nigeria", "Korea", "Germany", "Mexico"]
+_SCHOLARSHIPS = ["Merit-based", "Need-based", "Departmental", "Fellowship"]
+_ROLES = ["Teaching Assistant", "Research Assistant", "Graduate Assistant"]
+_SEMESTERS = ["Fall 2025", "Spring 2026"]
+
+_NUMBEO_ITEMS = [
+    ("Meal, Inexpensive Restaurant", 12, 25), ("Meal for 2 People, Mid-range Restaurant", 60, 110),
+    ("McMeal at McDonalds (or Equivalent Combo Meal)", 8, 12), ("Milk (regular), (1 gallon)", 3, 6),
+    ("Loaf of Fresh White Bread (1 lb)", 2, 5), ("Eggs (regular) (12)", 2, 6), ("Apples (1 lb)", 1, 4),
+    ("One-way Ticket (Local Transport)", 2, 4), ("Monthly Pass (Regular Price)", 80, 130),
+    ("Taxi Start (Normal Tariff)", 3, 5), ("Gasoline (1 gallon)", 3, 5),
+    ("Basic (Electricity, Heating, Cooling, Water, Garbage) for 915 sq ft Apartment", 120, 250),
+    ("Internet (60 Mbps or More, Unlimited Data, Cable/ADSL)", 50, 90),
+    ("Fitness Club, Monthly Fee for 1 Adult", 25, 70), ("Cinema, International Release, 1 Seat", 10, 18),
+    ("Apartment (1 bedroom) in City Centre", 1200, 2600), ("Apartment (1 bedroom) Outside of Centre", 850, 1700),
+    ("Apartment (3 bedrooms) in City Centre", 2200, 4800), ("Jeans (Levis 501 Or Similar)", 40, 70),
+    ("Average Monthly Net Salary (After Tax)", 3500, 6000), ("58.8 miles", 0, 0),
+]
+_FEE_LABELS = ["Tuition", "Technology Fee", "Student Activities Fee", "Transportation Fee", "Health Insurance",
+               "Wellness Fee", "Program Fee", "Enrollment Deposit", "Housing", "Food", "Books & Supplies",
+               "Personal Expenses", "Per-Unit Tuition Charge"]
+_UNIT_TEXT = ["per year", "per semester", "per unit", "per credit", "per course", "", "", ""]
+
+
+@lru_cache(maxsize=1)
+def real_programs():
+    """(level, school, department, courses) combinations of the real mock students."""
+    return [((s.get("program") or {}).get("level"), (s.get("program") or {}).get("school"),
+             (s.get("program") or {}).get("department"), tuple((s.get("program") or {}).get("courses") or []))
+            for s in load_students(STUDENTS_PATH)]
+
+
+@lru_cache(maxsize=1)
+def real_tuition():
+    return pd.read_excel(TUITION_PATH)
+
+
+def synthetic_students(n, seed=0) -> list:
+    """`n` student profiles with the schema of data/cmu_mock_students.json."""
+    rng = random.Random(seed)
+    programs = real_programs()
+    students = []
+    for i in range(n):
+        level, school, dept, courses = rng.choice(programs)
+        first, last = rng.choice(_FIRST), rng.choice(_LAST)
+        tuition = rng.choice([18000, 22000, 25000, 27500, 30000, 32500])
+        sid = f"SYN{seed:02d}-{i + 1:07d}"
+        scholarship = ({"type": rng.choice(_SCHOLARSHIPS), "amount": rng.choice([2000, 3000, 5000, 8000, 12000])}
+                       if rng.random() < 0.6 else None)
+        r = rng.random()
+        assistantship = ({"role": rng.choice(_ROLES), "stipend": rng.choice([1500, 2000, 2500, 3000])}
+                         if r < 0.3 else ("Funded" if r < 0.35 else None))
+        invoices = []
+        for sem in _SEMESTERS:
+            paid = rng.choice([0, tuition // 2, tuition])
+            invoices.append({"invoice_id": f"INV-{sid}-{sem[0]}", "semester": sem,
+                             "due": tuition, "paid": paid, "balance": tuition - paid})
+        enroll = rng.choice([2022, 2023, 2024, 2025])
+        students.append({
+            "student_id": sid,
+            "name": f"{first} {last} {i + 1}",
+            "gender": rng.choice(["Female", "Male", "Non-binary"]),
+            "dob": f"{rng.randint(1995, 2006)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "nationality": rng.choice(_NATIONS),
+            "email": f"{first[0].lower()}{last.lower()}{i + 1}@andrew.cmu.edu",
+            "username": f"{first[0].lower()}{last.lower()}{i + 1}",
+            "password": "pbkdf2_sha256$" + "%012x" % rng.getrandbits(48),
+            "program": {
+                "level": level, "department": dept, "enrollment_year": enroll,
+                "expected_grad_year": enroll + rng.choice([1, 2, 4]), "gpa": round(rng.uniform(2.5, 4.0), 2),
+                "courses": list(courses), "school": school,
+            },
+            "financials": {"tuition_per_semester": tuition, "scholarship": scholarship,
+                           "assistantship": assistantship, "invoices": invoices},
+            "status": rng.choice(["active", "active", "active", "on_leave"]),
+            "contact": {"address": f"{rng.randint(100, 9999)} Forbes Ave\nPittsburgh, PA 15213",
+                        "phone": f"(412){rng.randint(100, 999)}-{rng.randint(1000, 9999)}"},
+        })
+    return students
+
+
+def synthetic_expenses(students, seed=0) -> list:
+    """One monthly audit per student with the schema of data/cmu_mock_expenses_audit.json."""
+    rng = random.Random(seed + 1)
+
+    def amt(lo, hi):
+        return round(rng.uniform(lo, hi), 2)
+
+    records = []
+    for s in students:
+        on_rent = amt(0, 900) if rng.random() < 0.4 else 0
+        monthly = {
+            "on_campus": {"cafeteria": amt(20, 250), "restaurants": amt(10, 150),
+                          "convenience_store": amt(5, 60), "rent": on_rent},
+            "off_campus": {"groceries": amt(80, 400), "restaurants": amt(20, 250), "delivery": amt(0, 120),
+                           "rent": 0 if on_rent else amt(600, 1600)},
+            "utilities": amt(30, 180),
+            "transportation": amt(0, 180),
+            "fun": {"entertainment": amt(10, 150), "subscriptions": amt(5, 60), "trips": amt(0, 300)},
+        }
+        monthly["total"] = round(sum(sum(v.values()) if isinstance(v, dict) else v for v in monthly.values()), 2)
+        records.append({"student_id": s["student_id"], "name": s["name"],
+                        "level": (s.get("program") or {}).get("level"), "expenses": {"monthly": monthly}})
+    return records
+
+
+def synthetic_tuition(n, seed=0) -> pd.DataFrame:
+    """
+    `n` rows with the processed workbook's columns, bootstrapped from it.
+    Amounts are jittered and, past the real size, some rows get numbered
+    school/program variants so cardinality grows like more programs would.
+    """
+    rng = np.random.default_rng(seed)
+    real = real_tuition()
+    df = real.iloc[rng.integers(0, len(real), n)].reset_index(drop=True)
+    df["amount"] = (df["amount"] * rng.uniform(0.9, 1.1, n)).round().astype(int)
+    variant = rng.integers(0, max(n // BASE_TUITION_ROWS, 1), n)
+    renamed = variant > 0
+    df.loc[renamed, "school"] = df.loc[renamed, "school"].astype(str) + " (Program " + variant[renamed].astype(str) + ")"
+    df.loc[renamed, "program"] = df.loc[renamed, "program"].fillna("Standard Program").astype(str) \
+        + " " + variant[renamed].astype(str)
+    # The workbook stores normalized units; feed the raw text the normalizer expects
+    df["unit"] = rng.choice(_UNIT_TEXT, n)
+    return df
+
+
+def numbeo_rows(n, seed=0) -> pd.DataFrame:
+    """['label','value'] like a scraped Numbeo page."""
+    rng = random.Random(seed)
+    rows = []
+    for i in range(n):
+        label, lo, hi = _NUMBEO_ITEMS[i % len(_NUMBEO_ITEMS)]
+        value = "58.8 miles" if not hi else f"{rng.uniform(lo, hi):,.2f} $"
+        rows.append((label if i < len(_NUMBEO_ITEMS) else f"{label} #{i // len(_NUMBEO_ITEMS)}", value))
+    return pd.DataFrame(rows, columns=["label", "value"])
+
+
+def numbeo_html(n, seed=0) -> str:
+    """A Numbeo-style page: one price table with label, value and range cells."""
+    body = "".join(
+        f"<tr><td>{html.escape(label)}</td><td class=\"priceValue\">{html.escape(value)}</td>"
+        f"<td class=\"priceBarTd\"><span class=\"barTextLeft\">1.00</span></td></tr>"
+        for label, value in numbeo_rows(n, seed).itertuples(index=False)
+    )
+    return ("<html><head><title>Cost of Living</title></head><body><h1>Cost of Living in Pittsburgh</h1>"
+            f"<table class=\"data_wide_table\"><tr><th>Restaurants</th><th>Edit</th><th>Range</th></tr>{body}"
+            "</table></body></html>")
+
+
+def tuition_page_html(n, seed=0) -> str:
+    """A CMU cost-of-attendance page: a fee table plus inline fee paragraphs and list items."""
+    rng = random.Random(seed)
+    table_rows, inline = [], []
+    for i in range(n):
+        label = rng.choice(_FEE_LABELS)
+        amount = f"${rng.randint(50, 65000):,}" + (".00" if rng.random() < 0.3 else "")
+        unit = rng.choice(_UNIT_TEXT)
+        if i % 2:
+            table_rows.append(f"<tr><td>{label}</td><td>{amount}</td><td>{unit}</td></tr>")
+        else:
+            tag = rng.choice(["p", "li"])
+            inline.append(f"<{tag}>{label}: {amount} {unit}. Charges are subject to change.</{tag}>")
+    return ("<html><head><title>2025-2026 Graduate Tuition</title></head><body>"
+            "<h1>2025-2026 Estimated Cost of Attendance</h1>"
+            f"<table><tr><th>Item</th><th>Amount</th><th>Unit</th></tr>{''.join(table_rows)}</table>"
+            f"<div><ul>{''.join(inline)}</ul></div></body></html>")
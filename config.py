@@ -22,14 +22,75 @@ load_dotenv()
 
 # Optional — put your Gemini key in .env as GEMINI_API_KEY=xxxx
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
+# Optional Gemini endpoint override (REST), e.g. the load-test stand-in server
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT", "")
 
 # Scraper constants
 USER_AGENT = "Mozilla/5.0 (compatible; Brok-CMU/2.0)"
 REQUESTS_TIMEOUT = 12
 
 # External sources
-NUMBEO_PITTSBURGH = "https://www.numbeo.com/cost-of-living/in/Pittsburgh"
+# Numbeo and Google News URLs can be pointed at local stand-ins (benchmarks/standins.py)
+NUMBEO_PITTSBURGH = os.getenv("NUMBEO_PITTSBURGH", "https://www.numbeo.com/cost-of-living/in/Pittsburgh")
+NUMBEO_CITY_URL = os.getenv("NUMBEO_CITY_URL", "https://www.numbeo.com/cost-of-living/in/{city}")
 STUDENTAID_SITE = "https://studentaid.gov/"
 CREDIBLE_STUDENT_LOANS = "https://www.credible.com/student-loans/"
 SOFI_STUDENT_LOANS = "https://www.sofi.com/student-loans/"
-GOOGLE_NEWS_RSS = "https://news.google.com/rss/search?q=Carnegie+Mellon+University+OR+CMU+finance+OR+tuition+OR+scholarship+OR+Pittsburgh&hl=en-US&gl=US&ceid=US:en"
+GOOGLE_NEWS_RSS = os.getenv("GOOGLE_NEWS_RSS", "https://news.google.com/rss/search?q=Carnegie+Mellon+University+OR+CMU+finance+OR+tuition+OR+scholarship+OR+Pittsburgh&hl=en-US&gl=US&ceid=US:en")
+
+# Resilient source layer: max seconds a page render waits on a live fetch
+# before falling back to the last good snapshot on disk.
+SOURCE_BUDGET_SEC = float(os.getenv("SOURCE_BUDGET_SEC", "1.5"))
+SNAPSHOT_DIR = os.getenv("SNAPSHOT_DIR", "data/snapshots")
+SNAPSHOT_KEEP_VERSIONS = int(os.getenv("SNAPSHOT_KEEP_VERSIONS", "20"))
+
+# When the background refresher (python -m services.refresher) is running,
+# set REFRESHER_MANAGED=1 so the app only reads snapshots and never scrapes.
+REFRESHER_MANAGED = os.getenv("REFRESHER_MANAGED", "0") == "1"
+
+# Refresher schedule (seconds between runs, per source)
+REFRESH_INTERVALS = {
+    "cost_of_living": 60 * 60,
+    "news": 60 * 30,
+    "loans": 60 * 60,
+    "tuition": 60 * 60 * 24 * 7,
+}
+
+# Instrumentation export (Prometheus text format)
+METRICS_EXPORT_PATH = os.getenv("METRICS_EXPORT_PATH", "data/metrics/brok.prom")
+
+# Per-source deadline for the concurrent loan scrapers (seconds)
+LOAN_SOURCE_DEADLINE_SEC = float(os.getenv("LOAN_SOURCE_DEADLINE_SEC", "8"))
+
+# Persistent news article store (utils/article_store.py)
+NEWS_DB_PATH = os.getenv("NEWS_DB_PATH", "data/news/articles.sqlite")
+
+# Append-only expense ledger (utils/expense_ledger.py)
+EXPENSE_LEDGER_PATH = os.getenv("EXPENSE_LEDGER_PATH", "data/ledger/expenses.sqlite")
+
+# Cities (Numbeo URL slugs) offered in the multi-city cost comparison
+COMPARISON_CITIES = [
+    "Pittsburgh", "New-York", "San-Francisco", "Seattle", "Boston", "Chicago", "Austin", "Washington",
+]
+
+# Cold-start import budget for app.py (python -m benchmarks.startup_imports)
+STARTUP_IMPORT_BUDGET_SEC = float(os.getenv("STARTUP_IMPORT_BUDGET_SEC", "1.2"))
+
+# Per-rerun span traces (utils/tracing.py) are always kept in memory for the
+# render profile; TRACE_ENABLED=1 also appends a TRACE_SAMPLE_RATE share of
+# reruns to TRACE_PATH
+TRACE_ENABLED = os.getenv("TRACE_ENABLED", "0") == "1"
+TRACE_SAMPLE_RATE = float(os.getenv("TRACE_SAMPLE_RATE", "1.0"))
+TRACE_PATH = os.getenv("TRACE_PATH", "data/traces/spans.jsonl")
+TRACE_MAX_MB = int(os.getenv("TRACE_MAX_MB", "16"))
+
+# Batch advising reports (python -m services.reports): output directory, chart /
+# templating worker processes (0 = one per CPU) and concurrent Gemini calls
+REPORTS_DIR = os.getenv("REPORTS_DIR", "data/reports")
+REPORT_WORKERS = int(os.getenv("REPORT_WORKERS", "0"))
+REPORT_LLM_CONCURRENCY = int(os.getenv("REPORT_LLM_CONCURRENCY", "4"))
+
+# Local data files
+STUDENTS_PATH = "data/cmu_mock_students.json"
+EXPENSES_PATH = "data/cmu_mock_expenses_audit.json"
+TUITION_PATH = "data/cmu_tuition_clean_processed.xlsx"
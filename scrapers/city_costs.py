@@ -0,0 +1,154 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        city_costs.py
+Purpose:     Multi-city cost-of-living comparison for students weighing
+             internships or co-ops. Fetches the Numbeo page of every city in
+             COMPARISON_CITIES concurrently, each behind its own resilient
+             source and cache, and normalizes them into a city x category
+             matrix (COST_TAXONOMY categories) of what one student pays per
+             month (CostOfLiving.monthly), held as one NumPy array, so
+             comparing a student's monthly spending against every city is a
+             single broadcast subtraction.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import contextvars
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+
+import numpy as np
+import pandas as pd
+
+from config import COMPARISON_CITIES, NUMBEO_CITY_URL
+from scrapers.cost_of_living import (
+    COST_TAXONOMY, build_cost_model, fetch_pittsburgh_cost_of_living, scrape_city_cost_of_living,
+)
+from services.budget_engine import cohort_arrays
+from utils.sources import ResilientSource
+from utils.tracing import traced
+
+CATEGORIES = list(COST_TAXONOMY)
+HOME_CITY = "Pittsburgh"
+
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="brok-cities")
+_SOURCES = {}
+_SOURCES_LOCK = threading.Lock()
+
+
+def city_label(city):
+    return city.replace("-", " ")
+
+
+def city_source_name(city):
+    """Snapshot / refresher job name, e.g. 'cost_of_living_new_york'."""
+    return "cost_of_living_" + city.lower().replace("-", "_")
+
+
+def scrape_city(city) -> pd.DataFrame:
+    return scrape_city_cost_of_living(NUMBEO_CITY_URL.format(city=city))
+
+
+def _source(city) -> ResilientSource:
+    with _SOURCES_LOCK:
+        src = _SOURCES.get(city)
+        if src is None:
+            src = _SOURCES[city] = ResilientSource(
+                city_source_name(city), partial(scrape_city, city), columns=["label", "value"], ttl=60 * 60,
+            )
+        return src
+
+
+@traced()
+def fetch_city_costs(city) -> pd.DataFrame:
+    """['label','value'] for one city; Pittsburgh shares the main cost source."""
+    if city == HOME_CITY:
+        return fetch_pittsburgh_cost_of_living()
+    return _source(city).read()
+
+
+@dataclass(frozen=True)
+class CityCostMatrix:
+    """
+    Monthly cost per student by category for each city. `values` has shape
+    (cities, categories) with NaN where a city has no monthly figure (Food
+    never does: Numbeo lists no monthly food price); `stale` flags cities
+    served from an old snapshot (or not at all).
+    """
+    cities: tuple
+    categories: tuple
+    values: np.ndarray
+    stale: np.ndarray
+
+    def frame(self) -> pd.DataFrame:
+        return pd.DataFrame(self.values, index=[city_label(c) for c in self.cities], columns=self.categories)
+
+    def compare(self, spending) -> pd.DataFrame:
+        """
+        Student spending (vector in `categories` order) against every city:
+        percent above (+) or below (-) each city's monthly cost.
+        """
+        spending = np.asarray(spending, dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            pct = (spending[None, :] - self.values) / self.values * 100.0
+        pct[~np.isfinite(pct)] = np.nan
+        return pd.DataFrame(pct, index=[city_label(c) for c in self.cities], columns=self.categories)
+
+
+_MATRIX_LOCK = threading.Lock()
+_ROWS = {}  # (city, content version) -> monthly costs row
+
+
+def _city_row(city, raw):
+    version = int(pd.util.hash_pandas_object(raw[["label", "value"]], index=False).sum()) if not raw.empty else 0
+    key = (city, version)
+    with _MATRIX_LOCK:
+        row = _ROWS.get(key)
+    if row is None:
+        monthly = build_cost_model(raw, version).monthly
+        row = np.array([monthly.get(c, np.nan) for c in CATEGORIES], dtype=float)
+        with _MATRIX_LOCK:
+            for k in [k for k in _ROWS if k[0] == city]:
+                del _ROWS[k]
+            _ROWS[key] = row
+    return row
+
+
+@traced()
+def load_city_matrix(cities=None) -> CityCostMatrix:
+    """
+    Fetch every city concurrently (each read is bounded by the source time
+    budget, so the total wait is about one budget, not one per city) and
+    assemble the matrix. Cities are re-parsed only when their data changes.
+    """
+    cities = tuple(cities or COMPARISON_CITIES)
+    # Each fetch runs in a copy of this context so its spans nest under this call
+    futures = [_POOL.submit(contextvars.copy_context().run, fetch_city_costs, c) for c in cities]
+    rows, stale = [], []
+    for city, fut in zip(cities, futures):
+        try:
+            raw = fut.result()
+        except Exception as e:
+            print(f"[city_costs] {city}: {e}")
+            raw = pd.DataFrame(columns=["label", "value"])
+        rows.append(_city_row(city, raw))
+        stale.append(bool(raw.attrs.get("stale")) or raw.empty)
+    values = np.vstack(rows) if rows else np.zeros((0, len(CATEGORIES)))
+    values.flags.writeable = False
+    return CityCostMatrix(cities, tuple(CATEGORIES), values, np.array(stale))
+
+
+def spending_vector(student, expense_record) -> np.ndarray:
+    """A student's audited monthly spending in CATEGORIES order."""
+    # budget_engine's spending categories line up with COST_TAXONOMY
+    # (Rent, Food, Transportation, Utilities, Leisure)
+    return cohort_arrays([student], [expense_record] if expense_record else [])["actual"][0]
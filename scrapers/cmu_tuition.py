@@ -4,9 +4,11 @@ from io import StringIO
 from urllib.parse import urljoin, urlparse
 
 import pandas as pd
-import requests
 from bs4 import BeautifulSoup
 
+from utils.metrics import timed_get
+from utils.parsing import scan
+
 # =======================
 # CONFIG
 # =======================
@@ -27,9 +29,6 @@ MAX_PAGES = 500                   # safety cap
 # =======================
 # REGEX / HELPERS
 # =======================
-MONEY_RX = re.compile(r"\$[\s]*[\d,]+(?:\.\d{2})?")
-UNIT_RX = re.compile(r"per\s*(year|semester|unit|credit|course|term)", re.I)
-ACADEMIC_TOKEN_RX = re.compile(r"\b(\d{2})(\d{2})\b")  # e.g., 2526 → AY 2025–26
 
 def safe_sleep():
     time.sleep(SLEEP)
@@ -37,7 +36,7 @@ def safe_sleep():
 def fetch_soup(url):
     try:
         safe_sleep()
-        r = requests.get(url, headers=HEADERS, timeout=TIMEOUT)
+        r = timed_get("cmu_tuition", url, headers=HEADERS, timeout=TIMEOUT)
         if r.status_code == 404:
             print(f" ⚠️  404: {url}")
             return None
@@ -58,24 +57,6 @@ def is_internal(href: str) -> bool:
 def normalize_url(base, href):
     return urljoin(base, href).split("#")[0]
 
-def extract_money(text: str):
-    m = MONEY_RX.search(text or "")
-    if not m:
-        return None, None
-    raw = m.group(0)
-    try:
-        amt = float(raw.replace("$", "").replace(",", "").strip())
-    except Exception:
-        amt = None
-    return raw, amt
-
-def detect_unit(text: str):
-    m = UNIT_RX.search(text or "")
-    if not m:
-        return "unknown"
-    unit = m.group(1).lower()
-    return f"per_{unit}"
-
 def text_clean(s):
     return re.sub(r"\s+", " ", (s or "").strip())
 
@@ -87,16 +68,7 @@ def detect_academic_year(url_or_text: str) -> str:
     """
     Try to infer academic year, e.g., token '2526' → '2025-26'
     """
-    for token in ACADEMIC_TOKEN_RX.findall(url_or_text or ""):
-        a, b = token
-        # sanity: expect consecutive years (25, 26), rough heuristic
-        try:
-            a_i, b_i = int(a), int(b)
-        except:
-            continue
-        if 0 <= a_i <= 99 and 0 <= b_i <= 99:
-            return f"20{a}-{b}"
-    return ""
+    return scan(url_or_text).academic_year
 
 def page_title_or_h1(soup, fallback):
     for tag in ["h1", "h2", "title"]:
@@ -114,6 +86,7 @@ def parse_tables_generic(soup, context, url):
     Builds rows with label, amount, unit, and note.
     """
     rows = []
+    url_year = detect_academic_year(url)
     tables = soup.find_all("table")
     for tbl in tables:
         try:
@@ -135,14 +108,16 @@ def parse_tables_generic(soup, context, url):
                 if not parts:
                     continue
                 line = " | ".join(parts)
-                raw, amt = extract_money(line)
+                # One scan gives the amount, unit and academic year for the row
+                sc = scan(line)
+                amt = sc.first_amount
                 if amt is None:
                     continue
 
                 # Heuristic for label: first non-money-ish cell with fee-ish words
                 label = None
                 for p in parts:
-                    if MONEY_RX.search(p):
+                    if "$" in p and scan(p).money:
                         continue
                     if looks_like_fee_label(p):
                         label = p
@@ -151,7 +126,7 @@ def parse_tables_generic(soup, context, url):
                     # fallback: use the entire row as label
                     label = parts[0]
 
-                unit = detect_unit(line)
+                unit = sc.unit or "unknown"
 
                 rows.append({
                     "level": context["level"],
@@ -162,7 +137,7 @@ def parse_tables_generic(soup, context, url):
                     "amount": amt,
                     "unit": unit,
                     "notes": line,
-                    "academic_year": context["academic_year"] or detect_academic_year(url + " " + line),
+                    "academic_year": context["academic_year"] or url_year or sc.academic_year,
                     "source_url": url
                 })
 
@@ -173,19 +148,20 @@ def parse_inline_fees(soup, context, url):
     Parse <p>/<li>/<div> blocks for lines like "Technology Fee: $240 per semester".
     """
     rows = []
+    url_year = detect_academic_year(url)
     for tag in soup.find_all(["p", "li", "div", "span"]):
         line = text_clean(tag.get_text(" ", strip=True))
         if not line or "$" not in line:
             continue
-        raw, amt = extract_money(line)
+        sc = scan(line)
+        amt = sc.first_amount
         if amt is None:
             continue
 
         # Try to find item text before the dollar string
         item = None
-        # split around the first money token
-        parts = MONEY_RX.split(line, maxsplit=1)
-        before = parts[0].strip() if parts else ""
+        # text before the first money token
+        before = line[:sc.money_start].strip()
         if looks_like_fee_label(before):
             item = before
         else:
@@ -199,9 +175,9 @@ def parse_inline_fees(soup, context, url):
             "label": "Tuition" if "tuition" in line.lower() else "Fee",
             "item": item,
             "amount": amt,
-            "unit": detect_unit(line),
+            "unit": sc.unit or "unknown",
             "notes": line,
-            "academic_year": context["academic_year"] or detect_academic_year(url + " " + line),
+            "academic_year": context["academic_year"] or url_year or sc.academic_year,
             "source_url": url
         })
     return rows
@@ -329,7 +305,8 @@ def crawl_graduate():
             t = text_clean(tag.get_text(" ", strip=True))
             if "$" not in t:
                 continue
-            raw, amt = extract_money(t)
+            sc = scan(t)
+            amt = sc.first_amount
             if amt is None:
                 continue
 
@@ -341,11 +318,11 @@ def crawl_graduate():
                 "school": context["school"],
                 "program": context["program"],
                 "label": "Tuition" if "tuition" in t.lower() else "Fee",
-                "item": (t.split(raw)[0].strip() or "Amount"),
+                "item": (t[:sc.money_start].strip() or "Amount"),
                 "amount": amt,
-                "unit": detect_unit(t),
+                "unit": sc.unit or "unknown",
                 "notes": t,
-                "academic_year": context["academic_year"] or detect_academic_year(url + " " + t),
+                "academic_year": context["academic_year"] or detect_academic_year(url) or sc.academic_year,
                 "source_url": url
             })
 
@@ -366,7 +343,13 @@ def crawl_graduate():
 # =======================
 # MAIN
 # =======================
-def main():
+TUITION_COLUMNS = [
+    "level", "school", "program", "label", "item", "amount",
+    "unit", "notes", "academic_year", "source_url"
+]
+
+def build_tuition_frames():
+    """Crawl both subtrees; returns tidy (undergrad_df, graduate_df)."""
     print("Scraping Undergraduate…")
     ug_rows = crawl_undergrad()
     print(f" UG pages captured: rows={len(ug_rows)}")
@@ -375,15 +358,9 @@ def main():
     gr_rows = crawl_graduate()
     print(f" GR pages captured: rows={len(gr_rows)}")
 
-    # Build DataFrames, normalize, and save
-    ug_df = pd.DataFrame(ug_rows, columns=[
-        "level", "school", "program", "label", "item", "amount",
-        "unit", "notes", "academic_year", "source_url"
-    ])
-    gr_df = pd.DataFrame(gr_rows, columns=[
-        "level", "school", "program", "label", "item", "amount",
-        "unit", "notes", "academic_year", "source_url"
-    ])
+    # Build DataFrames, normalize
+    ug_df = pd.DataFrame(ug_rows, columns=TUITION_COLUMNS)
+    gr_df = pd.DataFrame(gr_rows, columns=TUITION_COLUMNS)
 
     # Coerce and tidy
     for df in (ug_df, gr_df):
@@ -394,6 +371,16 @@ def main():
         # Sort for readability
         df.sort_values(by=["level","school","program","label","item"], inplace=True, na_position="last")
 
+    return ug_df, gr_df
+
+def scrape_tuition() -> pd.DataFrame:
+    """Single long-format frame of both subtrees (used by services/refresher.py)."""
+    ug_df, gr_df = build_tuition_frames()
+    return pd.concat([ug_df, gr_df], ignore_index=True)
+
+def main():
+    ug_df, gr_df = build_tuition_frames()
+
     # Save Excel
     with pd.ExcelWriter(OUT_XLSX, engine="openpyxl") as xw:
         ug_df.to_excel(xw, sheet_name="Undergraduate", index=False)
@@ -4,6 +4,10 @@ Project:     brok@CMU
 File:        cost_of_living.py
 Purpose:     Fetches Pittsburgh cost-of-living data, summarizes student
              expenses, and compares them via Streamlit visualizations.
+             The Numbeo table is parsed and categorized once per fetched
+             version into a read-only `CostOfLiving` model with precomputed
+             category averages. Student totals come from the expense ledger,
+             which the audit form appends to.
 
 Course:      95-888 Data Focused Python (Fall 2025, Section B1)
 Team:        Pink Team
@@ -14,51 +18,196 @@ Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
 '''
 
 
-import requests
+import sqlite3
+import threading
+from dataclasses import dataclass, field, replace
+from types import MappingProxyType
+from typing import Mapping
+
+import numpy as np
 import pandas as pd
-from bs4 import BeautifulSoup
-from utils.caching import timed_lru_cache
+from utils.expense_ledger import (
+    CATEGORY_LABELS as EXPENSE_CATEGORIES, append_expense, current_month, load_entries, monthly_breakdown,
+    seed_from_audit, expense_summary as ledger_expense_summary,
+)
+from utils.lazy import lazy_import
+from utils.metrics import timed_get
+from utils.parsing import extract_numeric_series
+from utils.sources import ResilientSource
+from utils.tracing import traced
 from config import USER_AGENT, REQUESTS_TIMEOUT, NUMBEO_PITTSBURGH
 
+# Only needed when scraping or rendering; the background refresher and the
+# city matrix import this module without paying for them
+bs4 = lazy_import("bs4")
+px = lazy_import("plotly.express")
+st = lazy_import("streamlit")
+
 HEADERS = {"User-Agent": USER_AGENT}
 
-@timed_lru_cache(ttl=60 * 60, maxsize=4)
+def scrape_city_cost_of_living(url) -> pd.DataFrame:
+    """
+    Live Numbeo fetch for one city page. Returns DataFrame with columns
+    ['label','value']; raises on network errors so failures are never
+    snapshotted.
+    """
+    r = timed_get("numbeo", url, headers=HEADERS, timeout=REQUESTS_TIMEOUT)
+    r.raise_for_status()
+    return parse_numbeo_html(r.text)
+
+
+def parse_numbeo_html(html) -> pd.DataFrame:
+    """['label','value'] from every two-cell table row that carries a number."""
+    soup = bs4.BeautifulSoup(html, "html.parser")
+    rows = []
+    for tr in soup.select("table tr"):
+        tds = tr.find_all("td")
+        if len(tds) >= 2:
+            label = tds[0].get_text(" ", strip=True)
+            val = tds[1].get_text(" ", strip=True)
+            if label and val:
+                rows.append((label, val))
+    df = pd.DataFrame(rows, columns=["label", "value"])
+    df = df[df["value"].str.contains(r"\d", na=False)]
+    return df.reset_index(drop=True)
+
+
+def scrape_pittsburgh_cost_of_living() -> pd.DataFrame:
+    return scrape_city_cost_of_living(NUMBEO_PITTSBURGH)
+
+
+_COST_SOURCE = ResilientSource(
+    "cost_of_living", scrape_pittsburgh_cost_of_living,
+    columns=["label", "value"], ttl=60 * 60,
+)
+
+@traced()
 def fetch_pittsburgh_cost_of_living() -> pd.DataFrame:
     """
     Returns DataFrame with columns ['label','value'] (robust to minor layout changes).
+    Never blocks past SOURCE_BUDGET_SEC; may serve the last saved snapshot,
+    see `df.attrs['age_sec']` / `df.attrs['stale']`.
     """
-    try:
-        r = requests.get(NUMBEO_PITTSBURGH, headers=HEADERS, timeout=REQUESTS_TIMEOUT)
-        r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        rows = []
-        for tr in soup.select("table tr"):
-            tds = tr.find_all("td")
-            if len(tds) >= 2:
-                label = tds[0].get_text(" ", strip=True)
-                val = tds[1].get_text(" ", strip=True)
-                if label and val:
-                    rows.append((label, val))
-        df = pd.DataFrame(rows, columns=["label", "value"])
-        df = df[df["value"].str.contains(r"\d", na=False)]
-        return df.reset_index(drop=True)
-    except Exception:
-        return pd.DataFrame(columns=["label", "value"])
+    return _COST_SOURCE.read()
 
 
-# ------------- Enhanced Comparison Utils -------------
+# ------------- Categorized cost model -------------
 
-import re, json
-import plotly.express as px
-import streamlit as st
+# The single taxonomy for Numbeo labels; the first matching category wins
+COST_TAXONOMY = {
+    "Rent": ["apartment", "rent", "housing"],
+    "Food": ["restaurant", "meal", "groceries"],
+    "Transport": ["transport", "taxi", "bus", "monthly pass"],
+    "Utilities": ["electricity", "internet"],
+    "Fun": ["cinema", "fitness", "gym"],
+}
+COST_COLUMNS = ["label", "value", "value_num", "category"]
+# Numbeo rows that are already priced per month, by COST_TAXONOMY category,
+# with the share one student pays (rent and utilities split with a roommate).
+# Food has no monthly row on Numbeo.
+MONTHLY_PRICE_ITEMS = {
+    "Rent": [(r"1 bedroom.*outside", 0.5)],
+    "Utilities": [(r"^basic\b", 0.5), (r"^internet\b", 0.5)],
+    "Transport": [(r"monthly pass", 1.0)],
+    "Fun": [(r"fitness club", 1.0)],
+}
 
-def extract_numeric(val):
-    if pd.isna(val):
-        return None
-    s = re.sub(r"[\$,]", "", str(val))
-    match = re.search(r"(\d+(\.\d+)?)", s)
-    return float(match.group(1)) if match else None
 
+def categorize_costs(df: pd.DataFrame) -> pd.DataFrame:
+    """New frame with COST_COLUMNS; rows without a number are dropped. Never mutates `df`."""
+    if df.empty:
+        return pd.DataFrame(columns=COST_COLUMNS)
+    labels = df["label"].astype(str)
+    conditions = [labels.str.contains("|".join(kws), case=False, na=False) for kws in COST_TAXONOMY.values()]
+    out = pd.DataFrame({
+        "label": labels.to_numpy(),
+        "value": df["value"].astype(str).to_numpy(),
+        "value_num": extract_numeric_series(df["value"]).to_numpy(),
+        "category": np.select(conditions, list(COST_TAXONOMY), default="Other"),
+    })
+    return out.dropna(subset=["value_num"]).reset_index(drop=True)
+
+
+@dataclass(frozen=True)
+class CostOfLiving:
+    """
+    Parsed, categorized cost-of-living data. Column arrays are read-only and
+    `category_avg` (mean item price per category) and `monthly` (per-student
+    monthly cost per category, see `monthly_costs`) are read-only mappings;
+    `items` returns a fresh frame view over the shared arrays, so callers can
+    neither corrupt nor copy it.
+    """
+    columns: Mapping
+    category_avg: Mapping
+    version: int
+    attrs: Mapping = field(default_factory=dict)
+    monthly: Mapping = field(default_factory=dict)
+
+    @property
+    def items(self) -> pd.DataFrame:
+        df = pd.DataFrame(dict(self.columns), columns=COST_COLUMNS, copy=False)
+        df.attrs.update(self.attrs)
+        return df
+
+    @property
+    def averages(self) -> pd.DataFrame:
+        return pd.DataFrame({"category": list(self.category_avg), "value_num": list(self.category_avg.values())})
+
+    @property
+    def empty(self) -> bool:
+        return not len(self.columns["label"])
+
+
+@traced()
+def build_cost_model(raw: pd.DataFrame, version=None) -> CostOfLiving:
+    cat = categorize_costs(raw)
+    columns = {}
+    for c in COST_COLUMNS:
+        arr = cat[c].to_numpy(copy=True)
+        arr.flags.writeable = False
+        columns[c] = arr
+    avg = cat.groupby("category")["value_num"].mean().to_dict()
+    return CostOfLiving(MappingProxyType(columns), MappingProxyType(avg), version, MappingProxyType(dict(raw.attrs)),
+                        MappingProxyType(monthly_costs(cat)))
+
+
+def monthly_costs(cat: pd.DataFrame) -> dict:
+    """
+    Category -> what one student pays per month, from the MONTHLY_PRICE_ITEMS
+    rows of a categorized frame. Categories missing any of their rows are left out.
+    """
+    labels = cat["label"].astype(str).str.strip()
+    out = {}
+    for category, items in MONTHLY_PRICE_ITEMS.items():
+        prices = [cat.loc[labels.str.contains(rx, case=False, regex=True), "value_num"] for rx, _ in items]
+        if all(len(p) for p in prices):
+            out[category] = sum(share * float(p.iloc[0]) for p, (_, share) in zip(prices, items))
+    return out
+
+
+_MODEL_LOCK = threading.Lock()
+_MODEL = None
+
+
+@traced()
+def load_cost_of_living() -> CostOfLiving:
+    """
+    The categorized model for the current Numbeo data. Parsing and
+    categorization run once per fetched version (detected by content hash);
+    later calls only refresh the freshness attrs.
+    """
+    global _MODEL
+    raw = fetch_pittsburgh_cost_of_living()
+    version = int(pd.util.hash_pandas_object(raw[["label", "value"]], index=False).sum()) if not raw.empty else 0
+    with _MODEL_LOCK:
+        if _MODEL is None or _MODEL.version != version:
+            _MODEL = build_cost_model(raw, version)
+        elif dict(_MODEL.attrs) != raw.attrs:
+            _MODEL = replace(_MODEL, attrs=MappingProxyType(dict(raw.attrs)))
+        return _MODEL
+
+
+# ------------- Enhanced Comparison Utils -------------
 
 def summarize_student_expenses(exp):
     if not exp:
@@ -81,29 +230,83 @@ def summarize_student_expenses(exp):
 
 
 def summarize_city_costs(df):
-    cat_map = {
-        "Food": ["restaurant", "meal", "groceries"],
-        "Rent": ["apartment", "rent", "housing"],
-        "Transport": ["transport", "taxi", "bus"],
-        "Utilities": ["electricity", "internet"],
-        "Fun": ["cinema", "fitness", "gym"],
-    }
-    df["category"] = "Other"
-    for cat, kws in cat_map.items():
-        mask = df["label"].str.contains("|".join(kws), case=False, na=False)
-        df.loc[mask, "category"] = cat
-    df["value_num"] = df["value"].apply(extract_numeric)
-    avg_df = df.groupby("category", as_index=False)["value_num"].mean()
-    return avg_df.set_index("category")["value_num"].to_dict()
+    """Category -> average price, using COST_TAXONOMY. Accepts raw or categorized frames."""
+    cat = df if "category" in df.columns and "value_num" in df.columns else categorize_costs(df)
+    return cat.groupby("category")["value_num"].mean().to_dict()
+
+
+def _ledger_summary(student, expense_record):
+    """Running totals from the expense ledger, seeded from the audit record."""
+    try:
+        if expense_record:
+            seed_from_audit(expense_record)
+        return ledger_expense_summary(student.get("student_id"))
+    except sqlite3.Error as e:
+        print(f"[cost_of_living] Expense ledger unavailable: {e}")
+        return None
+
+
+def ledger_monthly(student, expense_record):
+    """
+    The student's latest month from the expense ledger in the audit's
+    `expenses.monthly` shape, so peer comparisons use the same numbers as the
+    Cost of Living tab; falls back to the audit record if the ledger is down.
+    """
+    try:
+        if expense_record:
+            seed_from_audit(expense_record)
+        monthly = monthly_breakdown(student.get("student_id"))
+    except sqlite3.Error as e:
+        print(f"[cost_of_living] Expense ledger unavailable: {e}")
+        monthly = None
+    if monthly is None and expense_record:
+        monthly = expense_record["expenses"]["monthly"]
+    return monthly
+
+
+def _add_expense_entry(student_id, key):
+    state = st.session_state
+    try:
+        append_expense(student_id, state[f"{key}:category"], state[f"{key}:amount"],
+                       month=state[f"{key}:month"].strip() or None, subcategory=state[f"{key}:sub"] or None,
+                       note=state[f"{key}:note"] or None)
+        state[f"{key}:status"] = ("success", "Expense recorded.")
+    except (ValueError, sqlite3.Error) as e:
+        state[f"{key}:status"] = ("error", f"Could not record expense: {e}")
+
+
+def render_expense_entry_form(student):
+    student_id = student.get("student_id")
+    key = f"ledger:{student_id}"
+    with st.form(key, clear_on_submit=True):
+        c1, c2, c3 = st.columns(3)
+        with c1:
+            st.selectbox("Category", list(EXPENSE_CATEGORIES), key=f"{key}:category",
+                         format_func=EXPENSE_CATEGORIES.get)
+            st.text_input("Item (optional)", key=f"{key}:sub", placeholder="e.g. groceries")
+        with c2:
+            st.number_input("Amount (USD, negative to correct)", value=0.0, step=5.0, key=f"{key}:amount")
+            st.text_input("Month (YYYY-MM)", value=current_month(), key=f"{key}:month")
+        with c3:
+            st.text_input("Note (optional)", key=f"{key}:note")
+        # Callback runs before the rerun, so the totals above already include the entry
+        st.form_submit_button("Add expense", on_click=_add_expense_entry, args=(student_id, key))
+    status = st.session_state.pop(f"{key}:status", None)
+    if status:
+        getattr(st, status[0])(status[1])
+    entries = load_entries(student_id, limit=10)
+    if not entries.empty:
+        st.dataframe(entries.drop(columns=["created_ts"]), use_container_width=True, hide_index=True)
 
 
-def render_cost_of_living_comparison(student, expense_record, col_df):
-    expense_summary = summarize_student_expenses(expense_record)
+@traced()
+def render_cost_of_living_comparison(student, expense_record, cost_model):
+    expense_summary = _ledger_summary(student, expense_record) or summarize_student_expenses(expense_record)
     if not expense_summary:
         st.warning("No expense data available for this student.")
         return
 
-    city_summary = summarize_city_costs(col_df)
+    city_summary = cost_model.category_avg
     compare_df = pd.DataFrame([
         {"Category": "Food", "You": expense_summary["Off-Campus"] + expense_summary["On-Campus"],
          "Pittsburgh Avg": city_summary.get("Food", 0)},
@@ -140,5 +343,5 @@ def render_cost_of_living_comparison(student, expense_record, col_df):
 
     st.metric("💰 Total Monthly Spending", f"${expense_summary['Total']:,.2f}")
 
-    if st.button("🧾 Audit or Add Monthly Expenses"):
-        st.info("Expense audit feature coming soon — will let you add or adjust your costs dynamically.")
+    with st.expander("🧾 Audit or Add Monthly Expenses"):
+        render_expense_entry_form(student)
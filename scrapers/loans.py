@@ -4,8 +4,9 @@ Project:     brok@CMU
 File:        loans.py
 Purpose:     Scrapes and summarizes federal and private student loan data from
              multiple trusted financial sources (Studentaid.gov, Credible,
-             SoFi). Extracts key rates, loan insights, and sample statistics
-             for financial comparison and display within the Streamlit app.
+             SoFi). Fetches all sources concurrently, each under its own
+             deadline, and extracts APR ranges and loan limits into typed
+             columns for financial comparison within the Streamlit app.
 
 Course:      95-888 Data Focused Python (Fall 2025, Section B1)
 Team:        Pink Team
@@ -16,32 +17,175 @@ Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
 '''
 
 
-import requests, pandas as pd, re
-from bs4 import BeautifulSoup
-from utils.caching import timed_lru_cache
-from config import USER_AGENT, REQUESTS_TIMEOUT, STUDENTAID_SITE, CREDIBLE_STUDENT_LOANS, SOFI_STUDENT_LOANS
+import re
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+import time
+
+import pandas as pd
+from utils.lazy import lazy_import
+from utils.metrics import timed_get
+from utils.parsing import AMOUNT_PATTERN, PERCENT_NUMBER_PATTERN, find_money, find_pct
+from utils.sources import ResilientSource
+from config import (
+    USER_AGENT, REQUESTS_TIMEOUT, LOAN_SOURCE_DEADLINE_SEC,
+    STUDENTAID_SITE, CREDIBLE_STUDENT_LOANS, SOFI_STUDENT_LOANS,
+)
+
+# Only needed when a page is fetched; app.py imports this module at startup
+bs4 = lazy_import("bs4")
 
 HEADERS = {"User-Agent": USER_AGENT}
-MONEY = re.compile(r"\$[\s]*[\d,]+(?:\.\d{2})?")
-PCT   = re.compile(r"\b\d{1,3}(?:\.\d+)?\s?%")
 
-def parse_page(url: str):
+# Add a source by appending a dict; `deadline` (seconds) and
+# `default_rate_type` (for pages that don't say fixed/variable) are optional.
+LOAN_SOURCES = [
+    {"name": "studentaid", "url": STUDENTAID_SITE, "kind": "federal", "default_rate_type": "fixed"},
+    {"name": "credible", "url": CREDIBLE_STUDENT_LOANS, "kind": "private"},
+    {"name": "sofi", "url": SOFI_STUDENT_LOANS, "kind": "private"},
+]
+
+# ----------------------------
+#  Structured extraction
+# ----------------------------
+_NUM = rf"(?<![\d.])({PERCENT_NUMBER_PATTERN})"   # not the tail of a longer number ("115%")
+RATE_RANGE = re.compile(_NUM + r"\s?%?\s*(?:-|–|—|to)\s*" + _NUM + r"\s?%", re.I)
+RATE_SINGLE = re.compile(_NUM + r"\s?%\s*(?:APR|interest|fixed|variable)", re.I)
+LOAN_MAX = re.compile(r"(?:up to|maximum(?: of)?|max\.?|borrow)\s*(?:of\s*)?\$\s?(" + AMOUNT_PATTERN + ")", re.I)
+LOAN_MIN = re.compile(r"(?:minimum(?: of)?|min\.?|as little as|starting at)\s*(?:of\s*)?\$\s?(" + AMOUNT_PATTERN + ")", re.I)
+RATE_TYPE = re.compile(r"\b(fixed|variable)\b", re.I)
+
+MAX_PLAUSIBLE_APR = 36.0
+
+TERM_COLUMNS = [
+    "fixed_apr_min", "fixed_apr_max", "variable_apr_min", "variable_apr_max",
+    "loan_min_usd", "loan_max_usd",
+]
+
+
+def _money_value(raw):
+    return float(raw.replace(",", ""))
+
+
+def extract_loan_terms(text: str, default_rate_type: str = None) -> dict:
+    """
+    Pull APR ranges (split by fixed/variable using nearby wording) and loan
+    limits out of page text. Missing values are None.
+    """
+    rates = {"fixed": [], "variable": []}
+    lows, highs = [], []
+    for line in (text or "").splitlines():
+        if "%" in line:
+            for m in RATE_RANGE.finditer(line):
+                lo, hi = float(m.group(1)), float(m.group(2))
+                if not (0 < lo <= hi <= MAX_PLAUSIBLE_APR):
+                    continue
+                kind = _rate_type_near(line, m.start(), default_rate_type)
+                if kind:
+                    rates[kind] += [lo, hi]
+            for m in RATE_SINGLE.finditer(line):
+                v = float(m.group(1))
+                kind = _rate_type_near(line, m.start(), default_rate_type)
+                if kind and 0 < v <= MAX_PLAUSIBLE_APR:
+                    rates[kind].append(v)
+        if "$" in line:
+            lows += [_money_value(m.group(1)) for m in LOAN_MIN.finditer(line)]
+            highs += [_money_value(m.group(1)) for m in LOAN_MAX.finditer(line)]
+
+    return {
+        "fixed_apr_min": min(rates["fixed"], default=None),
+        "fixed_apr_max": max(rates["fixed"], default=None),
+        "variable_apr_min": min(rates["variable"], default=None),
+        "variable_apr_max": max(rates["variable"], default=None),
+        "loan_min_usd": min(lows, default=None),
+        "loan_max_usd": max(highs, default=None),
+    }
+
+
+def _rate_type_near(line, pos, default):
+    """The fixed/variable word closest to `pos` within the same line, else `default`."""
+    best, best_dist = None, None
+    for m in RATE_TYPE.finditer(line, max(0, pos - 80), pos + 80):
+        dist = abs(m.start() - pos)
+        if best_dist is None or dist < best_dist:
+            best, best_dist = m.group(1).lower(), dist
+    return best or default
+
+
+# ----------------------------
+#  Fetching
+# ----------------------------
+def parse_page(url: str, default_rate_type: str = None, timeout: float = REQUESTS_TIMEOUT, name: str = "loans"):
+    """One source's row; `elapsed_sec` is this source's own fetch + parse time."""
+    start = time.perf_counter()
+    row = _parse_page(url, default_rate_type, timeout, name)
+    row["elapsed_sec"] = round(time.perf_counter() - start, 3)
+    return row
+
+
+def _parse_page(url, default_rate_type, timeout, name):
     try:
-        r = requests.get(url, headers=HEADERS, timeout=REQUESTS_TIMEOUT)
+        r = timed_get(f"loans:{name}", url, headers=HEADERS, timeout=timeout)
         r.raise_for_status()
-        soup = BeautifulSoup(r.text, "html.parser")
-        text = soup.get_text(" ", strip=True)
-        money = ", ".join(MONEY.findall(text)[:3]) or "—"
-        pcts  = ", ".join(PCT.findall(text)[:3]) or "—"
+        soup = bs4.BeautifulSoup(r.text, "lxml")
+        for tag in soup(["script", "style", "noscript"]):
+            tag.decompose()
         title = soup.title.get_text(" ", strip=True) if soup.title else url
+        lines = soup.get_text("\n", strip=True)
+        text = lines.replace("\n", " ")
+        money = ", ".join(find_money(text)[:3]) or "—"
+        pcts  = ", ".join(find_pct(text)[:3]) or "—"
         # tiny snippet
         snippet = text[:240] + "…" if len(text) > 240 else text
-        return {"title": title, "sample_money": money, "sample_pcts": pcts, "snippet": snippet, "link": url}
-    except Exception:
-        return {"title": "—", "sample_money": "—", "sample_pcts": "—", "snippet": "Fetch error", "link": url}
+        return {"title": title, "sample_money": money, "sample_pcts": pcts, "snippet": snippet, "link": url,
+                **extract_loan_terms(lines, default_rate_type), "ok": True, "error": None}
+    except Exception as e:
+        return _failed_row(url, f"{type(e).__name__}: {e}")
+
+
+def _failed_row(url, error):
+    return {"title": "—", "sample_money": "—", "sample_pcts": "—", "snippet": "Fetch error", "link": url,
+            **{c: None for c in TERM_COLUMNS}, "ok": False, "error": error}
+
+
+LOAN_COLUMNS = (["source", "kind", "title"] + TERM_COLUMNS
+                + ["sample_money", "sample_pcts", "snippet", "link", "ok", "error", "elapsed_sec"])
+
+_POOL = ThreadPoolExecutor(max_workers=8, thread_name_prefix="brok-loans")
+
+
+def scrape_loans_overview(sources=None) -> pd.DataFrame:
+    """
+    Fetch every source concurrently. A source that misses its deadline or
+    fails contributes a row with ok=False instead of delaying the others;
+    raises only if every source failed.
+    """
+    sources = sources or LOAN_SOURCES
+    start = time.perf_counter()
+    futures = []
+    for src in sources:
+        deadline = src.get("deadline", LOAN_SOURCE_DEADLINE_SEC)
+        fut = _POOL.submit(parse_page, src["url"], src.get("default_rate_type"),
+                           min(REQUESTS_TIMEOUT, deadline), src["name"])
+        futures.append((src, deadline, fut))
+
+    rows = []
+    for src, deadline, fut in futures:
+        remaining = max(0.0, deadline - (time.perf_counter() - start))
+        try:
+            row = fut.result(timeout=remaining)
+        except FutureTimeout:
+            row = {**_failed_row(src["url"], f"deadline of {deadline}s exceeded"), "elapsed_sec": float(deadline)}
+        rows.append({"source": src["name"], "kind": src.get("kind", ""), **row})
+
+    if not any(r["ok"] for r in rows):
+        raise RuntimeError("all loan sources failed")
+    df = pd.DataFrame(rows, columns=LOAN_COLUMNS)
+    df[TERM_COLUMNS] = df[TERM_COLUMNS].astype("float64")
+    df["ok"] = df["ok"].astype(bool)
+    return df
+
+
+_LOANS_SOURCE = ResilientSource("loans", scrape_loans_overview, columns=LOAN_COLUMNS, ttl=60 * 60)
 
-@timed_lru_cache(ttl=60*60, maxsize=8)
 def fetch_loans_overview() -> pd.DataFrame:
-    urls = [STUDENTAID_SITE, CREDIBLE_STUDENT_LOANS, SOFI_STUDENT_LOANS]
-    rows = [parse_page(u) for u in urls]
-    return pd.DataFrame(rows)
+    return _LOANS_SOURCE.read()
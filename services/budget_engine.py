@@ -5,7 +5,13 @@ File:        budget_engine.py
 Purpose:     Provides financial estimation utilities for students, including
              automated monthly budget inference based on semester tuition data.
              Allocates expected spending across categories such as rent, food,
-             transportation, utilities, leisure, and savings.
+             transportation, utilities, leisure, and savings. `batch_budget`
+             does the same for a whole cohort in one NumPy call and compares
+             each allocation with the student's audited monthly expenses.
+             `optimize_allocations` replaces the fixed ratios with a
+             constrained plan: stay as close as possible to current spending
+             while respecting income, city-derived category minimums and a
+             savings target.
 
 Course:      95-888 Data Focused Python (Fall 2025, Section B1)
 Team:        Pink Team
@@ -16,15 +22,310 @@ Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
 '''
 
 
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import MappingProxyType
+
+import numpy as np
+import pandas as pd
+
+# Share of the monthly base allocated to each category
+BUDGET_SHARES = {
+    "Rent": 0.35,
+    "Food": 0.2,
+    "Transportation": 0.1,
+    "Utilities": 0.1,
+    "Leisure": 0.1,
+    "Savings": 0.15,
+}
+CATEGORIES = list(BUDGET_SHARES)
+SPENDING_CATEGORIES = [c for c in CATEGORIES if c != "Savings"]
+DEFAULT_BASE = 6000
+MONTHS_PER_SEMESTER = 4
+# Optimizer defaults: save this share of income. Category floors are the
+# city's monthly costs (CostOfLiving.monthly); a category without one falls
+# back to this fraction of its average Numbeo item price, a price level
+# rather than a monthly cost, so treat those floors as rough
+DEFAULT_SAVINGS_RATE = BUDGET_SHARES["Savings"]
+CITY_MIN_FRACTION = 0.6
+CITY_CATEGORY_MAP = {"Rent": "Rent", "Food": "Food", "Transportation": "Transport",
+                     "Utilities": "Utilities", "Leisure": "Fun"}
+
+_PLANNER = ThreadPoolExecutor(max_workers=1, thread_name_prefix="brok-planner")
+
+
 def infer_monthly_budget(tuition_semester: float):
-    base = tuition_semester / 4 if tuition_semester else 6000
-    budget = {
-        "Rent": base * 0.35,
-        "Food": base * 0.2,
-        "Transportation": base * 0.1,
-        "Utilities": base * 0.1,
-        "Leisure": base * 0.1,
-        "Savings": base * 0.15
-    }
+    base = tuition_semester / MONTHS_PER_SEMESTER if tuition_semester else DEFAULT_BASE
+    budget = {cat: base * share for cat, share in BUDGET_SHARES.items()}
     total = sum(budget.values())
     return budget, total
+
+
+# ----------------------------
+#  Cohort (batch) budgets
+# ----------------------------
+
+def _actual_by_category(monthly: dict) -> list:
+    """Audited monthly expenses folded into SPENDING_CATEGORIES order."""
+    on, off, fun = monthly.get("on_campus", {}), monthly.get("off_campus", {}), monthly.get("fun", {})
+    rent = on.get("rent", 0) + off.get("rent", 0)
+    food = sum(v for k, v in on.items() if k != "rent") + sum(v for k, v in off.items() if k != "rent")
+    return [rent, food, monthly.get("transportation", 0), monthly.get("utilities", 0), sum(fun.values())]
+
+
+def _amount(value, key):
+    """Numeric field of an optional dict (records sometimes hold a bare string)."""
+    return (value.get(key) or 0) if isinstance(value, dict) else 0
+
+
+def cohort_arrays(students, expenses=None) -> dict:
+    """
+    Columnar inputs for `batch_budget` from the student and expense JSON
+    records (joined on student_id). Students without an expense record get
+    NaN actuals.
+    """
+    by_id = {e.get("student_id"): e for e in (expenses or [])}
+    n = len(students)
+    tuition, schol, stipend = np.zeros(n), np.zeros(n), np.zeros(n)
+    actual = np.full((n, len(SPENDING_CATEGORIES)), np.nan)
+    for i, s in enumerate(students):
+        fin = s.get("financials", {}) or {}
+        tuition[i] = fin.get("tuition_per_semester") or 0
+        schol[i] = _amount(fin.get("scholarship"), "amount")
+        stipend[i] = _amount(fin.get("assistantship"), "stipend")
+        monthly = (by_id.get(s.get("student_id"), {}).get("expenses") or {}).get("monthly")
+        if monthly:
+            actual[i] = _actual_by_category(monthly)
+    return {
+        "student_id": np.array([s.get("student_id") for s in students], dtype=object),
+        "tuition": tuition, "scholarship": schol, "stipend": stipend, "actual": actual,
+    }
+
+
+def _monthly_income(base, aid):
+    """Monthly income: aid when any is recorded, else the tuition-derived base."""
+    return np.where(aid > 0, aid, base)
+
+
+def batch_budget(tuition, scholarship=0.0, stipend=0.0, actual=None, student_id=None) -> pd.DataFrame:
+    """
+    Vectorized `infer_monthly_budget` for many students at once.
+
+      tuition       per-semester tuition, shape (n,)
+      scholarship   per-semester scholarship amount, spread over the semester
+      stipend       monthly assistantship stipend
+      actual        audited monthly spending, shape (n, 5) in
+                    SPENDING_CATEGORIES order (NaN rows = no audit)
+
+    The allocation splits the tuition-derived base plus aid by
+    BUDGET_SHARES; that base is a cost heuristic, not money the student has.
+    `surplus` is therefore measured against income, as in
+    `optimize_allocations`: aid, or the base for students with no recorded
+    aid. Returns one row per student with the allocation per category, the
+    gap versus actual spending per category (positive = overspent), totals,
+    and `surplus` (income minus actual spending; negative is a deficit).
+    """
+    tuition = np.atleast_1d(np.asarray(tuition, dtype=float))
+    n = tuition.shape[0]
+    schol = np.broadcast_to(np.asarray(scholarship, dtype=float), (n,))
+    stipend = np.broadcast_to(np.asarray(stipend, dtype=float), (n,))
+
+    base = np.where(tuition > 0, tuition / MONTHS_PER_SEMESTER, DEFAULT_BASE)
+    aid = schol / MONTHS_PER_SEMESTER + stipend
+    available = base + aid
+    income = _monthly_income(base, aid)
+    shares = np.fromiter(BUDGET_SHARES.values(), dtype=float)
+    alloc = available[:, None] * shares[None, :]  # (n, categories)
+
+    cols = {}
+    if student_id is not None:
+        cols["student_id"] = student_id
+    cols.update({"tuition": tuition, "monthly_base": base, "monthly_aid": aid, "available": available,
+                 "income": income})
+    cols.update({f"alloc_{c.lower()}": alloc[:, j] for j, c in enumerate(CATEGORIES)})
+
+    if actual is not None:
+        actual = np.asarray(actual, dtype=float).reshape(n, len(SPENDING_CATEGORIES))
+        gaps = actual - alloc[:, :len(SPENDING_CATEGORIES)]
+        actual_total = actual.sum(axis=1)
+        cols.update({f"gap_{c.lower()}": gaps[:, j] for j, c in enumerate(SPENDING_CATEGORIES)})
+        cols["actual_total"] = actual_total
+        cols["surplus"] = income - actual_total
+        cols["over_budget_categories"] = (gaps > 0).sum(axis=1)
+    return pd.DataFrame(cols)
+
+
+def budgets_for_students(students, expenses=None) -> pd.DataFrame:
+    """`batch_budget` over the student/expense JSON records."""
+    a = cohort_arrays(students, expenses)
+    return batch_budget(a["tuition"], a["scholarship"], a["stipend"], a["actual"], a["student_id"])
+
+
+# ----------------------------
+#  Constraint-based optimizer
+# ----------------------------
+
+def project_budget(current, minimum, cap, weights=None):
+    """
+    Row-wise solution of
+
+        minimize   sum_i w_i (x_i - c_i)^2
+        subject to x_i >= m_i,  sum_i x_i <= cap
+
+    for arrays of shape (n, k). By the KKT conditions
+    x_i = max(m_i, c_i - lambda / (2 w_i)) for one multiplier lambda >= 0 per
+    row; sum(x) is piecewise linear in lambda, so lambda is found exactly by
+    evaluating it at the k sorted breakpoints and interpolating, with no
+    iterative solver. Rows where sum(m) > cap are infeasible and get x = m.
+    Returns (x, feasible).
+    """
+    c = np.atleast_2d(np.asarray(current, dtype=float))
+    m = np.broadcast_to(np.asarray(minimum, dtype=float), c.shape)
+    cap = np.broadcast_to(np.asarray(cap, dtype=float), c.shape[:1])
+    w = np.ones_like(c) if weights is None else np.broadcast_to(np.asarray(weights, dtype=float), c.shape)
+    a = 0.5 / w
+
+    x0 = np.maximum(c, m)
+    feasible = m.sum(axis=1) <= cap
+    binding = feasible & (x0.sum(axis=1) > cap)
+    x = np.where(feasible[:, None], x0, m)
+    if not binding.any():
+        return x, feasible
+
+    cb, mb, ab, capb = c[binding], m[binding], a[binding], cap[binding]
+    # lambda at which each category hits its minimum, sorted per row
+    brk = np.sort(np.maximum((cb - mb) / ab, 0.0), axis=1)
+    lam = np.concatenate([np.zeros((len(cb), 1)), brk], axis=1)  # (r, k+1)
+    totals = np.maximum(mb[:, None, :], cb[:, None, :] - ab[:, None, :] * lam[:, :, None]).sum(axis=2)
+    # First breakpoint where the total drops to the cap; interpolate inside it
+    j = np.maximum((totals <= capb[:, None]).argmax(axis=1), 1)
+    rows = np.arange(len(cb))
+    l0, l1 = lam[rows, j - 1], lam[rows, j]
+    t0, t1 = totals[rows, j - 1], totals[rows, j]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(t0 > t1, (t0 - capb) / (t0 - t1), 0.0)
+    lam_star = l0 + frac * (l1 - l0)
+    x[binding] = np.maximum(mb, cb - ab * lam_star[:, None])
+    return x, feasible
+
+
+def minimums_from_city(city_summary: dict, fraction=CITY_MIN_FRACTION, monthly=None) -> np.ndarray:
+    """
+    Per-category floors (SPENDING_CATEGORIES order). A category's monthly
+    cost in `monthly` (CostOfLiving.monthly) is used as is; otherwise the
+    floor is approximated as `fraction` of its average item price in
+    `city_summary` (`summarize_city_costs`), e.g. for Food.
+    """
+    city_summary, monthly = city_summary or {}, monthly or {}
+
+    def floor(c):
+        key = CITY_CATEGORY_MAP[c]
+        if monthly.get(key) is not None:
+            return float(monthly[key])
+        return fraction * float(city_summary.get(key) or 0)
+    return np.array([floor(c) for c in SPENDING_CATEGORIES])
+
+
+def optimize_allocations(tuition, scholarship, stipend, current, minimum, other_income=0.0,
+                         savings_rate=DEFAULT_SAVINGS_RATE, student_id=None) -> pd.DataFrame:
+    """
+    Batch budget plan. Monthly income is the stipend plus the scholarship
+    spread over the semester plus `other_income`; students with no recorded
+    income fall back to the tuition-derived base of `infer_monthly_budget`.
+    After reserving `savings_rate` of income, spending categories are moved
+    as little as possible (relative to current spending, so large categories
+    absorb proportionally more) while staying at or above `minimum`. A floor
+    only stops cuts: a category already below it (e.g. subsidized campus
+    housing) is kept as is, never raised. Rows without a spending audit are
+    planned from the fixed shares.
+    """
+    tuition = np.atleast_1d(np.asarray(tuition, dtype=float))
+    n, k = tuition.shape[0], len(SPENDING_CATEGORIES)
+    aid = (np.broadcast_to(np.asarray(scholarship, dtype=float), (n,)) / MONTHS_PER_SEMESTER
+           + np.broadcast_to(np.asarray(stipend, dtype=float), (n,))
+           + np.broadcast_to(np.asarray(other_income, dtype=float), (n,)))
+    base = np.where(tuition > 0, tuition / MONTHS_PER_SEMESTER, DEFAULT_BASE)
+    income = _monthly_income(base, aid)
+    savings_target = income * savings_rate
+
+    current = np.asarray(current, dtype=float).reshape(n, k)
+    shares = np.array([BUDGET_SHARES[c] for c in SPENDING_CATEGORIES])
+    current = np.where(np.isnan(current), income[:, None] * shares[None, :], current)
+    minimum = np.minimum(np.broadcast_to(np.asarray(minimum, dtype=float), (n, k)), current)
+    weights = 1.0 / np.maximum(current, 1.0)
+
+    plan, feasible = project_budget(current, minimum, income - savings_target, weights)
+    savings = income - plan.sum(axis=1)
+
+    cols = {} if student_id is None else {"student_id": student_id}
+    cols.update({"income": income, "savings_target": savings_target})
+    cols.update({f"plan_{c.lower()}": plan[:, j] for j, c in enumerate(SPENDING_CATEGORIES)})
+    cols.update({f"change_{c.lower()}": plan[:, j] - current[:, j] for j, c in enumerate(SPENDING_CATEGORIES)})
+    cols.update({"plan_savings": savings, "feasible": feasible,
+                 "shortfall": np.maximum(savings_target - savings, 0.0)})
+    return pd.DataFrame(cols)
+
+
+@lru_cache(maxsize=256)
+def _optimize_one(tuition, scholarship, stipend, current, minimum, savings_rate):
+    current = [np.nan if v is None else v for v in current]
+    plan = optimize_allocations(tuition, scholarship, stipend, [current], minimum, savings_rate=savings_rate)
+    # Read-only: every caller of the cache shares this one object
+    return MappingProxyType(plan.iloc[0].to_dict())
+
+
+def _cache_key(values) -> tuple:
+    """Hashable form of a float vector; NaN (no data) becomes None so equal inputs hit the cache."""
+    return tuple(None if np.isnan(v) else float(v) for v in values)
+
+
+def optimize_budget(student, expense_record=None, city_summary=None, savings_rate=DEFAULT_SAVINGS_RATE,
+                    monthly=None) -> dict:
+    """
+    Plan for one student; cached on the numeric inputs, so reruns (and other
+    students with identical finances) skip the solve. Returns a new dict.
+    """
+    a = cohort_arrays([student], [expense_record] if expense_record else [])
+    return dict(_optimize_one(float(a["tuition"][0]), float(a["scholarship"][0]), float(a["stipend"][0]),
+                              _cache_key(a["actual"][0]), _cache_key(minimums_from_city(city_summary, monthly=monthly)),
+                              float(savings_rate)))
+
+
+def optimize_cohort(students, expenses=None, city_summary=None, savings_rate=DEFAULT_SAVINGS_RATE,
+                    monthly=None) -> pd.DataFrame:
+    a = cohort_arrays(students, expenses)
+    return optimize_allocations(a["tuition"], a["scholarship"], a["stipend"], a["actual"],
+                                minimums_from_city(city_summary, monthly=monthly), savings_rate=savings_rate,
+                                student_id=a["student_id"])
+
+
+def optimize_cohort_async(students, expenses=None, city_summary=None, savings_rate=DEFAULT_SAVINGS_RATE,
+                          monthly=None):
+    """Re-plan a whole cohort on a background thread; returns a Future."""
+    return _PLANNER.submit(optimize_cohort, students, expenses, city_summary, savings_rate, monthly)
+
+
+def synthetic_cohort(n, seed=None) -> dict:
+    """Random cohort arrays shaped like `cohort_arrays`, for benchmarking."""
+    rng = np.random.default_rng(seed)
+    tuition = rng.choice([0.0, 22000.0, 26000.0, 30000.0], size=n)
+    schol = rng.choice([0.0, 1000.0, 3000.0, 5000.0], size=n, p=[0.5, 0.2, 0.2, 0.1])
+    stipend = np.where(rng.random(n) < 0.4, rng.choice([1800.0, 2000.0, 2800.0], size=n), 0.0)
+    actual = rng.gamma(4.0, [150.0, 120.0, 25.0, 15.0, 35.0], size=(n, len(SPENDING_CATEGORIES)))
+    return {"student_id": None, "tuition": tuition, "scholarship": schol, "stipend": stipend, "actual": actual}
+
+
+if __name__ == "__main__":
+    import time
+
+    cohort = synthetic_cohort(1_000_000, seed=0)
+    start = time.perf_counter()
+    out = batch_budget(cohort["tuition"], cohort["scholarship"], cohort["stipend"], cohort["actual"])
+    print(f"batch_budget: {len(out):,} students in {time.perf_counter() - start:.2f}s; "
+          f"{(out['surplus'] < 0).mean():.1%} in deficit")
+
+    start = time.perf_counter()
+    plan = optimize_allocations(cohort["tuition"], cohort["scholarship"], cohort["stipend"], cohort["actual"],
+                                minimum=[300.0, 200.0, 40.0, 60.0, 0.0])
+    print(f"optimize_allocations: {len(plan):,} students in {time.perf_counter() - start:.2f}s; "
+          f"{(~plan['feasible']).mean():.1%} infeasible")
@@ -0,0 +1,225 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        cashflow.py
+Purpose:     Month-by-month cash-flow projections for students through their
+             expected graduation. Combines invoice balances (or projected
+             tuition for semesters not yet invoiced), scholarships,
+             assistantship stipends and audited monthly spending into a
+             running balance. `CashFlow` recomputes only the months affected
+             when one input changes; `project_cohort` builds every student's
+             projection in one vectorized pass and is cached on the data
+             files' modification times.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import os
+import re
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+from config import STUDENTS_PATH, EXPENSES_PATH
+from utils.students import load_students, load_expenses
+
+# Signed streams: inflows positive, outflows negative
+STREAMS = ["stipend", "scholarship", "tuition", "living"]
+# Month a semester's bill is due, and the last month of the academic year
+SEMESTER_START = {"spring": 1, "summer": 6, "fall": 8}
+GRAD_MONTH = 5
+
+
+def _semester_start(label):
+    """'Fall 2025' -> Period('2025-08'); None if unrecognized."""
+    m = re.match(r"\s*(spring|summer|fall)\s+(\d{4})", str(label or ""), re.I)
+    if not m:
+        return None
+    return pd.Period(year=int(m.group(2)), month=SEMESTER_START[m.group(1).lower()], freq="M")
+
+
+def _next_semester(p):
+    """Fall -> following Spring -> Fall (summers are not billed by default)."""
+    return pd.Period(year=p.year + 1, month=1, freq="M") if p.month >= SEMESTER_START["fall"] \
+        else pd.Period(year=p.year, month=SEMESTER_START["fall"], freq="M")
+
+
+def _amount(value, key):
+    return (value.get(key) or 0) if isinstance(value, dict) else 0
+
+
+def student_events(student, expense_record=None, start=None):
+    """
+    Inputs for one student's projection:
+      (start, end, stipend_per_month, living_per_month, [(month, stream, amount), ...])
+    Invoiced semesters contribute their unpaid balance; later semesters up
+    to graduation are projected at `tuition_per_semester`. The scholarship
+    arrives with each semester's bill.
+    """
+    fin = student.get("financials", {}) or {}
+    prog = student.get("program", {}) or {}
+    tuition = float(fin.get("tuition_per_semester") or 0)
+    schol = float(_amount(fin.get("scholarship"), "amount"))
+    stipend = float(_amount(fin.get("assistantship"), "stipend"))
+    living = float(((expense_record or {}).get("expenses") or {}).get("monthly", {}).get("total") or 0)
+
+    events, billed = [], []
+    for inv in fin.get("invoices", []) or []:
+        month = _semester_start(inv.get("semester"))
+        if month is None:
+            continue
+        billed.append(month)
+        events.append((month, "tuition", -float(inv.get("balance") or 0)))
+        events.append((month, "scholarship", schol))
+
+    start = pd.Period(start, freq="M") if start is not None else \
+        (min(billed) if billed else pd.Period(pd.Timestamp.today(), freq="M"))
+    grad = int(prog.get("expected_grad_year") or start.year)
+    end = max(pd.Period(year=grad, month=GRAD_MONTH, freq="M"), start)
+
+    sem = _next_semester(max(billed)) if billed else _semester_start(f"{'fall' if start.month >= 8 else 'spring'} {start.year}")
+    if sem < start:
+        sem = _next_semester(sem)
+    while sem <= end:
+        events.append((sem, "tuition", -tuition))
+        events.append((sem, "scholarship", schol))
+        sem = _next_semester(sem)
+    if billed:
+        end = max(end, max(billed) + 4)
+    return start, end, stipend, living, [e for e in events if start <= e[0] <= end]
+
+
+# ----------------------------
+#  Single student, incremental
+# ----------------------------
+
+class CashFlow:
+    """
+    Monthly streams plus a running balance. Changing a stream recomputes
+    net flow only for the changed months and the balance only from the
+    first changed month onwards; earlier months are untouched.
+    """
+
+    def __init__(self, months: pd.PeriodIndex, streams: dict, opening_balance=0.0):
+        self.months = months
+        self.opening_balance = float(opening_balance)
+        self.streams = {name: np.asarray(streams.get(name, np.zeros(len(months))), dtype=float).copy()
+                        for name in STREAMS}
+        self.net = sum(self.streams.values())
+        self.balance = self.opening_balance + np.cumsum(self.net)
+        self.recomputed_from = 0
+
+    @classmethod
+    def for_student(cls, student, expense_record=None, start=None, opening_balance=0.0):
+        start, end, stipend, living, events = student_events(student, expense_record, start)
+        months = pd.period_range(start, end, freq="M")
+        streams = {"stipend": np.full(len(months), stipend), "living": np.full(len(months), -living),
+                   "scholarship": np.zeros(len(months)), "tuition": np.zeros(len(months))}
+        for month, stream, amount in events:
+            streams[stream][(month - start).n] += amount
+        return cls(months, streams, opening_balance)
+
+    def _index(self, month):
+        if month is None:
+            return None
+        return (pd.Period(month, freq="M") - self.months[0]).n
+
+    def set_stream(self, name, values, start=None, end=None):
+        """Replace `name` for months [start, end] (inclusive; default all)."""
+        i0 = self._index(start) or 0
+        i1 = len(self.months) if end is None else self._index(end) + 1
+        new = np.broadcast_to(np.asarray(values, dtype=float), (i1 - i0,))
+        changed = np.flatnonzero(self.streams[name][i0:i1] != new)
+        if not changed.size:
+            return
+        lo, hi = i0 + changed[0], i0 + changed[-1] + 1
+        delta = new[changed[0]:changed[-1] + 1] - self.streams[name][lo:hi]
+        self.streams[name][lo:hi] = new[changed[0]:changed[-1] + 1]
+        self.net[lo:hi] += delta
+        # Balances before `lo` are unaffected; after `hi` they shift by a constant
+        prev = self.balance[lo - 1] if lo else self.opening_balance
+        self.balance[lo:hi] = prev + np.cumsum(self.net[lo:hi])
+        self.balance[hi:] += delta.sum()
+        self.recomputed_from = lo
+
+    def set_monthly_spend(self, amount, start=None, end=None):
+        self.set_stream("living", -float(amount), start, end)
+
+    def set_opening_balance(self, amount):
+        self.balance += float(amount) - self.opening_balance
+        self.opening_balance = float(amount)
+
+    def to_frame(self) -> pd.DataFrame:
+        df = pd.DataFrame(self.streams, index=self.months.to_timestamp())
+        df["net"] = self.net
+        df["balance"] = self.balance
+        df.index.name = "month"
+        return df
+
+
+# ----------------------------
+#  Whole cohort, vectorized
+# ----------------------------
+
+def project_cohort(students, expenses=None, opening_balance=0.0):
+    """
+    Every student's projection on one shared month grid. Returns
+    (months, balance, summary): `balance` has shape (students, months) with
+    NaN outside each student's window; `summary` has one row per student
+    (lowest balance and when, first negative month, final balance).
+    """
+    by_id = {e.get("student_id"): e for e in (expenses or [])}
+    parsed = [student_events(s, by_id.get(s.get("student_id"))) for s in students]
+    n = len(parsed)
+    if not n:
+        return pd.PeriodIndex([], freq="M"), np.zeros((0, 0)), pd.DataFrame()
+
+    origin = min(p[0] for p in parsed)
+    starts = np.array([(p[0] - origin).n for p in parsed])
+    ends = np.array([(p[1] - origin).n for p in parsed])
+    months = pd.period_range(origin, periods=int(ends.max()) + 1, freq="M")
+    t = np.arange(len(months))
+    active = (t[None, :] >= starts[:, None]) & (t[None, :] <= ends[:, None])
+
+    stipend = np.array([p[2] for p in parsed])
+    living = np.array([p[3] for p in parsed])
+    net = np.where(active, (stipend - living)[:, None], 0.0)
+
+    rows = [(i, (m - origin).n, amt) for i, p in enumerate(parsed) for m, _, amt in p[4]]
+    if rows:
+        r, c, a = (np.array(x) for x in zip(*rows))
+        np.add.at(net, (r.astype(int), c.astype(int)), a.astype(float))
+
+    balance = np.where(active, opening_balance + np.cumsum(net, axis=1), np.nan)
+    low_idx = np.nanargmin(balance, axis=1)
+    negative = np.where(active, balance < 0, False)
+    first_neg = np.where(negative.any(axis=1), negative.argmax(axis=1), -1)
+
+    summary = pd.DataFrame({
+        "student_id": [s.get("student_id") for s in students],
+        "start": [p[0] for p in parsed],
+        "end": [p[1] for p in parsed],
+        "lowest_balance": balance[np.arange(n), low_idx],
+        "lowest_month": months[low_idx],
+        "first_negative_month": [months[i] if i >= 0 else None for i in first_neg],
+        "final_balance": balance[np.arange(n), ends],
+    })
+    return months, balance, summary
+
+
+@lru_cache(maxsize=2)
+def _cached_projection(students_path, expenses_path, students_mtime, expenses_mtime):
+    return project_cohort(load_students(students_path), load_expenses(expenses_path))
+
+
+def cohort_projection(students_path=STUDENTS_PATH, expenses_path=EXPENSES_PATH):
+    """`project_cohort` for the data files, recomputed only when they change."""
+    return _cached_projection(students_path, expenses_path,
+                              os.path.getmtime(students_path), os.path.getmtime(expenses_path))
@@ -0,0 +1,202 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        cohort_stats.py
+Purpose:     Precomputed peer statistics for the monthly expense audit.
+             Every `expenses.monthly` field is aggregated (count, mean,
+             percentiles, histogram and the sorted values) per cohort: all
+             students and each level, school and department. Aggregates are
+             NumPy arrays kept in memory; when the data files change only
+             the cohorts containing added, removed or edited records are
+             recomputed. A student's percentile within a cohort is then one
+             vectorized comparison against the stored sorted values, so
+             "you vs. your cohort" renders instantly.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from config import STUDENTS_PATH, EXPENSES_PATH
+from utils.students import load_students, load_expenses
+
+DIMENSIONS = ["level", "school", "department"]
+ALL = ("all", "All students")
+PERCENTILES = np.array([10, 25, 50, 75, 90])
+HIST_BINS = 10
+
+
+def flatten_monthly(monthly: dict) -> dict:
+    """
+    'on_campus.cafeteria'-style leaf fields plus a subtotal per nested group
+    and an overall 'total' (recomputed rather than trusting the stored one).
+    """
+    out = {}
+    for key, value in (monthly or {}).items():
+        if key == "total":
+            continue
+        if isinstance(value, dict):
+            for sub, amount in value.items():
+                out[f"{key}.{sub}"] = float(amount or 0)
+            out[key] = float(sum(v or 0 for v in value.values()))
+        else:
+            out[key] = float(value or 0)
+    out["total"] = sum(v for k, v in out.items() if "." not in k)
+    return out
+
+
+def build_records(students, expenses) -> dict:
+    """student_id -> {'level','school','department','values'} for audited students."""
+    by_id = {s.get("student_id"): s for s in students}
+    records = {}
+    for e in expenses:
+        sid = e.get("student_id")
+        prog = (by_id.get(sid) or {}).get("program", {}) or {}
+        records[sid] = {
+            "level": prog.get("level") or e.get("level") or "Unknown",
+            "school": prog.get("school") or "Unknown",
+            "department": prog.get("department") or "Unknown",
+            "values": flatten_monthly((e.get("expenses") or {}).get("monthly")),
+        }
+    return records
+
+
+def _digest(record) -> str:
+    return hashlib.blake2b(json.dumps(record, sort_keys=True).encode(), digest_size=8).hexdigest()
+
+
+def _cohorts(record):
+    return [ALL] + [(dim, record[dim]) for dim in DIMENSIONS]
+
+
+@dataclass(frozen=True)
+class CohortAggregate:
+    count: int
+    mean: np.ndarray          # (fields,)
+    percentiles: np.ndarray   # (len(PERCENTILES), fields)
+    sorted_values: np.ndarray  # (count, fields), each column sorted
+    hist_counts: np.ndarray   # (fields, HIST_BINS)
+    hist_edges: np.ndarray    # (fields, HIST_BINS + 1)
+
+    @classmethod
+    def from_matrix(cls, m: np.ndarray):
+        srt = np.sort(m, axis=0)
+        lo, hi = srt[0], srt[-1]
+        hi = np.where(hi > lo, hi, lo + 1.0)
+        edges = lo[:, None] + (hi - lo)[:, None] * np.linspace(0.0, 1.0, HIST_BINS + 1)[None, :]
+        # Bin every field at once: index of each value within its field's edges
+        idx = np.clip(((m - lo) / (hi - lo) * HIST_BINS).astype(int), 0, HIST_BINS - 1)
+        counts = np.zeros((m.shape[1], HIST_BINS), dtype=int)
+        np.add.at(counts, (np.broadcast_to(np.arange(m.shape[1]), m.shape), idx), 1)
+        for arr in (srt, edges, counts):
+            arr.flags.writeable = False
+        return cls(len(m), m.mean(axis=0), np.percentile(m, PERCENTILES, axis=0), srt, counts, edges)
+
+
+class CohortStats:
+    """Per-cohort aggregates over the expense audit, updated incrementally."""
+
+    def __init__(self):
+        self.fields = []
+        self._lock = threading.Lock()
+        self._digests = {}   # student_id -> record digest
+        self._records = {}   # student_id -> record
+        self._members = {}   # cohort -> set(student_id)
+        self._aggregates = {}  # cohort -> CohortAggregate
+        self.last_recomputed = set()
+
+    def _matrix(self, ids):
+        return np.array([[self._records[i]["values"].get(f, 0.0) for f in self.fields] for i in sorted(ids)])
+
+    def update(self, records: dict) -> set:
+        """Sync with `records` (see build_records); returns the cohorts recomputed."""
+        fields = sorted({f for r in records.values() for f in r["values"]})
+        digests = {sid: _digest(r) for sid, r in records.items()}
+        with self._lock:
+            if fields != self.fields:
+                # New or removed expense fields change every array's layout
+                self.fields = fields
+                self._digests, self._records, self._members, self._aggregates = {}, {}, {}, {}
+            changed = {sid for sid in digests.keys() | self._digests.keys()
+                       if digests.get(sid) != self._digests.get(sid)}
+            affected = set()
+            for sid in changed:
+                old = self._records.pop(sid, None)
+                if old is not None:
+                    for c in _cohorts(old):
+                        self._members[c].discard(sid)
+                        affected.add(c)
+                new = records.get(sid)
+                if new is not None:
+                    self._records[sid] = new
+                    for c in _cohorts(new):
+                        self._members.setdefault(c, set()).add(sid)
+                        affected.add(c)
+            for c in affected:
+                ids = self._members.get(c)
+                if ids:
+                    self._aggregates[c] = CohortAggregate.from_matrix(self._matrix(ids))
+                else:
+                    self._members.pop(c, None)
+                    self._aggregates.pop(c, None)
+            self._digests = digests
+            self.last_recomputed = affected
+            return affected
+
+    def aggregate(self, dimension, value):
+        return self._aggregates.get(ALL if dimension == "all" else (dimension, value))
+
+    def cohort_values(self, dimension):
+        return sorted(v for d, v in self._aggregates if d == dimension)
+
+    def compare(self, values: dict, dimension, value) -> pd.DataFrame:
+        """
+        A student's fields against a cohort: cohort percentiles, mean and the
+        student's percentile rank (share of the cohort spending less).
+        `values` is the student's own `flatten_monthly` output; the app passes
+        the expense ledger's latest month, not the audit record the cohort
+        aggregates were built from.
+        """
+        agg = self.aggregate(dimension, value)
+        if agg is None:
+            return pd.DataFrame()
+        you = np.array([values.get(f, 0.0) for f in self.fields])
+        below = (agg.sorted_values < you[None, :]).sum(axis=0)
+        equal = (agg.sorted_values == you[None, :]).sum(axis=0)
+        df = pd.DataFrame({"field": self.fields, "you": you, "cohort_mean": agg.mean})
+        for p, row in zip(PERCENTILES, agg.percentiles):
+            df[f"p{p}"] = row
+        df["your_percentile"] = (below + 0.5 * equal) / agg.count * 100.0
+        df["cohort_size"] = agg.count
+        return df
+
+
+_STATS = CohortStats()
+_SYNCED = {"key": None}
+_SYNC_LOCK = threading.Lock()
+
+
+def get_cohort_stats(students_path=STUDENTS_PATH, expenses_path=EXPENSES_PATH) -> CohortStats:
+    """
+    Shared aggregates, re-synced only when a data file's mtime changes (and
+    then only the affected cohorts are recomputed).
+    """
+    key = (os.path.getmtime(students_path), os.path.getmtime(expenses_path))
+    with _SYNC_LOCK:
+        if _SYNCED["key"] != key:
+            _STATS.update(build_records(load_students(students_path), load_expenses(expenses_path)))
+            _SYNCED["key"] = key
+    return _STATS
@@ -16,14 +16,34 @@ Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
 '''
 
 
-import google.generativeai as genai
-from config import GEMINI_API_KEY
+import json
+import time
 
+from config import GEMINI_API_KEY, GEMINI_API_ENDPOINT
+from utils.lazy import lazy_import
+from utils.metrics import record_llm
+from utils.tracing import span, traced
+
+genai = lazy_import("google.generativeai")  # imported on the first advice request
+
+MODEL_NAME = "gemini-1.5-pro"
+
+
+def configure_gemini():
+    """Point the SDK at Gemini, or at GEMINI_API_ENDPOINT (REST) when set."""
+    if GEMINI_API_ENDPOINT:
+        genai.configure(api_key=GEMINI_API_KEY, transport="rest",
+                        client_options={"api_endpoint": GEMINI_API_ENDPOINT})
+    else:
+        genai.configure(api_key=GEMINI_API_KEY)
+
+
+@traced()
 def generate_budget_advice(student, objective, context):
     if not GEMINI_API_KEY:
         return "⚠️ Gemini API key missing."
-    genai.configure(api_key=GEMINI_API_KEY)
-    model = genai.GenerativeModel("gemini-1.5-pro")
+    configure_gemini()
+    model = genai.GenerativeModel(MODEL_NAME)
     prompt = f"""
     You are a CMU finance advisor. Given the student profile:
     {student}
@@ -32,7 +52,83 @@ def generate_budget_advice(student, objective, context):
     Provide detailed financial and academic advice in bullet form.
     """
     try:
-        resp = model.generate_content(prompt)
+        start = time.perf_counter()
+        with span("gemini.generate_content", model=MODEL_NAME):
+            resp = model.generate_content(prompt)
+        record_llm(MODEL_NAME, time.perf_counter() - start, prompt, resp.text)
         return resp.text
     except Exception as e:
         return f"Error generating advice: {e}"
+
+
+def _plain(x):
+    """Roster views (and lists of them) as plain dicts/lists."""
+    if hasattr(x, "to_dict"):
+        return x.to_dict()
+    if isinstance(x, (list, tuple)):
+        return [_plain(v) for v in x]
+    return x
+
+
+def advisor_profile(student) -> dict:
+    """
+    The student fields advice prompts may see: name, id, program and
+    financials. Login, contact and date-of-birth fields never leave the app.
+    """
+    prog = student.get("program") or {}
+    fin = student.get("financials") or {}
+    return {
+        "name": student.get("name"),
+        "student_id": student.get("student_id"),
+        "program": {k: _plain(prog.get(k)) for k in ("level", "department", "school", "gpa")},
+        "financials": {k: _plain(fin.get(k)) for k in ("tuition_per_semester", "scholarship", "assistantship", "invoices")},
+    }
+
+
+def build_chat_prompt(student, expense_record, tuition_df, cost_model, prompt) -> str:
+    """
+    The advisory-chat prompt: student profile, audited monthly expenses, the
+    first matched tuition rows and Pittsburgh cost items.
+    """
+    student = advisor_profile(student)
+    prog = student["program"]
+    fin = student["financials"]
+
+    student_context = f"""
+        Student: {student.get('name')}
+        ID: {student.get('student_id')}
+        Level: {prog.get('level')}
+        Department: {prog.get('department')}
+        School: {prog.get('school')}
+        GPA: {prog.get('gpa')}
+        Tuition per semester: {fin.get('tuition_per_semester')}
+        Scholarship: {fin.get('scholarship')}
+        Assistantship: {fin.get('assistantship')}
+        Invoices: {fin.get('invoices')}
+        """
+
+    tuition_context = tuition_df.head(5).to_dict(orient="records") if not tuition_df.empty else "N/A"
+    col_context = cost_model.items[["label", "value", "category"]].head(5).to_dict(orient="records") \
+        if not cost_model.empty else "N/A"
+    expense_context = expense_record["expenses"]["monthly"] if expense_record else "N/A"
+
+    full_prompt = f"""
+        You are Brok, an academic and financial advisor for Carnegie Mellon students.
+        Use the student's data and context to give clear, factual advice.
+
+        Student context:
+        {student_context}
+
+        Monthly Expense context (from audit data):
+        {json.dumps(expense_context, indent=2)}
+
+        Tuition context:
+        {tuition_context}
+
+        Cost of living (Pittsburgh averages):
+        {col_context}
+
+        Student's input:
+        {prompt}
+        """
+    return full_prompt
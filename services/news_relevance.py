@@ -0,0 +1,139 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        news_relevance.py
+Purpose:     Scores news articles once, at ingest time, against keyword sets
+             for every student segment (school, department, level, course)
+             derived with `get_student_keywords`, plus a global CMU/finance
+             segment. All keywords are compiled into a single regex, so each
+             article is scanned once regardless of how many segments exist.
+             Scores are stored per segment in the article store, so a
+             personalized feed is an indexed lookup at render time.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import os
+import re
+from functools import lru_cache
+
+from config import STUDENTS_PATH
+from utils.article_store import load_articles, count_articles, save_scores
+from utils.students import load_students, get_student_keywords
+
+# Global segment: the terms the News page used to filter on
+GLOBAL_TERMS = ["carnegie mellon", "cmu", "pittsburgh", "tuition", "scholarship", "student", "financial aid"]
+
+# Words too generic to signal relevance on their own
+_STOPWORDS = {
+    "and", "the", "for", "with", "of", "in", "to", "a", "an", "on", "ii", "iii", "i",
+    "college", "school", "science", "sciences", "studies", "introduction", "intro",
+    "advanced", "topics", "engineering", "masters", "master", "undergraduate", "phd", "program",
+}
+
+TITLE_WEIGHT = 3.0
+SUMMARY_WEIGHT = 1.0
+PHRASE_WEIGHT = 2.0
+WORD_WEIGHT = 1.0
+
+
+def _segment_terms(segment_kind, phrase):
+    """Full phrase (strong signal) plus its distinctive words (weak signal)."""
+    phrase = re.sub(r"\s+", " ", phrase.lower()).strip()
+    terms = {phrase: PHRASE_WEIGHT}
+    if segment_kind != "level":
+        for w in re.findall(r"[a-z][a-z0-9]+", phrase):
+            if len(w) >= 4 and w not in _STOPWORDS and w != phrase:
+                terms.setdefault(w, WORD_WEIGHT)
+    return terms
+
+
+def segment_keywords(students) -> dict:
+    """segment id -> {keyword: weight} for every segment in the roster."""
+    segs = {"all": {t: PHRASE_WEIGHT for t in GLOBAL_TERMS}}
+    for s in students:
+        p = s.get("program", {})
+        kws = set(get_student_keywords(s))
+        for key in ["school", "department", "level"]:
+            v = (p.get(key) or "").lower().strip()
+            if v and v in kws:
+                segs.setdefault(f"{key}:{v}", _segment_terms(key, v))
+        for c in p.get("courses", []):
+            norm = re.sub(r"\W+", " ", c.lower()).strip()
+            segs.setdefault(f"course:{norm}", _segment_terms("course", norm))
+    return segs
+
+
+class RelevanceIndex:
+    """All segment keywords compiled into one alternation; one scan per text."""
+
+    def __init__(self, seg_keywords: dict):
+        self.segments = list(seg_keywords)
+        self._postings = {}  # keyword -> [(segment, weight), ...]
+        for seg, terms in seg_keywords.items():
+            for kw, w in terms.items():
+                self._postings.setdefault(kw, []).append((seg, w))
+        # Longest first so phrases win over their own words
+        alternation = "|".join(re.escape(k) for k in sorted(self._postings, key=len, reverse=True))
+        self._rx = re.compile(rf"\b(?:{alternation})\b", re.I) if alternation else None
+
+    def _scan(self, text, weight, scores):
+        if not text or self._rx is None:
+            return
+        for kw in {m.group(0).lower() for m in self._rx.finditer(text)}:
+            for seg, w in self._postings.get(kw, ()):
+                scores[seg] = scores.get(seg, 0.0) + w * weight
+
+    def score(self, title, summary) -> dict:
+        scores = {}
+        self._scan(title, TITLE_WEIGHT, scores)
+        self._scan(summary, SUMMARY_WEIGHT, scores)
+        return scores
+
+
+@lru_cache(maxsize=4)
+def _index_for(path, mtime):
+    return RelevanceIndex(segment_keywords(load_students(path)))
+
+
+def get_index(students_path=STUDENTS_PATH) -> RelevanceIndex:
+    """Index for the current roster; rebuilt only when the students file changes."""
+    return _index_for(students_path, os.path.getmtime(students_path))
+
+
+def score_rows(rows, index=None) -> list:
+    """(segment, guid, score, published_ts) tuples for article dicts/rows."""
+    index = index or get_index()
+    out = []
+    for r in rows:
+        for seg, sc in index.score(r.get("title"), r.get("summary")).items():
+            out.append((seg, r["guid"], sc, r.get("published_ts")))
+    return out
+
+
+def score_new_articles(rows):
+    """Called by ingestion with just the newly stored articles."""
+    if rows:
+        save_scores(score_rows(rows))
+
+
+def rescore_store(batch=2000):
+    """Recompute every stored article's scores (e.g. after roster changes)."""
+    index = get_index()
+    total = count_articles()
+    first = True
+    for offset in range(0, total, batch):
+        df = load_articles(limit=batch, offset=offset)
+        save_scores(score_rows(df.to_dict("records"), index), replace_all=first)
+        first = False
+    return total
+
+
+if __name__ == "__main__":
+    print(f"Rescored {rescore_store()} articles")
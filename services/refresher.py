@@ -0,0 +1,160 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        refresher.py
+Purpose:     Standalone background process that owns all scraping. Runs the
+             cost-of-living, news, loans and tuition scrapers on per-source
+             intervals, writes every successful result as a new version in
+             the local snapshot store, and records per-source run metrics.
+             Run alongside the app with REFRESHER_MANAGED=1 so user requests
+             never wait on (or see failures from) a third-party site.
+
+             Usage:  python -m services.refresher            # run forever
+                     python -m services.refresher --once     # run every job once and exit
+                     python -m services.refresher --only news loans
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import argparse
+import json
+import os
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from config import SNAPSHOT_DIR, REFRESH_INTERVALS, COMPARISON_CITIES
+from scrapers.city_costs import HOME_CITY, city_source_name, scrape_city
+from scrapers.cmu_tuition import scrape_tuition
+from scrapers.cost_of_living import scrape_pittsburgh_cost_of_living
+from scrapers.loans import scrape_loans_overview
+from scrapers.news import scrape_news
+from utils.snapshots import atomic_write_json, load_snapshot, save_snapshot
+
+METRICS_PATH = os.path.join(SNAPSHOT_DIR, "_runs.json")
+
+# name -> scraper; each scraper returns a DataFrame or raises
+JOBS = {
+    "cost_of_living": scrape_pittsburgh_cost_of_living,
+    "news": scrape_news,
+    "loans": scrape_loans_overview,
+    "tuition": scrape_tuition,
+}
+# Comparison cities refresh on the cost-of-living interval
+JOBS.update({city_source_name(c): partial(scrape_city, c) for c in COMPARISON_CITIES if c != HOME_CITY})
+
+_metrics_lock = threading.Lock()
+
+
+def load_run_metrics() -> dict:
+    """Per-source run metrics written by the refresher ({} if it never ran)."""
+    try:
+        with open(METRICS_PATH) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _record_run(name, started, ok, rows=0, error=None):
+    duration = time.time() - started
+    with _metrics_lock:
+        metrics = load_run_metrics()
+        m = metrics.setdefault(name, {
+            "runs": 0, "failures": 0, "consecutive_failures": 0,
+            "total_duration_sec": 0.0, "last_success_at": None,
+        })
+        m["runs"] += 1
+        m["total_duration_sec"] += duration
+        m["avg_duration_sec"] = m["total_duration_sec"] / m["runs"]
+        m["last_started_at"] = started
+        m["last_duration_sec"] = duration
+        m["last_ok"] = ok
+        if ok:
+            m["consecutive_failures"] = 0
+            m["last_success_at"] = started + duration
+            m["last_rows"] = rows
+            m["last_error"] = None
+        else:
+            m["failures"] += 1
+            m["consecutive_failures"] += 1
+            m["last_error"] = error
+        atomic_write_json(METRICS_PATH, metrics)
+
+
+def run_job(name: str) -> bool:
+    """Run one scraper and store its result as a new snapshot version."""
+    started = time.time()
+    try:
+        df = JOBS[name]()
+        if df is None or df.empty:
+            raise ValueError("scraper returned no rows")
+        save_snapshot(name, df)
+    except Exception as e:
+        traceback.print_exc()
+        _record_run(name, started, ok=False, error=f"{type(e).__name__}: {e}")
+        print(f"[refresher] {name}: failed after {time.time() - started:.1f}s")
+        return False
+    _record_run(name, started, ok=True, rows=len(df))
+    print(f"[refresher] {name}: {len(df)} rows in {time.time() - started:.1f}s")
+    return True
+
+
+def _interval(name: str) -> float:
+    return REFRESH_INTERVALS.get(name, REFRESH_INTERVALS["cost_of_living"])
+
+
+def _initial_due(name: str) -> float:
+    """Resume the schedule from the last stored snapshot instead of re-scraping on restart."""
+    _, saved_at = load_snapshot(name)
+    if saved_at is None:
+        return 0.0
+    return saved_at + _interval(name)
+
+
+def run_forever(names, poll_sec=30.0):
+    """
+    Simple interval scheduler. Each job runs on its own worker so a long
+    tuition crawl never delays the news refresh; a job is never run twice
+    concurrently.
+    """
+    due = {n: _initial_due(n) for n in names}
+    running = {}
+    with ThreadPoolExecutor(max_workers=len(names), thread_name_prefix="brok-refresher") as pool:
+        while True:
+            now = time.time()
+            for name in names:
+                fut = running.get(name)
+                if fut is not None and not fut.done():
+                    continue
+                if now >= due[name]:
+                    running[name] = pool.submit(run_job, name)
+                    due[name] = now + _interval(name)
+            time.sleep(max(1.0, min(poll_sec, min(due.values()) - time.time())))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="brok@CMU background scraper")
+    parser.add_argument("--once", action="store_true", help="run each selected job once and exit")
+    parser.add_argument("--only", nargs="+", choices=sorted(JOBS), help="restrict to these sources")
+    args = parser.parse_args()
+
+    names = args.only or list(JOBS)
+    if args.once:
+        ok = all([run_job(n) for n in names])
+        raise SystemExit(0 if ok else 1)
+    try:
+        run_forever(names)
+    except KeyboardInterrupt:
+        print("[refresher] stopped")
+
+
+if __name__ == "__main__":
+    main()
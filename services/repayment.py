@@ -0,0 +1,252 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        repayment.py
+Purpose:     Vectorized student-loan repayment engine built on NumPy. Computes
+             standard amortization schedules, income-driven repayment and
+             Monte Carlo interest-rate scenarios for many loan/rate/term/income
+             combinations in a single call, fast enough (100k scenarios well
+             under a second) to back interactive sliders. Inputs come from the
+             scraped rates in scrapers/loans.py and the students'
+             `tuition_per_semester`; the Overview page's loan repayment
+             section drives it.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import numpy as np
+import pandas as pd
+
+# 2025 HHS poverty guideline for a single-person household (48 states)
+POVERTY_LINE = 15650.0
+# Fallbacks when no scraped rates are available (2025-26 federal direct loans)
+DEFAULT_FIXED_APR = 6.39
+DEFAULT_VARIABLE_APR = (4.5, 16.0)
+
+
+# ----------------------------
+#  Standard amortization
+# ----------------------------
+
+def monthly_payment(principal, annual_rate_pct, years):
+    """
+    Level monthly payment; every argument may be a scalar or an array
+    (broadcast together). Rates are APR in percent, e.g. 6.39.
+    """
+    p = np.asarray(principal, dtype=float)
+    r = np.asarray(annual_rate_pct, dtype=float) / 1200.0
+    n = np.asarray(years, dtype=float) * 12.0
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pmt = p * r / (1.0 - (1.0 + r) ** -n)
+    return np.where(r == 0, p / n, pmt)
+
+
+def amortization_schedule(principal, annual_rate_pct, years):
+    """
+    Month-by-month remaining balance for each scenario, shape
+    (scenarios, max_months); months after payoff are 0. Uses the closed form
+    B_t = P(1+r)^t - PMT((1+r)^t - 1)/r, so there is no Python loop.
+    """
+    p = np.atleast_1d(np.asarray(principal, dtype=float))
+    r = np.atleast_1d(np.asarray(annual_rate_pct, dtype=float)) / 1200.0
+    n = np.atleast_1d(np.asarray(years, dtype=float)) * 12.0
+    p, r, n = np.broadcast_arrays(p, r, n)
+    pmt = monthly_payment(p, r * 1200.0, n / 12.0)
+
+    t = np.arange(1, int(n.max()) + 1, dtype=float)[None, :]
+    growth = (1.0 + r[:, None]) ** t
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bal = p[:, None] * growth - pmt[:, None] * (growth - 1.0) / r[:, None]
+    bal = np.where(r[:, None] == 0, p[:, None] - pmt[:, None] * t, bal)
+    bal[t > n[:, None]] = 0.0
+    return np.clip(bal, 0.0, None)
+
+
+def standard_plan(principal, annual_rate_pct, years=10):
+    """Columnar summary of level-payment plans for every scenario."""
+    p, r, y = np.broadcast_arrays(*(np.atleast_1d(np.asarray(a, dtype=float))
+                                    for a in (principal, annual_rate_pct, years)))
+    pmt = monthly_payment(p, r, y)
+    total = pmt * y * 12.0
+    return pd.DataFrame({
+        "principal": p, "apr_pct": r, "years": y,
+        "monthly_payment": pmt, "total_paid": total, "total_interest": total - p,
+    })
+
+
+# ----------------------------
+#  Income-driven repayment
+# ----------------------------
+
+def income_driven_plan(principal, annual_rate_pct, income, income_share=0.10,
+                       income_growth=0.03, forgiveness_years=20, poverty_multiple=1.5,
+                       cap_years=10):
+    """
+    Income-driven plan (IBR/PAYE style): pay `income_share` of discretionary
+    income (income above `poverty_multiple` x poverty line), never more than
+    the `cap_years` standard payment, with the balance forgiven after
+    `forgiveness_years`. Loops over the years of the plan; all scenarios
+    advance a full year per array operation.
+    """
+    p, r, inc = np.broadcast_arrays(*(np.atleast_1d(np.asarray(a, dtype=float))
+                                      for a in (principal, annual_rate_pct, income)))
+    rm = r / 1200.0
+    cap = monthly_payment(p, r, cap_years)
+    bal = p.copy()
+    paid = np.zeros_like(p)
+    months_paid = np.zeros_like(p)
+    first_payment = None
+    inc = inc.copy()
+
+    # Growth and annuity factors for k = 1..12 months; constant across years.
+    # Balance after k months at a constant payment: B*g^k - pay*(g^k - 1)/rm
+    gk = (1.0 + rm[:, None]) ** np.arange(1, 13, dtype=float)[None, :]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ak = np.where(rm[:, None] == 0, np.arange(1, 13, dtype=float)[None, :], (gk - 1.0) / rm[:, None])
+    g12, a12 = gk[:, -1], ak[:, -1]
+
+    for _ in range(int(forgiveness_years)):
+        pay = np.minimum(np.maximum(0.0, income_share * (inc - poverty_multiple * POVERTY_LINE) / 12.0), cap)
+        if first_payment is None:
+            first_payment = pay
+        active = bal > 0
+        end = bal * g12 - pay * a12
+        months = np.full_like(bal, 12.0)
+        done = np.flatnonzero(active & (end <= 0))
+        if done.size:
+            # Only loans paid off this year need the month-by-month path
+            path = bal[done, None] * gk[done] - pay[done, None] * ak[done]
+            first = (path <= 0).argmax(axis=1)
+            months[done] = first + 1
+            end[done] = path[np.arange(done.size), first]
+        # A negative end balance is the overpayment in the final month
+        paid += np.where(active, pay * months + np.minimum(end, 0.0), 0.0)
+        months_paid += np.where(active, months, 0.0)
+        bal = np.where(active, np.maximum(end, 0.0), 0.0)
+        inc = inc * (1.0 + income_growth)
+
+    return pd.DataFrame({
+        "principal": p, "apr_pct": r, "starting_income": np.broadcast_to(np.asarray(income, dtype=float), p.shape),
+        "total_paid": paid, "forgiven": bal, "months_in_repayment": months_paid,
+        "first_monthly_payment": first_payment if first_payment is not None else np.zeros_like(p),
+    })
+
+
+# ----------------------------
+#  Scenario grids & Monte Carlo
+# ----------------------------
+
+def scenario_grid(principals, rates_pct, years, incomes=None):
+    """
+    Cartesian product of the inputs as flat arrays, e.g. for a slider grid.
+    Returns a standard-plan frame, plus income-driven columns when `incomes`
+    is given.
+    """
+    axes = [np.asarray(principals, float), np.asarray(rates_pct, float), np.asarray(years, float)]
+    if incomes is not None:
+        axes.append(np.asarray(incomes, float))
+    mesh = [m.ravel() for m in np.meshgrid(*axes, indexing="ij")]
+    out = standard_plan(mesh[0], mesh[1], mesh[2])
+    if incomes is not None:
+        idr = income_driven_plan(mesh[0], mesh[1], mesh[3])
+        out["income"] = mesh[3]
+        out["idr_total_paid"] = idr["total_paid"].to_numpy()
+        out["idr_forgiven"] = idr["forgiven"].to_numpy()
+        out["idr_first_payment"] = idr["first_monthly_payment"].to_numpy()
+    return out
+
+
+def simulate_variable_rate(principal, start_rate_pct, years=10, n_paths=100_000,
+                           annual_vol_pct=1.0, floor_pct=None, cap_pct=None, seed=None):
+    """
+    Monte Carlo for variable-rate loans: the APR follows a yearly random walk
+    (normal steps of `annual_vol_pct`), clipped to [floor, cap], and the
+    payment is re-amortized over the remaining term each year. The first
+    year always uses `start_rate_pct`: a start below the floor (or above
+    the cap) widens the bounds to include it instead of being clipped.
+    Returns the total paid per path as a NumPy array of length `n_paths`.
+    """
+    rng = np.random.default_rng(seed)
+    floor_pct = DEFAULT_VARIABLE_APR[0] if floor_pct is None else floor_pct
+    cap_pct = DEFAULT_VARIABLE_APR[1] + 9.0 if cap_pct is None else cap_pct
+
+    steps = rng.normal(0.0, annual_vol_pct, size=(n_paths, int(years)))
+    steps[:, 0] = 0.0
+    rates = np.clip(start_rate_pct + np.cumsum(steps, axis=1),
+                    min(floor_pct, start_rate_pct), max(cap_pct, start_rate_pct))
+
+    bal = np.full(n_paths, float(principal))
+    total = np.zeros(n_paths)
+    for y in range(int(years)):
+        r = rates[:, y]
+        pmt = monthly_payment(bal, r, years - y)
+        rm = r / 1200.0
+        g = (1.0 + rm) ** 12
+        bal = np.maximum(bal * g - pmt * np.where(rm == 0, 12.0, (g - 1.0) / np.where(rm == 0, 1.0, rm)), 0.0)
+        total += pmt * 12.0
+    return total
+
+
+def summarize_paths(total_paid, principal):
+    """Percentile summary of Monte Carlo outcomes."""
+    q = np.percentile(total_paid, [5, 25, 50, 75, 95])
+    return {
+        "mean_total_paid": float(total_paid.mean()),
+        "p5": q[0], "p25": q[1], "p50": q[2], "p75": q[3], "p95": q[4],
+        "mean_interest": float(total_paid.mean() - principal),
+    }
+
+
+# ----------------------------
+#  Inputs from scrapers / student records
+# ----------------------------
+
+def rates_from_loans_overview(loans_df: pd.DataFrame) -> dict:
+    """
+    Representative APRs from `scrapers.loans.fetch_loans_overview()`:
+    {'federal_fixed': x, 'private_fixed': (lo, hi), 'private_variable': (lo, hi)}
+    with documented defaults for anything the scrape didn't find.
+    """
+    out = {
+        "federal_fixed": DEFAULT_FIXED_APR,
+        "private_fixed": (DEFAULT_FIXED_APR, DEFAULT_VARIABLE_APR[1]),
+        "private_variable": DEFAULT_VARIABLE_APR,
+    }
+    if loans_df is None or loans_df.empty or "kind" not in loans_df.columns:
+        return out
+    ok = loans_df[loans_df["ok"].astype(bool)] if "ok" in loans_df.columns else loans_df
+    fed = ok[ok["kind"] == "federal"]["fixed_apr_min"].dropna()
+    if not fed.empty:
+        out["federal_fixed"] = float(fed.min())
+    priv = ok[ok["kind"] == "private"]
+    for kind in ("fixed", "variable"):
+        lo, hi = priv[f"{kind}_apr_min"].dropna(), priv[f"{kind}_apr_max"].dropna()
+        if not lo.empty and not hi.empty:
+            out[f"private_{kind}"] = (float(lo.min()), float(hi.max()))
+    return out
+
+
+def principal_from_student(student: dict) -> float:
+    """
+    Balance entering repayment if the whole program is financed: net tuition
+    per semester (after scholarship) times every semester of the program,
+    two per year from `enrollment_year` to `expected_grad_year` (at least
+    one year). Semesters already paid for count too; this is the debt at
+    graduation, not what is left to borrow from today.
+    """
+    prog = student.get("program", {}) or {}
+    fin = student.get("financials", {}) or {}
+    tuition = float(fin.get("tuition_per_semester") or 0)
+    schol = float((fin.get("scholarship") or {}).get("amount", 0) or 0)
+    years = max(1, int(prog.get("expected_grad_year") or 0) - int(prog.get("enrollment_year") or 0))
+    return max(0.0, tuition - schol) * 2 * years
+
+
+def principals_from_students(students) -> np.ndarray:
+    return np.array([principal_from_student(s) for s in students], dtype=float)
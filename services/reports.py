@@ -0,0 +1,453 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        reports.py
+Purpose:     Batch term-start advising reports, one HTML page per student
+             plus an index: financial summary and cash-flow outlook, tuition
+             match, cost-of-living and budget-plan charts, and Gemini advice
+             from `generate_budget_advice`. Cohort-wide numbers (budget plans,
+             cash-flow projections) are computed once, vectorized; charts and
+             templating run in a process pool; Gemini calls run on a bounded
+             thread pool at the same time. Every section is cached on disk
+             by a hash of its inputs, so a rerun only re-renders (and only
+             re-asks Gemini for) what changed. Pages carry print styles, so
+             "Save as PDF" from a browser gives one report per page.
+
+             Usage:  python -m services.reports                   # whole cohort
+                     python -m services.reports --limit 20 --no-advice
+                     python -m services.reports --students big.json --expenses big_exp.json
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import argparse
+import hashlib
+import html
+import json
+import multiprocessing as mp
+import os
+import re
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+
+from config import (
+    STUDENTS_PATH, EXPENSES_PATH, REPORTS_DIR, REPORT_WORKERS, REPORT_LLM_CONCURRENCY,
+)
+from utils.lazy import lazy_import
+
+# Workers only need these to draw charts; the parent imports the data layer in build_jobs()
+go = lazy_import("plotly.graph_objects")
+pio = lazy_import("plotly.io")
+
+# Bump a section's version when its template changes so cached copies are re-rendered
+SECTION_VERSIONS = {"summary": 1, "tuition": 1, "costs": 1, "plan": 1, "advice": 1}
+RENDERED_SECTIONS = ("summary", "tuition", "costs", "plan")
+ADVICE_OBJECTIVE = "Term-start plan: cover this semester's bills and stay within a monthly budget."
+TUITION_ROWS = 8
+_FAILED_ADVICE = ("⚠️", "Error generating advice")
+
+PAGE_CSS = """
+body { font-family: -apple-system, "Segoe UI", Roboto, sans-serif; color: #222; max-width: 960px; margin: 2em auto; }
+h1 { color: #A40000; margin-bottom: 0; } h2 { border-bottom: 2px solid #A40000; padding-bottom: 4px; }
+.meta { color: #666; margin-top: 4px; } .cards { display: flex; gap: 12px; flex-wrap: wrap; }
+.card { border: 1px solid #ddd; border-radius: 6px; padding: 8px 14px; min-width: 150px; }
+.card b { display: block; font-size: 1.3em; } table { border-collapse: collapse; width: 100%; font-size: 0.9em; }
+th, td { border-bottom: 1px solid #eee; padding: 4px 8px; text-align: left; } td.num { text-align: right; }
+.warn { color: #A40000; } .note { color: #666; font-style: italic; }
+section { break-inside: avoid; page-break-inside: avoid; margin-bottom: 1.5em; }
+@media print { body { margin: 0; max-width: none; } a { color: inherit; text-decoration: none; } }
+"""
+
+
+def _money(x):
+    try:
+        return f"${float(x):,.0f}"
+    except (TypeError, ValueError):
+        return "—"
+
+
+def _esc(x):
+    return html.escape("—" if x is None or x == "" else str(x))
+
+
+def _table(rows, columns, money=()):
+    head = "".join(f"<th>{_esc(c)}</th>" for c in columns)
+    body = "".join(
+        "<tr>" + "".join(f"<td class='num'>{_money(r.get(c))}</td>" if c in money else f"<td>{_esc(r.get(c))}</td>"
+                         for c in columns) + "</tr>"
+        for r in rows)
+    return f"<table><tr>{head}</tr>{body}</table>"
+
+
+# ------------------------------------
+#  Section renderers (run in worker processes; inputs are plain JSON data)
+# ------------------------------------
+
+def _chart(fig):
+    fig.update_layout(height=340, margin=dict(l=40, r=20, t=50, b=40), template="plotly_white")
+    return pio.to_html(fig, full_html=False, include_plotlyjs=False, config={"displayModeBar": False})
+
+
+def render_summary(d):
+    cards = [("Tuition / semester", _money(d["tuition"])),
+             ("Scholarship", f"{_money(d['scholarship'])} {d['scholarship_type'] or ''}".strip()),
+             ("Assistantship", d["assistantship"] if isinstance(d["assistantship"], str) else _money(d["assistantship"])),
+             ("Lowest balance", f"{_money(d['lowest_balance'])} ({_esc(d['lowest_month'])})"),
+             ("At graduation", _money(d["final_balance"]))]
+    out = ["<div class='cards'>"] + [f"<div class='card'>{_esc(k)}<b>{_esc(v)}</b></div>" for k, v in cards] + ["</div>"]
+    if d["first_negative_month"]:
+        out.append(f"<p class='warn'>Projected balance first goes negative in {_esc(d['first_negative_month'])}.</p>")
+    if d["invoices"]:
+        out.append("<h3>Invoices</h3>" + _table(d["invoices"], ["invoice_id", "semester", "due", "paid", "balance"],
+                                                money=("due", "paid", "balance")))
+    return "".join(out)
+
+
+def render_tuition(d):
+    if not d["rows"]:
+        return "<p class='note'>No matching tuition rows were found for this program.</p>"
+    return (f"<p>Matched on <b>{_esc(d['matched'])}</b>; first {len(d['rows'])} rows.</p>"
+            + _table(d["rows"], ["school", "program", "item", "unit", "amount", "academic_year"], money=("amount",)))
+
+
+def render_costs(d):
+    if not d["you"]:
+        return "<p class='note'>No expense audit on file for this student.</p>"
+    cats = list(d["you"])
+    fig = go.Figure([go.Bar(name="You", x=cats, y=[d["you"][c] for c in cats]),
+                     go.Bar(name="Pittsburgh avg", x=cats, y=[d["city"].get(c, 0) for c in cats])])
+    fig.update_layout(barmode="group", title="Monthly Cost Comparison", yaxis_title="USD")
+    note = "" if d["city_available"] else "<p class='note'>Pittsburgh averages were unavailable for this run.</p>"
+    return _chart(fig) + note
+
+
+def render_plan(d):
+    cats = d["categories"]
+    fig = go.Figure([go.Bar(name="Current", x=cats, y=d["current"]), go.Bar(name="Plan", x=cats, y=d["plan"])])
+    fig.update_layout(barmode="group", title=f"Suggested Monthly Plan (income {_money(d['income'])})", yaxis_title="USD")
+    rows = [{"Category": c, "Current": cur, "Plan": p} for c, cur, p in zip(cats, d["current"], d["plan"])]
+    out = _chart(fig) + _table(rows + [{"Category": "Savings", "Current": None, "Plan": d["savings"]}],
+                               ["Category", "Current", "Plan"], money=("Current", "Plan"))
+    if not d["feasible"]:
+        out += f"<p class='warn'>Income can't cover Pittsburgh minimums plus savings; short by {_money(d['shortfall'])}/month.</p>"
+    return out
+
+
+def render_advice(text):
+    lines = [ln.strip() for ln in (text or "").splitlines() if ln.strip()]
+    items, out = [], []
+    for ln in lines:
+        if ln[:2] in ("- ", "* ", "• "):
+            items.append(f"<li>{_esc(ln[2:])}</li>")
+            continue
+        if items:
+            out.append("<ul>" + "".join(items) + "</ul>")
+            items = []
+        out.append(f"<p>{_esc(ln)}</p>")
+    if items:
+        out.append("<ul>" + "".join(items) + "</ul>")
+    return "".join(out) or "<p class='note'>No advice generated.</p>"
+
+
+RENDERERS = {"summary": render_summary, "tuition": render_tuition, "costs": render_costs, "plan": render_plan}
+
+
+def render_job(job):
+    """Worker entry point: (student_id, {section: inputs}) -> (student_id, {section: html})."""
+    sid, sections = job
+    return sid, {name: RENDERERS[name](inputs) for name, inputs in sections.items()}
+
+
+# ------------------------------------
+#  Section cache
+# ------------------------------------
+
+def section_key(name, inputs) -> str:
+    blob = json.dumps([name, SECTION_VERSIONS[name], inputs], sort_keys=True, default=str)
+    return hashlib.sha256(blob.encode()).hexdigest()
+
+
+class SectionCache:
+    """Rendered HTML fragments on disk, keyed by a hash of the section's inputs."""
+
+    def __init__(self, root):
+        self.root = root
+        self.used = set()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], key + ".html")
+
+    def get(self, key):
+        self.used.add(key)
+        try:
+            with open(self._path(key), encoding="utf-8") as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+    def put(self, key, fragment):
+        self.used.add(key)
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(fragment)
+        os.replace(tmp, path)
+
+    def prune(self) -> int:
+        """Delete fragments this run didn't use; only call after a full-cohort run."""
+        removed = 0
+        for dirpath, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(".html") and name[:-5] not in self.used:
+                    os.remove(os.path.join(dirpath, name))
+                    removed += 1
+        return removed
+
+
+# ------------------------------------
+#  Cohort inputs (parent process)
+# ------------------------------------
+
+def _r(x, nd=2):
+    return None if x is None else round(float(x), nd)
+
+
+def build_jobs(roster, limit=None):
+    """Per-student section inputs (plain JSON data) plus the Gemini advice context."""
+    import pandas as pd
+    from scrapers.cost_of_living import load_cost_of_living, summarize_student_expenses
+    from services.budget_engine import SPENDING_CATEGORIES, cohort_arrays, optimize_allocations, minimums_from_city
+    from services.cashflow import project_cohort
+    from services.gemini_client import advisor_profile
+    from utils.tuition import get_tuition_for_student, load_tuition
+
+    rows = range(min(len(roster), limit or len(roster)))
+    students = [roster.student(i) for i in rows]
+    expenses = [roster.expense_for(i) for i in rows]
+    present = [e for e in expenses if e is not None]
+
+    cost_model = load_cost_of_living()
+    city = dict(cost_model.category_avg)
+    a = cohort_arrays(students, present)
+    plans = optimize_allocations(a["tuition"], a["scholarship"], a["stipend"], a["actual"],
+                                 minimums_from_city(city, monthly=dict(cost_model.monthly)))
+    _, _, projection = project_cohort(students, present)
+    tuition = load_tuition()
+
+    # Students in the same program share one tuition match
+    matches = {}
+    jobs = []
+    for i, (s, e) in enumerate(zip(students, expenses)):
+        prog, fin = s.get("program", {}) or {}, s.get("financials", {}) or {}
+        key = (prog.get("school"), prog.get("department"), prog.get("level"), tuple(prog.get("courses") or ()))
+        if key not in matches:
+            df, matched = get_tuition_for_student(tuition, s)
+            cols = ["school", "program", "item", "unit", "amount", "academic_year"]
+            head = df.head(TUITION_ROWS).reindex(columns=cols).astype(object)
+            matches[key] = {"matched": matched, "rows": head.where(pd.notna(head), None).to_dict(orient="records")}
+        proj, plan = projection.iloc[i], plans.iloc[i]
+        schol, assist = fin.get("scholarship"), fin.get("assistantship")
+        you = summarize_student_expenses(e)
+        summary = {
+            "tuition": fin.get("tuition_per_semester"),
+            "scholarship": (schol or {}).get("amount") if isinstance(schol, dict) else None,
+            "scholarship_type": (schol or {}).get("type") if isinstance(schol, dict) else None,
+            "assistantship": assist.get("stipend") if isinstance(assist, dict) else assist,
+            "invoices": list(fin.get("invoices") or []),
+            "lowest_balance": _r(proj["lowest_balance"]), "lowest_month": str(proj["lowest_month"]),
+            "first_negative_month": None if proj["first_negative_month"] is None else str(proj["first_negative_month"]),
+            "final_balance": _r(proj["final_balance"]),
+        }
+        costs = {
+            "you": {} if not you else {"Food": _r(you["Off-Campus"] + you["On-Campus"]), "Utilities": _r(you["Utilities"]),
+                                       "Transportation": _r(you["Transportation"]), "Fun": _r(you["Fun"])},
+            "city": {"Food": _r(city.get("Food", 0)), "Utilities": _r(city.get("Utilities", 0)),
+                     "Transportation": _r(city.get("Transport", 0)), "Fun": _r(city.get("Fun", 0))},
+            "city_available": bool(city),
+        }
+        plan_in = {
+            "categories": SPENDING_CATEGORIES,
+            "current": [_r(x) for x in a["actual"][i]] if e is not None else [None] * len(SPENDING_CATEGORIES),
+            "plan": [_r(plan[f"plan_{c.lower()}"]) for c in SPENDING_CATEGORIES],
+            "savings": _r(plan["plan_savings"]), "income": _r(plan["income"]),
+            "feasible": bool(plan["feasible"]), "shortfall": _r(plan["shortfall"]),
+        }
+        advice_context = {"plan": {c: v for c, v in zip(SPENDING_CATEGORIES, plan_in["plan"])},
+                          "savings": plan_in["savings"], "income": plan_in["income"],
+                          "lowest_balance": summary["lowest_balance"], "pittsburgh_avg": costs["city"],
+                          "tuition_match": matches[key]["matched"]}
+        jobs.append({
+            "student_id": s.get("student_id"), "name": s.get("name"),
+            "program": f"{prog.get('level', '')} · {prog.get('department', '')} · {prog.get('school', '')}",
+            "sections": {"summary": summary, "tuition": matches[key], "costs": costs, "plan": plan_in},
+            "advice": {"student": advisor_profile(s), "objective": ADVICE_OBJECTIVE,
+                       "context": advice_context},
+            "feasible": plan_in["feasible"], "lowest_balance": summary["lowest_balance"],
+        })
+    return jobs
+
+
+# ------------------------------------
+#  Assembly
+# ------------------------------------
+
+SECTION_TITLES = {"summary": "💰 Financial Summary", "tuition": "📊 Tuition Match",
+                  "costs": "🏙️ Cost of Living", "plan": "🎯 Suggested Monthly Plan", "advice": "💬 Advisor Notes"}
+
+
+def _slug(student_id):
+    return re.sub(r"[^\w.-]", "_", str(student_id))
+
+
+def assemble(job, fragments, generated):
+    body = "".join(f"<section><h2>{SECTION_TITLES[name]}</h2>{fragments[name]}</section>"
+                   for name in (*RENDERED_SECTIONS, "advice") if name in fragments)
+    return (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{_esc(job['name'])} — brok@CMU</title>"
+            f"<script src='../plotly.min.js'></script><style>{PAGE_CSS}</style></head><body>"
+            f"<h1>{_esc(job['name'])}</h1><p class='meta'>{_esc(job['student_id'])} · {_esc(job['program'])}"
+            f" · generated {generated}</p>{body}</body></html>")
+
+
+def write_index(out_dir, jobs, generated):
+    rows = "".join(
+        f"<tr><td><a href='students/{_slug(j['student_id'])}.html'>{_esc(j['name'])}</a></td>"
+        f"<td>{_esc(j['student_id'])}</td><td>{_esc(j['program'])}</td>"
+        f"<td class='num'>{_money(j['lowest_balance'])}</td><td>{'' if j['feasible'] else '⚠️'}</td></tr>"
+        for j in jobs)
+    page = (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>Advising reports</title>"
+            f"<style>{PAGE_CSS}</style></head><body><h1>Term-start Advising Reports</h1>"
+            f"<p class='meta'>{len(jobs)} students · generated {generated}</p><table><tr><th>Student</th><th>ID</th>"
+            f"<th>Program</th><th>Lowest balance</th><th>Plan short</th></tr>{rows}</table></body></html>")
+    with open(os.path.join(out_dir, "index.html"), "w", encoding="utf-8") as f:
+        f.write(page)
+
+
+def _advice_failed(text):
+    return not text or text.startswith(_FAILED_ADVICE)
+
+
+def generate_reports(out_dir=REPORTS_DIR, students_path=STUDENTS_PATH, expenses_path=EXPENSES_PATH,
+                     limit=None, workers=REPORT_WORKERS, llm_concurrency=REPORT_LLM_CONCURRENCY,
+                     advice=True, prune=None, log=print) -> dict:
+    from services.gemini_client import generate_budget_advice
+    from utils.roster import load_roster
+
+    t0 = time.perf_counter()
+    stats = {"students": 0, "rendered": 0, "cached": 0, "llm_calls": 0, "llm_cached": 0, "llm_failed": 0}
+    jobs = build_jobs(load_roster(students_path, expenses_path), limit)
+    stats["students"] = len(jobs)
+    t_prepare = time.perf_counter() - t0
+    cache = SectionCache(os.path.join(out_dir, ".section_cache"))
+    fragments = {j["student_id"]: {} for j in jobs}
+
+    # Advice first: it is the slowest part and runs alongside the chart workers
+    llm = ThreadPoolExecutor(max_workers=max(llm_concurrency, 1), thread_name_prefix="brok-report-llm")
+    pending = {}
+    for j in jobs if advice else ():
+        key = section_key("advice", j["advice"])
+        cached = cache.get(key)
+        if cached is not None:
+            fragments[j["student_id"]]["advice"] = cached
+            stats["llm_cached"] += 1
+        else:
+            a = j["advice"]
+            pending[llm.submit(generate_budget_advice, a["student"], a["objective"], a["context"])] = (j, key)
+
+    todo, keys = [], {}
+    for j in jobs:
+        sid, missing = j["student_id"], {}
+        for name in RENDERED_SECTIONS:
+            key = keys.setdefault(sid, {})[name] = section_key(name, j["sections"][name])
+            cached = cache.get(key)
+            if cached is None:
+                missing[name] = j["sections"][name]
+            else:
+                fragments[sid][name] = cached
+                stats["cached"] += 1
+        if missing:
+            todo.append((sid, missing))
+
+    t1 = time.perf_counter()
+    if todo:
+        n_workers = workers or os.cpu_count() or 2
+        # Spawned workers start clean, unaffected by this process's LLM threads
+        with ProcessPoolExecutor(max_workers=min(n_workers, len(todo)), mp_context=mp.get_context("spawn")) as pool:
+            for sid, rendered in pool.map(render_job, todo, chunksize=max(1, len(todo) // (n_workers * 4))):
+                for name, frag in rendered.items():
+                    cache.put(keys[sid][name], frag)
+                    fragments[sid][name] = frag
+                    stats["rendered"] += 1
+    t_render = time.perf_counter() - t1
+
+    for done, fut in enumerate(as_completed(pending), 1):
+        j, key = pending[fut]
+        text = fut.result()
+        frag = render_advice(text)
+        stats["llm_calls"] += 1
+        # Failures are shown in this run's report but never cached, so the next run retries them
+        if _advice_failed(text):
+            stats["llm_failed"] += 1
+        else:
+            cache.put(key, frag)
+        fragments[j["student_id"]]["advice"] = frag
+        if done % 100 == 0:
+            log(f"[reports] advice {done}/{len(pending)}")
+    llm.shutdown()
+    t_advice = time.perf_counter() - t1
+
+    generated = time.strftime("%Y-%m-%d %H:%M")
+    student_dir = os.path.join(out_dir, "students")
+    os.makedirs(student_dir, exist_ok=True)
+    js_path = os.path.join(out_dir, "plotly.min.js")
+    if not os.path.exists(js_path):
+        from plotly.offline import get_plotlyjs
+        with open(js_path, "w", encoding="utf-8") as f:
+            f.write(get_plotlyjs())
+    for j in jobs:
+        with open(os.path.join(student_dir, _slug(j["student_id"]) + ".html"), "w", encoding="utf-8") as f:
+            f.write(assemble(j, fragments[j["student_id"]], generated))
+    write_index(out_dir, jobs, generated)
+    if prune if prune is not None else (limit is None and advice):
+        stats["pruned"] = cache.prune()
+    stats.update(prepare_sec=t_prepare, render_sec=t_render, advice_sec=t_advice, total_sec=time.perf_counter() - t0)
+    return stats
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Render term-start advising reports for the whole cohort.")
+    ap.add_argument("--out", default=REPORTS_DIR, help="output directory (index.html, students/, section cache)")
+    ap.add_argument("--students", default=STUDENTS_PATH)
+    ap.add_argument("--expenses", default=EXPENSES_PATH)
+    ap.add_argument("--limit", type=int, help="only the first N students")
+    ap.add_argument("--workers", type=int, default=REPORT_WORKERS, help="chart/templating processes (0 = per CPU)")
+    ap.add_argument("--llm-concurrency", type=int, default=REPORT_LLM_CONCURRENCY, help="concurrent Gemini calls")
+    ap.add_argument("--no-advice", action="store_true", help="skip the Gemini advice section")
+    ap.add_argument("--clear-cache", action="store_true", help="re-render every section")
+    args = ap.parse_args(argv)
+
+    if args.clear_cache:
+        shutil.rmtree(os.path.join(args.out, ".section_cache"), ignore_errors=True)
+    stats = generate_reports(args.out, args.students, args.expenses, args.limit, args.workers,
+                             args.llm_concurrency, advice=not args.no_advice)
+    print(f"[reports] {stats['students']} reports in {stats['total_sec']:.1f}s -> {os.path.join(args.out, 'index.html')}")
+    print(f"[reports] sections: {stats['rendered']} rendered, {stats['cached']} cached "
+          f"(prepare {stats['prepare_sec']:.1f}s, render {stats['render_sec']:.1f}s)")
+    if not args.no_advice:
+        print(f"[reports] advice: {stats['llm_calls']} Gemini calls ({stats['llm_failed']} failed), "
+              f"{stats['llm_cached']} cached, done after {stats['advice_sec']:.1f}s")
+    if "pruned" in stats:
+        print(f"[reports] pruned {stats['pruned']} unused cached sections")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,42 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        test_startup_imports.py
+Purpose:     Regression test for app.py's cold-start import budget. Profiles
+             the entry point's module-level imports in fresh interpreters
+             (benchmarks.startup_imports) and fails when the best of three
+             runs exceeds STARTUP_IMPORT_BUDGET_SEC.
+
+             Headroom is thin: pandas (~0.5s) and streamlit (~0.35s) are
+             ~90% of a ~1.1s cold start, and the app's own modules add
+             ~20ms, so a new eager heavyweight import (bs4, plotly.express,
+             the Gemini SDK) is enough to fail this test.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+from benchmarks.startup_imports import entry_imports, profile
+from config import STARTUP_IMPORT_BUDGET_SEC
+
+
+def test_cold_start_within_budget():
+    modules = entry_imports()
+    result = profile(modules, runs=3)
+    assert result["total_s"] <= STARTUP_IMPORT_BUDGET_SEC, (
+        f"cold-start imports took {result['total_s']:.3f}s "
+        f"(runs {result['runs_s']}), budget {STARTUP_IMPORT_BUDGET_SEC:.3f}s"
+    )
+
+
+def test_lazy_modules_not_imported_at_startup():
+    from benchmarks.startup_imports import profile_once
+    loaded = set(profile_once(entry_imports())["module"])
+    # plotly itself is not checked: streamlit imports its (lazy) package stub
+    for heavy in ("bs4", "google.generativeai"):
+        assert heavy not in loaded, f"{heavy} is imported at cold start"
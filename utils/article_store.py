@@ -0,0 +1,364 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        article_store.py
+Purpose:     Persistent, append-only SQLite store for news articles. Articles
+             are deduplicated by GUID (or link), keep their publication
+             timestamps, and can be read newest-first well beyond the latest
+             feed window. Also remembers the feed's ETag / Last-Modified
+             headers so ingestion can send conditional requests, and holds
+             the per-segment relevance scores computed at ingest time, plus
+             their sums per student segment set, kept up to date as articles
+             arrive. Feeds page through it with keyset cursors rather than
+             offsets, so every page is an index range scan.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+from config import NEWS_DB_PATH
+
+ARTICLE_COLUMNS = ["guid", "title", "link", "pubDate", "source", "summary", "published_ts", "ingested_ts"]
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS articles (
+        guid         TEXT PRIMARY KEY,
+        title        TEXT NOT NULL,
+        link         TEXT NOT NULL,
+        pub_date     TEXT,
+        source       TEXT,
+        summary      TEXT,
+        published_ts REAL,
+        ingested_ts  REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_articles_published ON articles (published_ts DESC, guid)",
+    "CREATE INDEX IF NOT EXISTS idx_articles_ingested ON articles (ingested_ts)",
+    """
+    CREATE TABLE IF NOT EXISTS article_scores (
+        segment      TEXT NOT NULL,
+        guid         TEXT NOT NULL,
+        score        REAL NOT NULL,
+        published_ts REAL,
+        PRIMARY KEY (segment, guid)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_scores_segment ON article_scores (segment, score DESC, published_ts DESC)",
+    "CREATE INDEX IF NOT EXISTS idx_scores_guid ON article_scores (guid)",
+    # Summed scores per segment set (one per distinct student profile), built
+    # on first use and updated incrementally by save_scores
+    """
+    CREATE TABLE IF NOT EXISTS segment_sets (
+        set_id   TEXT PRIMARY KEY,
+        segments TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS set_scores (
+        set_id       TEXT NOT NULL,
+        guid         TEXT NOT NULL,
+        score        REAL NOT NULL,
+        published_ts REAL,
+        PRIMARY KEY (set_id, guid)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_set_scores_rank ON set_scores (set_id, score DESC, published_ts DESC, guid)",
+    """
+    CREATE TABLE IF NOT EXISTS feed_state (
+        feed_url      TEXT PRIMARY KEY,
+        etag          TEXT,
+        last_modified TEXT,
+        checked_ts    REAL
+    )
+    """,
+]
+
+
+_ready_paths = set()
+_ready_lock = threading.Lock()
+
+
+def connect(path=NEWS_DB_PATH):
+    with _ready_lock:
+        fresh = path not in _ready_paths or not os.path.exists(path)
+        if fresh and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=10)
+        if fresh:
+            # WAL is stored in the file; the schema only needs creating once per process
+            conn.execute("PRAGMA journal_mode=WAL")
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+            _ready_paths.add(path)
+    return conn
+
+
+def append_articles(rows, path=NEWS_DB_PATH) -> int:
+    """
+    Insert new articles; rows whose GUID is already stored are skipped.
+    Each row is a dict with the ARTICLE_COLUMNS keys (ingested_ts optional).
+    Returns the number of articles actually added.
+    """
+    now = time.time()
+    conn = connect(path)
+    try:
+        with conn:
+            before = conn.total_changes
+            conn.executemany(
+                "INSERT OR IGNORE INTO articles VALUES (?,?,?,?,?,?,?,?)",
+                [(r["guid"], r["title"], r["link"], r.get("pubDate", ""), r.get("source", ""),
+                  r.get("summary", ""), r.get("published_ts"), r.get("ingested_ts") or now)
+                 for r in rows],
+            )
+            return conn.total_changes - before
+    finally:
+        conn.close()
+
+
+def known_guids(guids, path=NEWS_DB_PATH) -> set:
+    """Subset of `guids` that is already stored."""
+    guids = list(guids)
+    if not guids:
+        return set()
+    conn = connect(path)
+    try:
+        found = set()
+        for i in range(0, len(guids), 500):
+            chunk = guids[i:i + 500]
+            marks = ",".join("?" * len(chunk))
+            found.update(g for (g,) in conn.execute(f"SELECT guid FROM articles WHERE guid IN ({marks})", chunk))
+        return found
+    finally:
+        conn.close()
+
+
+def load_articles(limit=30, offset=0, path=NEWS_DB_PATH) -> pd.DataFrame:
+    """Newest-first page of stored articles."""
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=ARTICLE_COLUMNS)
+    conn = connect(path)
+    try:
+        return pd.read_sql_query(
+            "SELECT guid, title, link, pub_date AS pubDate, source, summary, published_ts, ingested_ts "
+            "FROM articles ORDER BY published_ts DESC, guid LIMIT ? OFFSET ?",
+            conn, params=(int(limit), int(offset)),
+        )
+    finally:
+        conn.close()
+
+
+def count_articles(path=NEWS_DB_PATH) -> int:
+    if not os.path.exists(path):
+        return 0
+    conn = connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def store_version(path=NEWS_DB_PATH) -> tuple:
+    """(article count, latest ingested_ts); changes whenever articles are added."""
+    if not os.path.exists(path):
+        return 0, None
+    conn = connect(path)
+    try:
+        return tuple(conn.execute("SELECT COUNT(*), MAX(ingested_ts) FROM articles").fetchone())
+    finally:
+        conn.close()
+
+
+def _set_id(segments) -> str:
+    return hashlib.sha1(json.dumps(sorted(set(segments))).encode("utf-8")).hexdigest()
+
+
+def _sum_into_set(conn, set_id, segments, guids=None):
+    """(Re)compute a set's summed scores, for every article or just `guids`."""
+    marks = ",".join("?" * len(segments))
+    where, params = "", ()
+    if guids is not None:
+        where = f"AND guid IN ({','.join('?' * len(guids))}) "
+        params = tuple(guids)
+    conn.execute(
+        "INSERT OR REPLACE INTO set_scores "
+        f"SELECT ?, guid, SUM(score), MAX(published_ts) FROM article_scores WHERE segment IN ({marks}) "
+        f"{where}GROUP BY guid",
+        (set_id, *segments, *params),
+    )
+
+
+def _ensure_set(conn, segments) -> str:
+    """Materialize the summed scores of a segment set once; later ingests keep them current."""
+    segments = sorted(set(segments))
+    set_id = _set_id(segments)
+    if conn.execute("SELECT 1 FROM segment_sets WHERE set_id = ?", (set_id,)).fetchone() is None:
+        with conn:
+            conn.execute("INSERT OR IGNORE INTO segment_sets VALUES (?, ?)", (set_id, json.dumps(segments)))
+            _sum_into_set(conn, set_id, segments)
+    return set_id
+
+
+def save_scores(score_rows, replace_all=False, path=NEWS_DB_PATH):
+    """
+    Store (segment, guid, score, published_ts) tuples. With `replace_all`,
+    existing scores are dropped first (full re-rank, e.g. after the student
+    roster changes) along with every segment set's sums, which are rebuilt
+    on next use; otherwise the sums are updated for just the scored articles.
+    """
+    score_rows = list(score_rows)
+    conn = connect(path)
+    try:
+        with conn:
+            if replace_all:
+                conn.execute("DELETE FROM article_scores")
+                conn.execute("DELETE FROM set_scores")
+                conn.execute("DELETE FROM segment_sets")
+            conn.executemany("INSERT OR REPLACE INTO article_scores VALUES (?,?,?,?)", score_rows)
+            guids = sorted({r[1] for r in score_rows})
+            for set_id, segments in conn.execute("SELECT set_id, segments FROM segment_sets").fetchall():
+                for i in range(0, len(guids), 500):
+                    _sum_into_set(conn, set_id, json.loads(segments), guids[i:i + 500])
+    finally:
+        conn.close()
+
+
+def ranked_articles(segments, limit=12, offset=0, path=NEWS_DB_PATH) -> pd.DataFrame:
+    """
+    Articles ranked by their summed precomputed scores across `segments`,
+    newest first among ties. Served from the (segment, score) index.
+    """
+    segments = list(segments)
+    if not segments or not os.path.exists(path):
+        return pd.DataFrame(columns=ARTICLE_COLUMNS + ["score"])
+    marks = ",".join("?" * len(segments))
+    conn = connect(path)
+    try:
+        return pd.read_sql_query(
+            "SELECT a.guid, a.title, a.link, a.pub_date AS pubDate, a.source, a.summary, "
+            "       a.published_ts, a.ingested_ts, s.score "
+            f"FROM (SELECT guid, SUM(score) AS score FROM article_scores WHERE segment IN ({marks}) "
+            "      GROUP BY guid) s "
+            "JOIN articles a ON a.guid = s.guid "
+            "ORDER BY s.score DESC, a.published_ts DESC, a.guid LIMIT ? OFFSET ?",
+            conn, params=(*segments, int(limit), int(offset)),
+        )
+    finally:
+        conn.close()
+
+
+def articles_page(cursor=None, limit=12, path=NEWS_DB_PATH):
+    """
+    Keyset-paginated newest-first articles. `cursor` is the
+    (published_ts, guid) of the last row already shown, or None for the first
+    page. Returns (page_df, next_cursor); next_cursor is None at the end.
+    Each page is an index range scan, so its cost does not grow with the
+    archive (unlike LIMIT/OFFSET).
+    """
+    if not os.path.exists(path):
+        return pd.DataFrame(columns=ARTICLE_COLUMNS), None
+    where, params = "", ()
+    if cursor is not None:
+        where = "WHERE published_ts < ? OR (published_ts = ? AND guid > ?) "
+        params = (cursor[0], cursor[0], cursor[1])
+    conn = connect(path)
+    try:
+        df = pd.read_sql_query(
+            "SELECT guid, title, link, pub_date AS pubDate, source, summary, published_ts, ingested_ts "
+            f"FROM articles {where}ORDER BY published_ts DESC, guid LIMIT ?",
+            conn, params=(*params, int(limit) + 1),
+        )
+    finally:
+        conn.close()
+    return _split_page(df, limit, ["published_ts", "guid"])
+
+
+def ranked_page(segments, cursor=None, limit=12, path=NEWS_DB_PATH):
+    """
+    Keyset-paginated version of `ranked_articles`. `cursor` is the
+    (score, published_ts, guid) of the last row already shown.
+    Returns (page_df, next_cursor). Pages come from the segment set's
+    materialized sums, so each is a range scan of `limit` rows however large
+    the archive grows.
+    """
+    segments = list(segments)
+    if not segments or not os.path.exists(path):
+        return pd.DataFrame(columns=ARTICLE_COLUMNS + ["score"]), None
+    where, params = "", ()
+    if cursor is not None:
+        where = ("AND (s.score < ? OR (s.score = ? AND s.published_ts < ?) "
+                 "OR (s.score = ? AND s.published_ts = ? AND s.guid > ?)) ")
+        params = (cursor[0], cursor[0], cursor[1], cursor[0], cursor[1], cursor[2])
+    conn = connect(path)
+    try:
+        set_id = _ensure_set(conn, segments)
+        df = pd.read_sql_query(
+            "SELECT a.guid, a.title, a.link, a.pub_date AS pubDate, a.source, a.summary, "
+            "       a.published_ts, a.ingested_ts, s.score "
+            "FROM set_scores s JOIN articles a ON a.guid = s.guid "
+            f"WHERE s.set_id = ? {where}"
+            "ORDER BY s.score DESC, s.published_ts DESC, s.guid LIMIT ?",
+            conn, params=(set_id, *params, int(limit) + 1),
+        )
+    finally:
+        conn.close()
+    return _split_page(df, limit, ["score", "published_ts", "guid"])
+
+
+def has_ranked(segments, path=NEWS_DB_PATH) -> bool:
+    """Whether any stored article scores for `segments`; one index probe once the set is built."""
+    segments = list(segments)
+    if not segments or not os.path.exists(path):
+        return False
+    conn = connect(path)
+    try:
+        set_id = _ensure_set(conn, segments)
+        return conn.execute("SELECT 1 FROM set_scores WHERE set_id = ? LIMIT 1", (set_id,)).fetchone() is not None
+    finally:
+        conn.close()
+
+
+def _split_page(df, limit, key_cols):
+    """Trim the look-ahead row and derive the cursor for the next page."""
+    if len(df) <= limit:
+        return df, None
+    df = df.iloc[:limit]
+    return df, tuple(df.iloc[-1][key_cols])
+
+
+def get_feed_state(feed_url, path=NEWS_DB_PATH) -> dict:
+    conn = connect(path)
+    try:
+        row = conn.execute(
+            "SELECT etag, last_modified, checked_ts FROM feed_state WHERE feed_url = ?", (feed_url,)
+        ).fetchone()
+    finally:
+        conn.close()
+    if not row:
+        return {"etag": None, "last_modified": None, "checked_ts": None}
+    return {"etag": row[0], "last_modified": row[1], "checked_ts": row[2]}
+
+
+def set_feed_state(feed_url, etag, last_modified, path=NEWS_DB_PATH):
+    conn = connect(path)
+    try:
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO feed_state VALUES (?,?,?,?)",
+                (feed_url, etag, last_modified, time.time()),
+            )
+    finally:
+        conn.close()
@@ -0,0 +1,294 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        expense_ledger.py
+Purpose:     Append-only SQLite ledger of student expense entries. Every write
+             inserts one entry and bumps a running total per (student, month,
+             category) in the same transaction, so reading a month's totals
+             is a primary-key lookup no matter how much history exists.
+             Entries are never updated or deleted (corrections are negative
+             entries), so months and amounts are validated before writing.
+             Writers take an immediate write lock and the database
+             runs in WAL mode, so concurrent sessions can write safely while
+             others read. The static audit JSON seeds each student once.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import date
+
+import pandas as pd
+from config import EXPENSE_LEDGER_PATH
+
+# Ledger categories -> labels used by the cost-of-living comparison
+CATEGORY_LABELS = {
+    "on_campus": "On-Campus",
+    "off_campus": "Off-Campus",
+    "utilities": "Utilities",
+    "transportation": "Transportation",
+    "fun": "Fun",
+}
+# Categories the audit JSON breaks down by item; entries without one go under "other"
+ITEMIZED_CATEGORIES = ("on_campus", "off_campus", "fun")
+
+_SCHEMA = [
+    """
+    CREATE TABLE IF NOT EXISTS expense_entries (
+        id          INTEGER PRIMARY KEY AUTOINCREMENT,
+        student_id  TEXT NOT NULL,
+        month       TEXT NOT NULL,
+        category    TEXT NOT NULL,
+        subcategory TEXT,
+        amount      REAL NOT NULL,
+        source      TEXT NOT NULL,
+        note        TEXT,
+        created_ts  REAL NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_entries_student ON expense_entries (student_id, month, id)",
+    """
+    CREATE TABLE IF NOT EXISTS expense_totals (
+        student_id TEXT NOT NULL,
+        month      TEXT NOT NULL,
+        category   TEXT NOT NULL,
+        total      REAL NOT NULL,
+        entries    INTEGER NOT NULL,
+        PRIMARY KEY (student_id, month, category)
+    )
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS expense_entries_no_update BEFORE UPDATE ON expense_entries
+    BEGIN SELECT RAISE(ABORT, 'expense_entries is append-only'); END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS expense_entries_no_delete BEFORE DELETE ON expense_entries
+    BEGIN SELECT RAISE(ABORT, 'expense_entries is append-only'); END
+    """,
+]
+
+
+_MONTH_RX = re.compile(r"^\d{4}-(0[1-9]|1[0-2])$")
+# Months stored before validation existed may be malformed; "latest" ignores them
+_VALID_MONTH_SQL = ("(month GLOB '[0-9][0-9][0-9][0-9]-0[1-9]' "
+                    "OR month GLOB '[0-9][0-9][0-9][0-9]-1[0-2]')")
+
+_ready_paths = set()
+_ready_lock = threading.Lock()
+
+
+def current_month() -> str:
+    return date.today().strftime("%Y-%m")
+
+
+def _check_month(month):
+    if not isinstance(month, str) or not _MONTH_RX.match(month):
+        raise ValueError(f"Month must be YYYY-MM, got {month!r}")
+
+
+def _check_amount(amount):
+    try:
+        value = float(amount)
+    except (TypeError, ValueError):
+        raise ValueError(f"Amount must be a number, got {amount!r}") from None
+    if value == 0 or not math.isfinite(value):
+        raise ValueError("Amount must be a non-zero number")
+
+
+def connect(path=EXPENSE_LEDGER_PATH):
+    # Autocommit mode; writers open their own BEGIN IMMEDIATE transactions
+    with _ready_lock:
+        fresh = path not in _ready_paths or not os.path.exists(path)
+        if fresh and os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout=30000")
+        if fresh:
+            # WAL is stored in the file; the schema only needs creating once per process
+            conn.execute("PRAGMA journal_mode=WAL")
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+            _ready_paths.add(path)
+    return conn
+
+
+def _append(conn, rows, now):
+    """Insert entries and fold them into the running totals (caller holds the lock)."""
+    conn.executemany(
+        "INSERT INTO expense_entries (student_id, month, category, subcategory, amount, source, note, created_ts) "
+        "VALUES (?,?,?,?,?,?,?,?)",
+        [(r["student_id"], r["month"], r["category"], r.get("subcategory"), float(r["amount"]),
+          r.get("source", "manual"), r.get("note"), now) for r in rows],
+    )
+    conn.executemany(
+        "INSERT INTO expense_totals VALUES (?,?,?,?,1) "
+        "ON CONFLICT (student_id, month, category) "
+        "DO UPDATE SET total = total + excluded.total, entries = entries + 1",
+        [(r["student_id"], r["month"], r["category"], float(r["amount"])) for r in rows],
+    )
+
+
+def append_expense(student_id, category, amount, month=None, subcategory=None, note=None,
+                   source="manual", path=EXPENSE_LEDGER_PATH):
+    """
+    Record one expense (negative `amount` for a correction). Raises
+    ValueError for an unknown category, a month that is not YYYY-MM, or a
+    zero amount; the ledger is append-only, so bad entries cannot be removed.
+    """
+    if category not in CATEGORY_LABELS:
+        raise ValueError(f"Unknown expense category: {category}")
+    month = month or current_month()
+    _check_month(month)
+    _check_amount(amount)
+    row = {"student_id": student_id, "month": month, "category": category,
+           "subcategory": subcategory, "amount": amount, "source": source, "note": note}
+    conn = connect(path)
+    try:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            _append(conn, [row], time.time())
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+
+def _audit_rows(expense_record, month):
+    """Flatten an audit JSON record into ledger entries (the stored `total` is ignored)."""
+    monthly = (expense_record.get("expenses") or {}).get("monthly") or {}
+    rows = []
+    for category in CATEGORY_LABELS:
+        value = monthly.get(category)
+        items = value.items() if isinstance(value, dict) else [(None, value)]
+        for sub, amount in items:
+            if amount:
+                rows.append({"student_id": expense_record.get("student_id"), "month": month,
+                             "category": category, "subcategory": sub, "amount": amount, "source": "audit"})
+    return rows
+
+
+def seed_from_audit(expense_record, month=None, path=EXPENSE_LEDGER_PATH) -> bool:
+    """
+    Import a student's audit record once. The existence check runs inside
+    the write lock, so concurrent sessions cannot import it twice.
+    Returns True if entries were added.
+    """
+    student_id = (expense_record or {}).get("student_id")
+    if not student_id:
+        return False
+    month = month or current_month()
+    _check_month(month)
+    conn = connect(path)
+    try:
+        if conn.execute("SELECT 1 FROM expense_entries WHERE student_id = ? LIMIT 1", (student_id,)).fetchone():
+            return False
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM expense_entries WHERE student_id = ? LIMIT 1", (student_id,)).fetchone():
+                conn.execute("ROLLBACK")
+                return False
+            _append(conn, _audit_rows(expense_record, month), time.time())
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    finally:
+        conn.close()
+
+
+_LATEST_MONTH_SQL = f"SELECT MAX(month) FROM expense_totals WHERE student_id = ? AND {_VALID_MONTH_SQL}"
+
+
+def latest_month(student_id, path=EXPENSE_LEDGER_PATH):
+    conn = connect(path)
+    try:
+        row = conn.execute(_LATEST_MONTH_SQL, (student_id,)).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+
+def monthly_totals(student_id, month=None, path=EXPENSE_LEDGER_PATH) -> dict:
+    """category -> running total for one student and month (default: latest)."""
+    conn = connect(path)
+    try:
+        if month is None:   # one round trip: the latest month is a subquery
+            rows = conn.execute(
+                f"SELECT category, total FROM expense_totals WHERE student_id = ? AND month = ({_LATEST_MONTH_SQL})",
+                (student_id, student_id),
+            ).fetchall()
+        else:
+            rows = conn.execute(
+                "SELECT category, total FROM expense_totals WHERE student_id = ? AND month = ?", (student_id, month)
+            ).fetchall()
+    finally:
+        conn.close()
+    return dict(rows)
+
+
+def monthly_breakdown(student_id, month=None, path=EXPENSE_LEDGER_PATH):
+    """
+    One month (default: latest) of a student's entries in the shape of the
+    audit's `expenses.monthly` (itemized categories as {item: amount}), or None.
+    """
+    conn = connect(path)
+    try:
+        month_sql, params = (f"({_LATEST_MONTH_SQL})", (student_id,)) if month is None else ("?", (month,))
+        rows = conn.execute(
+            "SELECT category, subcategory, SUM(amount) FROM expense_entries "
+            f"WHERE student_id = ? AND month = {month_sql} GROUP BY category, subcategory",
+            (student_id, *params),
+        ).fetchall()
+    finally:
+        conn.close()
+    if not rows:
+        return None
+    out = {c: {} for c in ITEMIZED_CATEGORIES}
+    for category, sub, amount in rows:
+        if category in ITEMIZED_CATEGORIES:
+            key = sub or "other"
+            out[category][key] = out[category].get(key, 0.0) + amount
+        else:
+            out[category] = out.get(category, 0.0) + amount
+    return out
+
+
+def expense_summary(student_id, month=None, path=EXPENSE_LEDGER_PATH):
+    """Ledger totals in the shape of `summarize_student_expenses`, or None."""
+    totals = monthly_totals(student_id, month, path)
+    if not totals:
+        return None
+    summary = {label: float(totals.get(cat, 0.0)) for cat, label in CATEGORY_LABELS.items()}
+    summary["Total"] = sum(summary.values())
+    return summary
+
+
+def load_entries(student_id, month=None, limit=50, path=EXPENSE_LEDGER_PATH) -> pd.DataFrame:
+    """Most recent entries for a student, newest first."""
+    where, params = "student_id = ?", [student_id]
+    if month:
+        where += " AND month = ?"
+        params.append(month)
+    conn = connect(path)
+    try:
+        return pd.read_sql_query(
+            "SELECT id, month, category, subcategory, amount, source, note, created_ts "
+            f"FROM expense_entries WHERE {where} ORDER BY id DESC LIMIT ?",
+            conn, params=(*params, int(limit)),
+        )
+    finally:
+        conn.close()
@@ -0,0 +1,68 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        lazy.py
+Purpose:     Deferred imports for heavy, optionally-used dependencies (the
+             Gemini SDK, Plotly Express, BeautifulSoup). `lazy_import` returns
+             a stand-in that imports the real module on first attribute
+             access, so a rerun that never opens the chat or draws a chart
+             never pays for those imports. How long each deferred import
+             took is kept in LOAD_TIMES for the startup profiler.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import importlib
+import threading
+import time
+
+LOAD_TIMES = {}  # module name -> seconds spent importing it on first use
+
+
+class LazyModule:
+    """Module stand-in; the import happens on the first attribute lookup."""
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        if self._module is None:
+            with self._lock:
+                if self._module is None:
+                    start = time.perf_counter()
+                    module = importlib.import_module(self._name)
+                    LOAD_TIMES[self._name] = time.perf_counter() - start
+                    self._module = module
+        return self._module
+
+    @property
+    def loaded(self):
+        return self._module is not None
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self.loaded else "not loaded"
+        return f"<lazy module {self._name!r} ({state})>"
+
+
+_MODULES = {}
+_MODULES_LOCK = threading.Lock()
+
+
+def lazy_import(name) -> LazyModule:
+    """One shared stand-in per module name, e.g. px = lazy_import('plotly.express')."""
+    with _MODULES_LOCK:
+        mod = _MODULES.get(name)
+        if mod is None:
+            mod = _MODULES[name] = LazyModule(name)
+        return mod
@@ -0,0 +1,208 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        metrics.py
+Purpose:     In-process instrumentation for caches, external fetches and LLM
+             calls. Records counters (cache hits/misses/evictions, fetch
+             errors) and histograms (latency, payload size), renders them as
+             tables for the hidden admin page, and exports them in Prometheus
+             text format to a local file for tuning TTLs and finding slow
+             sources.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import bisect
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import METRICS_EXPORT_PATH
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216)
+
+_HELP = {
+    "brok_cache_requests_total": "Cache lookups by result (hit, stale, miss).",
+    "brok_cache_evictions_total": "Entries evicted from a cache to respect maxsize.",
+    "brok_fetch_seconds": "Latency of external HTTP fetches.",
+    "brok_fetch_bytes": "Payload size of external HTTP fetches.",
+    "brok_fetch_errors_total": "External HTTP fetches that raised or returned an error status.",
+    "brok_llm_seconds": "Latency of LLM calls.",
+    "brok_llm_prompt_bytes": "Prompt size sent to the LLM.",
+    "brok_llm_response_bytes": "Response size received from the LLM.",
+}
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Histogram:
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # last slot is +Inf
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def quantile(self, q):
+        """Bucket-interpolated estimate, good enough to spot slow sources."""
+        if not self.count:
+            return None
+        rank, seen, lower = q * self.count, 0, 0.0
+        for i, c in enumerate(self.counts):
+            if seen + c >= rank and c:
+                upper = self.buckets[i] if i < len(self.buckets) else self.buckets[-1]
+                return lower + (upper - lower) * (rank - seen) / c
+            seen += c
+            lower = self.buckets[i] if i < len(self.buckets) else lower
+        return self.buckets[-1]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}    # (name, labels) -> float
+        self._histograms = {}  # (name, labels) -> _Histogram
+
+    @staticmethod
+    def _labels(labels):
+        return tuple(sorted((labels or {}).items()))
+
+    def inc(self, name, labels=None, value=1):
+        key = (name, self._labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, labels=None, buckets=LATENCY_BUCKETS):
+        key = (name, self._labels(labels))
+        with self._lock:
+            hist = self._histograms.get(key)
+            if hist is None:
+                hist = self._histograms[key] = _Histogram(buckets)
+            hist.observe(value)
+
+    def reset(self):
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    # ---- views ----
+    def counter_rows(self):
+        with self._lock:
+            items = list(self._counters.items())
+        return [{"metric": n, **dict(l), "value": v} for (n, l), v in sorted(items)]
+
+    def histogram_rows(self):
+        with self._lock:
+            items = [(k, h.count, h.total, h.quantile(0.5), h.quantile(0.95), h.quantile(0.99))
+                     for k, h in self._histograms.items()]
+        return [
+            {"metric": n, **dict(l), "count": c, "sum": t, "mean": t / c if c else None,
+             "p50": p50, "p95": p95, "p99": p99}
+            for (n, l), c, t, p50, p95, p99 in sorted(items, key=lambda r: r[0])
+        ]
+
+    def to_prometheus(self) -> str:
+        def fmt_labels(labels, extra=()):
+            pairs = list(labels) + list(extra)
+            if not pairs:
+                return ""
+            return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+        with self._lock:
+            counters = sorted(self._counters.items())
+            hists = sorted(((k, list(h.counts), h.total, h.count, h.buckets)
+                            for k, h in self._histograms.items()), key=lambda r: r[0])
+        lines, seen = [], set()
+        for (name, labels), value in counters:
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {name} {_HELP.get(name, name)}", f"# TYPE {name} counter"]
+            lines.append(f"{name}{fmt_labels(labels)} {value:g}")
+        for (name, labels), counts, total, count, buckets in hists:
+            if name not in seen:
+                seen.add(name)
+                lines += [f"# HELP {name} {_HELP.get(name, name)}", f"# TYPE {name} histogram"]
+            cumulative = 0
+            for bound, c in zip(list(buckets) + ["+Inf"], counts):
+                cumulative += c
+                le = bound if bound == "+Inf" else f"{bound:g}"
+                lines.append(f"{name}_bucket{fmt_labels(labels, [('le', le)])} {cumulative}")
+            lines.append(f"{name}_sum{fmt_labels(labels)} {total:g}")
+            lines.append(f"{name}_count{fmt_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def export_prometheus(self, path=METRICS_EXPORT_PATH) -> str:
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w") as f:
+            f.write(self.to_prometheus())
+        os.replace(tmp, path)
+        return path
+
+
+REGISTRY = MetricsRegistry()
+
+
+# ----------------------------
+#  Recording helpers
+# ----------------------------
+
+def record_cache(cache, result):
+    """result is one of 'hit', 'stale', 'miss'."""
+    REGISTRY.inc("brok_cache_requests_total", {"cache": cache, "result": result})
+
+
+def record_eviction(cache, n=1):
+    REGISTRY.inc("brok_cache_evictions_total", {"cache": cache}, n)
+
+
+@contextmanager
+def timed(name, buckets=LATENCY_BUCKETS, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        REGISTRY.observe(name, time.perf_counter() - start, labels, buckets)
+
+
+def timed_get(source, url, **kwargs):
+    """`requests.get` that records latency, payload size and errors under `source`."""
+    import requests
+
+    labels = {"source": source}
+    start = time.perf_counter()
+    try:
+        r = requests.get(url, **kwargs)
+    except Exception:
+        REGISTRY.observe("brok_fetch_seconds", time.perf_counter() - start, labels)
+        REGISTRY.inc("brok_fetch_errors_total", labels)
+        raise
+    REGISTRY.observe("brok_fetch_seconds", time.perf_counter() - start, labels)
+    REGISTRY.observe("brok_fetch_bytes", len(r.content or b""), labels, SIZE_BUCKETS)
+    if r.status_code >= 400:
+        REGISTRY.inc("brok_fetch_errors_total", labels)
+    return r
+
+
+def record_llm(model, seconds, prompt, response):
+    labels = {"model": model}
+    REGISTRY.observe("brok_llm_seconds", seconds, labels)
+    REGISTRY.observe("brok_llm_prompt_bytes", len((prompt or "").encode()), labels, SIZE_BUCKETS)
+    REGISTRY.observe("brok_llm_response_bytes", len((response or "").encode()), labels, SIZE_BUCKETS)
@@ -0,0 +1,104 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        news_feed.py
+Purpose:     Paginated news feed component for the Streamlit dashboard.
+             Articles are pulled a page at a time from a cursor-based loader
+             (see utils/article_store.py) behind a "Load more" button, and each
+             page's markup is built in one vectorized pandas step and emitted
+             as a single element. Pages already shown are kept in session
+             state, so a rerun never re-queries or re-renders earlier pages and
+             render cost stays constant as the archive grows; they are dropped
+             when the store's version changes (new articles ingested).
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZE = 12
+
+
+def _md_text(s: pd.Series) -> pd.Series:
+    """Escape characters that would break a markdown link label."""
+    return (s.fillna("").astype(str)
+             .str.replace("\\", "\\\\", regex=False)
+             .str.replace("[", "\\[", regex=False)
+             .str.replace("]", "\\]", regex=False))
+
+
+def _html_text(s: pd.Series) -> pd.Series:
+    return (s.fillna("").astype(str)
+             .str.replace("&", "&amp;", regex=False)
+             .str.replace("<", "&lt;", regex=False)
+             .str.replace(">", "&gt;", regex=False))
+
+
+def feed_markup(df: pd.DataFrame) -> str:
+    """
+    Markdown/HTML for a page of articles, built column-wise: one string per
+    article from Series operations, joined once. Accepts either `pubDate` or
+    `pubdate` columns.
+    """
+    if df.empty:
+        return ""
+    col = lambda name: df[name] if name in df.columns else pd.Series("", index=df.index)
+    pub = col("pubDate") if "pubDate" in df.columns else col("pubdate")
+    items = (
+        "**[" + _md_text(col("title")) + "](" + col("link").fillna("").astype(str).str.replace(")", "%29", regex=False)
+        + ")**  \n*" + _html_text(pub) + " — " + _html_text(col("source")) + "*\n\n"
+        + "<p style='color:gray'>" + _html_text(col("summary")) + "</p>\n\n---"
+    )
+    return "\n\n".join(items.tolist())
+
+
+def _load_next(key, load_page, page_size):
+    state = st.session_state[key]
+    if state["done"]:
+        return
+    df, cursor = load_page(state["cursor"], page_size)
+    if not df.empty:
+        state["pages"].append(feed_markup(df))
+        state["shown"] += len(df)
+    state["cursor"], state["done"] = cursor, cursor is None
+
+
+def render_news_feed(key, load_page, page_size=PAGE_SIZE, empty_message="No recent news found.", version=None):
+    """
+    Render a paged feed. `load_page(cursor, limit)` returns
+    (page_df, next_cursor) with next_cursor None on the last page; `key`
+    identifies the feed in session state (include anything that changes its
+    contents, e.g. the selected student). When `version` differs from the one
+    the cached pages were loaded at (e.g. article_store.store_version()), the
+    feed starts over from the first page.
+    """
+    state = st.session_state.get(key)
+    if state is None or state.get("version") != version:
+        st.session_state[key] = {"cursor": None, "pages": [], "shown": 0, "done": False, "version": version}
+        _load_next(key, load_page, page_size)
+    state = st.session_state[key]
+
+    if not state["pages"]:
+        st.info(empty_message)
+        return
+    for markup in state["pages"]:
+        st.markdown(markup, unsafe_allow_html=True)
+    if not state["done"]:
+        st.button(f"Load more (showing {state['shown']})", key=f"{key}:more",
+                  on_click=_load_next, args=(key, load_page, page_size))
+
+
+def frame_pager(df: pd.DataFrame):
+    """`load_page` over an in-memory frame (cursor = row offset), for fallbacks."""
+    def load_page(cursor, limit):
+        start = cursor or 0
+        page = df.iloc[start:start + limit]
+        return page, (start + limit if start + limit < len(df) else None)
+    return load_page
@@ -4,8 +4,12 @@ Project:     brok@CMU
 File:        parsing.py
 Purpose:     Provides text parsing utilities for extracting monetary and
              percentage values from raw HTML or text content using regex.
-             Also includes helper functions for shortening text snippets
-             for clean display in the Streamlit interface.
+             A single compiled scanner finds dollar amounts, percentages,
+             "per <unit>" phrases and academic-year tokens in one pass and
+             returns them typed; `scan_series` does the same for a pandas
+             Series in one pass over the joined strings. Also includes
+             helper functions for shortening text snippets for clean display
+             in the Streamlit interface.
 
 Course:      95-888 Data Focused Python (Fall 2025, Section B1)
 Team:        Pink Team
@@ -16,11 +20,153 @@ Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
 '''
 
 import re
-_money = re.compile(r"\$[\s]*[\d,]+(?:\.\d{2})?")
-_pct   = re.compile(r"\b\d{1,3}(?:\.\d+)?\s?%")
+from typing import NamedTuple
 
-def find_money(text: str): return _money.findall(text or "")
-def find_pct(text: str):   return _pct.findall(text or "")
+import numpy as np
+import pandas as pd
+
+# Pattern pieces shared with the scrapers (scrapers/loans.py builds its
+# rate and loan-limit patterns from these)
+AMOUNT_PATTERN = r"[\d,]+(?:\.\d{2})?"
+PERCENT_NUMBER_PATTERN = r"\b\d{1,3}(?:\.\d+)?"
+# "$5.5%" is a percentage, not $5 followed by "5%"
+MONEY_PATTERN = r"\$\s*" + AMOUNT_PATTERN + r"(?!\.?\d*\s?%)"
+UNIT_WORDS = r"year|semester|unit|credit|course|term"
+
+# One alternation; the group that matched tells the token type. Money is
+# tried first so digits inside "$2,526" are never read as a year. The leading
+# lookahead lets the engine skip, in one check, every position that cannot
+# start a token (most of a line of prose).
+_TOKEN_RX = re.compile(
+    r"(?=[$\dPp])(?:"
+    rf"(?P<money>{MONEY_PATTERN})"
+    rf"|(?P<pct>{PERCENT_NUMBER_PATTERN}\s?%)"
+    rf"|per\s*(?P<unit>{UNIT_WORDS})"
+    r"|\b(?P<ay>\d{4})\b"  # e.g. 2526 -> AY 2025-26
+    r")",
+    re.I,
+)
+_NUMBER_RX = re.compile(r"(\d[\d,]*(?:\.\d+)?)")
+
+
+class Scan(NamedTuple):
+    money: list            # raw dollar strings, e.g. ['$1,200.00']
+    amounts: list          # the same as floats
+    money_start: int       # offset of the first dollar string, -1 if none
+    percents: list         # floats, e.g. [6.39]
+    units: list            # e.g. ['per_semester']
+    academic_years: list   # e.g. ['2025-26']
+
+    @property
+    def first_amount(self):
+        return self.amounts[0] if self.amounts else None
+
+    @property
+    def unit(self):
+        return self.units[0] if self.units else None
+
+    @property
+    def academic_year(self):
+        return self.academic_years[0] if self.academic_years else ""
+
+
+def _money_value(raw):
+    return float(raw.replace("$", "").replace(",", "").strip())
+
+
+def _academic_year(token):
+    return f"20{token[:2]}-{token[2:]}"
+
+
+def scan(text: str) -> Scan:
+    """Every money / percent / unit / academic-year token in `text`, in one pass."""
+    text = text or ""
+    money, amounts, pcts, units, years = [], [], [], [], []
+    start = -1
+    for m in _TOKEN_RX.finditer(text):
+        raw, pct, unit, ay = m.groups()
+        if raw:
+            if not money:
+                start = m.start()
+            money.append(raw)
+            amounts.append(_money_value(raw))
+        elif pct:
+            pcts.append(float(pct.rstrip("% ")))
+        elif unit:
+            units.append(f"per_{unit.lower()}")
+        else:
+            years.append(_academic_year(ay))
+    return Scan(money, amounts, start, pcts, units, years)
+
+
+def _matches_by_row(rx, texts, group):
+    """(row, group number, matched text) arrays for every `rx` match in `texts`, in order."""
+    # NUL never occurs in page text and no token can span it, so one pass over
+    # the joined strings finds every token; offsets map each back to its row
+    lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+    starts = np.concatenate(([0], np.cumsum(lengths + 1)[:-1])) if texts else lengths
+    positions, kinds, values = [], [], []
+    for m in rx.finditer("\x00".join(texts)):
+        g = group or m.lastindex
+        positions.append(m.start())
+        kinds.append(g)
+        values.append(m.group(g))
+    rows = np.searchsorted(starts, np.asarray(positions, dtype=np.int64), side="right") - 1
+    return rows, np.asarray(kinds, dtype=np.int64), np.asarray(values, dtype=object)
+
+
+def _heads(rows, kinds, values, group):
+    """Rows and values of the first token with `group` in each row (tokens come in row order)."""
+    sel = kinds == group
+    r, v = rows[sel], values[sel]
+    head = np.r_[True, r[1:] != r[:-1]][:len(r)]
+    return r[head], v[head]
+
+
+def scan_series(s: pd.Series) -> pd.DataFrame:
+    """
+    `scan` over a Series of strings, keeping the first token of each type per
+    row. Columns: money, amount, percent, unit, academic_year (NaN where
+    absent). One scan over the joined strings instead of one call per row.
+    """
+    texts = s.fillna("").astype(str).tolist()
+    n = len(texts)
+    found = _matches_by_row(_TOKEN_RX, texts, None)
+    money, unit, year = (np.full(n, None, dtype=object) for _ in range(3))
+    amount, percent = np.full(n, np.nan), np.full(n, np.nan)
+
+    r, v = _heads(*found, 1)
+    money[r] = v
+    amount[r] = [_money_value(x) for x in v]
+    r, v = _heads(*found, 2)
+    percent[r] = [float(x.rstrip("% ")) for x in v]
+    r, v = _heads(*found, 3)
+    unit[r] = [f"per_{x.lower()}" for x in v]
+    r, v = _heads(*found, 4)
+    year[r] = [_academic_year(x) for x in v]
+    return pd.DataFrame({"money": money, "amount": amount, "percent": percent, "unit": unit,
+                         "academic_year": year}, index=s.index)
+
+
+def extract_numeric(val):
+    """First number in strings like '$1,200' or '58.8 miles', else None."""
+    if pd.isna(val):
+        return None
+    match = _NUMBER_RX.search(str(val))
+    return float(match.group(1).replace(",", "")) if match else None
+
+
+def extract_numeric_series(s: pd.Series) -> pd.Series:
+    """`extract_numeric` over a Series in one scan of the joined strings; NaN where there is no number."""
+    texts = s.astype(str).tolist()   # NaN -> 'nan', which holds no number
+    out = np.full(len(texts), np.nan)
+    r, v = _heads(*_matches_by_row(_NUMBER_RX, texts, 1), 1)
+    out[r] = [float(x.replace(",", "")) for x in v]
+    return pd.Series(out, index=s.index)
+
+
+def find_money(text: str): return scan(text).money
+def find_pct(text: str):   return [pct for _, pct, _, _ in _TOKEN_RX.findall(text or "") if pct]
 
 def short(text, n=200):
     text = text or ""
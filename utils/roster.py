@@ -0,0 +1,410 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        roster.py
+Purpose:     Compact, shared in-memory representation of the student and
+             expense JSON records. Each field is stored column-wise: text in
+             one UTF-8 buffer with offsets, repeated labels (school,
+             department, level, status, ...) as small integer codes into a
+             category tuple, numbers in typed NumPy arrays, and lists
+             (courses, invoices) as flattened columns with row offsets.
+             `RecordView` is a `__slots__` mapping over one row that reads
+             the columns on access, so existing `student.get("program", {})`
+             style code keeps working. `load_roster()` keeps one roster per
+             process, shared by every Streamlit session.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import os
+import threading
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+
+from config import STUDENTS_PATH, EXPENSES_PATH
+from utils.students import load_students, load_expenses
+
+_ABSENT = object()  # marks a key the original record did not have
+
+
+def _int_dtype(lo, hi):
+    for dtype in (np.int8, np.int16, np.int32, np.int64):
+        info = np.iinfo(dtype)
+        if info.min <= lo and hi <= info.max:
+            return dtype
+    return np.int64
+
+
+def _offsets(lengths):
+    out = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=out[1:])
+    return out.astype(_int_dtype(0, int(out[-1])))
+
+
+def _missing_mask(values):
+    mask = np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+    return mask if mask.any() else None
+
+
+# ---- column kinds: `fits(value)` says whether a value can be stored as-is ----
+
+class Strings:
+    """Text in one UTF-8 buffer, sliced by offsets on access."""
+    __slots__ = ("blob", "offsets", "missing")
+
+    @staticmethod
+    def fits(v):
+        return v is None or isinstance(v, str)
+
+    def __init__(self, values):
+        encoded = [v.encode() if v is not None else b"" for v in values]
+        self.blob = b"".join(encoded)
+        self.offsets = _offsets([len(b) for b in encoded])
+        self.missing = _missing_mask(values)
+
+    def __getitem__(self, i):
+        if self.missing is not None and self.missing[i]:
+            return None
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].decode()
+
+    def slice(self, a, b):
+        return [self[i] for i in range(a, b)]
+
+
+class Categories:
+    """Repeated labels as the smallest integer codes into a tuple of categories (-1 = None)."""
+    __slots__ = ("codes", "categories")
+
+    @staticmethod
+    def fits(v):
+        return v is None or isinstance(v, str)
+
+    def __init__(self, values):
+        codes, uniques = pd.factorize(pd.Series(values, dtype=object))
+        self.codes = codes.astype(_int_dtype(-1, max(len(uniques), 1)))
+        self.categories = tuple(uniques)
+
+    def __getitem__(self, i):
+        code = self.codes[i]
+        return self.categories[code] if code >= 0 else None
+
+    def slice(self, a, b):
+        cats = self.categories
+        return [cats[c] if c >= 0 else None for c in self.codes[a:b].tolist()]
+
+
+class Numbers:
+    """Ints in the smallest integer dtype that holds them, otherwise float64."""
+    __slots__ = ("values", "missing", "is_int")
+
+    @staticmethod
+    def fits(v):
+        return v is None or (isinstance(v, (int, float)) and not isinstance(v, bool))
+
+    def __init__(self, values):
+        present = [v for v in values if v is not None]
+        self.missing = _missing_mask(values)
+        self.is_int = None
+        if all(isinstance(v, int) for v in present):
+            lo, hi = (min(present), max(present)) if present else (0, 0)
+            self.values = np.array([0 if v is None else v for v in values], dtype=_int_dtype(lo, hi))
+        else:
+            self.values = np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+            ints = np.fromiter((isinstance(v, int) for v in values), dtype=bool, count=len(values))
+            self.is_int = ints if ints.any() else None  # ints mixed with floats keep their type
+
+    def __getitem__(self, i):
+        if self.missing is not None and self.missing[i]:
+            return None
+        v = self.values[i].item()
+        return int(v) if self.is_int is not None and self.is_int[i] else v
+
+    def slice(self, a, b):
+        if self.missing is not None or self.is_int is not None:
+            return [self[i] for i in range(a, b)]
+        return self.values[a:b].tolist()
+
+
+class CategoryLists:
+    """Lists of labels (e.g. courses): flattened category codes plus row offsets."""
+    __slots__ = ("items", "offsets")
+
+    @staticmethod
+    def fits(v):
+        return isinstance(v, list) and all(isinstance(x, str) for x in v)
+
+    def __init__(self, values):
+        values = [v if v is not None else [] for v in values]
+        self.items = Categories([x for v in values for x in v])
+        self.offsets = _offsets([len(v) for v in values])
+
+    def __getitem__(self, i):
+        return self.items.slice(self.offsets[i], self.offsets[i + 1])
+
+
+class OptionalRecord:
+    """A small dict with fixed keys, or None (e.g. scholarship, assistantship)."""
+
+    def __init__(self, schema):
+        self.schema = schema
+
+    def fits(self, v):
+        return v is None or (isinstance(v, dict) and list(v) == list(self.schema)
+                             and all(kind.fits(v[k]) for k, kind in self.schema.items()))
+
+    def __call__(self, values):
+        return _OptionalRecordColumn(self.schema, values)
+
+
+class _OptionalRecordColumn:
+    __slots__ = ("present", "fields")
+
+    def __init__(self, schema, values):
+        self.present = np.fromiter((v is not None for v in values), dtype=bool, count=len(values))
+        self.fields = {k: kind([v[k] if v is not None else None for v in values]) for k, kind in schema.items()}
+
+    def __getitem__(self, i):
+        return {k: col[i] for k, col in self.fields.items()} if self.present[i] else None
+
+
+class RecordList:
+    """Lists of dicts with fixed keys (e.g. invoices): flattened field columns plus row offsets."""
+
+    def __init__(self, schema):
+        self.schema = schema
+
+    def fits(self, v):
+        return isinstance(v, list) and all(
+            isinstance(r, dict) and list(r) == list(self.schema)
+            and all(kind.fits(r[k]) for k, kind in self.schema.items()) for r in v)
+
+    def __call__(self, values):
+        return _RecordListColumn(self.schema, values)
+
+
+class _RecordListColumn:
+    __slots__ = ("offsets", "fields")
+
+    def __init__(self, schema, values):
+        values = [v if v is not None else [] for v in values]
+        flat = [r for v in values for r in v]
+        self.offsets = _offsets([len(v) for v in values])
+        self.fields = {k: kind([r[k] for r in flat]) for k, kind in schema.items()}
+
+    def __getitem__(self, i):
+        a, b = self.offsets[i], self.offsets[i + 1]
+        keys = list(self.fields)
+        return [dict(zip(keys, row)) for row in zip(*(col.slice(a, b) for col in self.fields.values()))]
+
+
+class NumberTree:
+    """
+    Nested dicts of numbers (e.g. monthly expenses) as one float matrix over
+    the union of leaf paths, rebuilt into plain dicts on access.
+    """
+
+    @staticmethod
+    def _leaves(d, prefix=()):
+        for k, v in d.items():
+            if isinstance(v, dict):
+                yield from NumberTree._leaves(v, prefix + (k,))
+            else:
+                yield prefix + (k,), v
+
+    @staticmethod
+    def fits(v):
+        return v is None or (isinstance(v, dict) and all(
+            Numbers.fits(x) and x is not None for _, x in NumberTree._leaves(v)))
+
+    def __init__(self, values):
+        paths = {}
+        for v in values:
+            for path, _ in self._leaves(v or {}):
+                paths.setdefault(path, len(paths))
+        self.paths = tuple(paths)
+        self.values = np.full((len(values), len(paths)), np.nan)
+        self.kind = np.zeros((len(values), len(paths)), dtype=np.int8)  # 0 absent, 1 float, 2 int
+        self.missing = _missing_mask(values)
+        for i, v in enumerate(values):
+            for path, x in self._leaves(v or {}):
+                j = paths[path]
+                self.values[i, j] = x
+                self.kind[i, j] = 2 if isinstance(x, int) else 1
+
+    def __getitem__(self, i):
+        if self.missing is not None and self.missing[i]:
+            return None
+        out = {}
+        for path, x, kind in zip(self.paths, self.values[i].tolist(), self.kind[i].tolist()):
+            if not kind:
+                continue
+            node = out
+            for k in path[:-1]:
+                node = node.setdefault(k, {})
+            node[path[-1]] = int(x) if kind == 2 else x
+        return out
+
+
+# ---- tables and row views ----
+
+STUDENT_SCHEMA = {
+    "student_id": Strings, "name": Strings, "gender": Categories, "dob": Strings, "nationality": Categories,
+    "email": Strings, "username": Strings, "password": Strings,
+    "program": {
+        "level": Categories, "department": Categories, "enrollment_year": Numbers,
+        "expected_grad_year": Numbers, "gpa": Numbers, "courses": CategoryLists, "school": Categories,
+    },
+    "financials": {
+        "tuition_per_semester": Numbers,
+        "scholarship": OptionalRecord({"type": Categories, "amount": Numbers}),
+        "assistantship": OptionalRecord({"role": Categories, "stipend": Numbers}),
+        "invoices": RecordList({"invoice_id": Strings, "semester": Categories,
+                                "due": Numbers, "paid": Numbers, "balance": Numbers}),
+    },
+    "status": Categories,
+    "contact": {"address": Strings, "phone": Strings},
+}
+
+EXPENSE_SCHEMA = {
+    "student_id": Strings, "name": Strings, "level": Categories,
+    "expenses": {"monthly": NumberTree},
+}
+
+
+class RecordTable:
+    """
+    Records laid out by `schema`: nested dicts in the schema become groups,
+    everything else a column. Values that don't fit their column (a bare
+    string where a dict is expected, a missing or extra key) are kept as-is
+    in a per-row `overrides` map, so views return exactly the original data.
+    """
+
+    def __init__(self, records, schema):
+        self.n = len(records)
+        self.groups = {}      # path -> child keys, in schema order
+        self.columns = {}     # path -> column
+        self.overrides = {}   # row -> {path: value or _ABSENT}
+        self._build(schema, list(records), ())
+
+    def _override(self, row, path, value):
+        self.overrides.setdefault(row, {})[path] = value
+
+    def _build(self, schema, parents, path):
+        # parents[row] is the dict at `path`, or None if that row's group is overridden
+        self.groups[path] = tuple(schema)
+        for row, parent in enumerate(parents):
+            if parent is not None:
+                for key in parent.keys() - schema.keys():
+                    self._override(row, path + (key,), parent[key])
+        for key, kind in schema.items():
+            sub = path + (key,)
+            values = []
+            for row, parent in enumerate(parents):
+                v = parent.get(key, _ABSENT) if parent is not None else None
+                if v is _ABSENT:
+                    self._override(row, sub, _ABSENT)
+                    v = None
+                elif parent is not None and not (isinstance(v, dict) if isinstance(kind, dict) else kind.fits(v)):
+                    self._override(row, sub, v)
+                    v = None
+                values.append(v)
+            if isinstance(kind, dict):
+                self._build(kind, values, sub)
+            else:
+                self.columns[sub] = kind(values)
+
+    def __len__(self):
+        return self.n
+
+    def view(self, row) -> "RecordView":
+        return RecordView(self, row, ())
+
+
+class RecordView(Mapping):
+    """Read-only dict-like view of one record (or a nested group of it)."""
+    __slots__ = ("_table", "_row", "_path")
+
+    def __init__(self, table, row, path):
+        self._table, self._row, self._path = table, row, path
+
+    def __getitem__(self, key):
+        t, path = self._table, self._path + (key,)
+        over = t.overrides.get(self._row)
+        if over and path in over:
+            if over[path] is _ABSENT:
+                raise KeyError(key)
+            return over[path]
+        if path in t.columns:
+            return t.columns[path][self._row]
+        if path in t.groups:
+            return RecordView(t, self._row, path)
+        raise KeyError(key)
+
+    def __iter__(self):
+        over = self._table.overrides.get(self._row) or {}
+        keys = self._table.groups[self._path]
+        for key in keys:
+            if over.get(self._path + (key,)) is not _ABSENT:
+                yield key
+        depth = len(self._path) + 1
+        for path in over:
+            if len(path) == depth and path[:-1] == self._path and path[-1] not in keys:
+                yield path[-1]
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self) -> dict:
+        return {k: v.to_dict() if isinstance(v, RecordView) else v for k, v in self.items()}
+
+    def __repr__(self):
+        return repr(self.to_dict())
+
+
+class Roster:
+    """Students plus their expense audit records (joined on student_id), column-wise."""
+
+    def __init__(self, students, expenses=()):
+        self.students = RecordTable(students, STUDENT_SCHEMA)
+        self.expenses = RecordTable(expenses, EXPENSE_SCHEMA)
+        by_id = {e.get("student_id"): j for j, e in reversed(list(enumerate(expenses)))}
+        self.expense_rows = np.array([by_id.get(s.get("student_id"), -1) for s in students],
+                                     dtype=_int_dtype(-1, max(len(expenses), 1)))
+
+    def __len__(self):
+        return len(self.students)
+
+    def student(self, row) -> RecordView:
+        return self.students.view(row)
+
+    def name(self, row) -> str:
+        return self.student(row).get("name", "Unknown")
+
+    def expense_for(self, row):
+        j = self.expense_rows[row]
+        return self.expenses.view(j) if j >= 0 else None
+
+
+_ROSTER = {"key": None, "roster": None}
+_ROSTER_LOCK = threading.Lock()
+
+
+def load_roster(students_path=STUDENTS_PATH, expenses_path=EXPENSES_PATH) -> Roster:
+    """
+    The roster for the current data files, one copy per process shared by
+    every session; rebuilt only when a file's mtime changes.
+    """
+    key = (students_path, os.path.getmtime(students_path), expenses_path, os.path.getmtime(expenses_path))
+    with _ROSTER_LOCK:
+        if _ROSTER["key"] != key:
+            _ROSTER["roster"] = Roster(load_students(students_path), load_expenses(expenses_path))
+            _ROSTER["key"] = key
+        return _ROSTER["roster"]
@@ -0,0 +1,67 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        row_keys.py
+Purpose:     64-bit row keys for DataFrames. Each key column is factorized,
+             only its distinct values are (optionally) normalized and hashed,
+             and the per-column hashes are mixed into one uint64 per row. The
+             keys are stable across processes and runs, so snapshots of the
+             same table can be joined on one integer column (see
+             utils/tuition_diff.py) instead of a wide string subset. With
+             64-bit keys, a collision among a million rows has a probability
+             of about 3e-8.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import numpy as np
+import pandas as pd
+
+_NA_HASH = np.uint64(0x9E3779B97F4A7C15)     # stands in for missing values
+_MIX = np.uint64(0x100000001B3)              # FNV-1a 64-bit prime
+_SEED = np.uint64(0xCBF29CE484222325)        # FNV-1a 64-bit offset basis
+
+
+def normalize_key_text(values) -> np.ndarray:
+    """Lower-cased, whitespace-collapsed text; what two crawls of the same fee agree on."""
+    s = pd.Series(values, dtype=object).astype(str)
+    return s.str.lower().str.replace(r"\s+", " ", regex=True).str.strip().to_numpy(dtype=object)
+
+
+def hash_column(col: pd.Series, normalize=None) -> np.ndarray:
+    """
+    uint64 hash per value of `col`. Equal values hash equal; with `normalize`
+    (a function over an array of distinct values, e.g. normalize_key_text)
+    values that are equal after normalizing do.
+    """
+    codes, uniques = pd.factorize(col, use_na_sentinel=True)
+    uniques = np.asarray(uniques, dtype=object)
+    if normalize is not None:
+        uniques = np.asarray(normalize(uniques), dtype=object)
+    hashed = pd.util.hash_array(uniques, categorize=False) if len(uniques) else np.zeros(0, dtype=np.uint64)
+    return np.where(codes >= 0, hashed[np.maximum(codes, 0)] if len(hashed) else _NA_HASH, _NA_HASH)
+
+
+def combine_keys(keys, values) -> np.ndarray:
+    """Mix uint64 `values` into `keys`, one FNV-1a step; how hash_rows folds in each column."""
+    return (np.asarray(keys, dtype=np.uint64) ^ np.asarray(values, dtype=np.uint64)) * _MIX   # wraps modulo 2**64
+
+
+def hash_rows(df: pd.DataFrame, columns, normalize=(), normalizer=normalize_key_text) -> np.ndarray:
+    """
+    One uint64 key per row from `columns`. Columns listed in `normalize`
+    (or all of them when normalize=True) are compared after `normalizer`.
+    """
+    norm = set(columns) if normalize is True else set(normalize or ())
+    keys = np.full(len(df), _SEED, dtype=np.uint64)
+    for c in columns:
+        col = df[c] if c in df.columns else pd.Series([None] * len(df), index=df.index, dtype=object)
+        keys = combine_keys(keys, hash_column(col, normalizer if c in norm else None))
+    return keys
+
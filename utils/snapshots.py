@@ -0,0 +1,129 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        snapshots.py
+Purpose:     Local, versioned store for the results of external data sources
+             (Numbeo, Google News, loans, tuition). Every successful scrape is
+             written as a new version and the latest one is what the dashboard
+             reads. Writes are atomic so a crashed refresh never leaves a
+             half-written snapshot behind. Rows are stored as JSON next to
+             each column's dtype, which is restored on load.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import json
+import os
+import tempfile
+import time
+
+import pandas as pd
+from config import SNAPSHOT_DIR, SNAPSHOT_KEEP_VERSIONS
+
+# Layout:
+#   <SNAPSHOT_DIR>/<name>.json                 latest version
+#   <SNAPSHOT_DIR>/history/<name>/<ver>.json   all kept versions
+
+
+def _snapshot_path(name: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, f"{name}.json")
+
+
+def _history_dir(name: str) -> str:
+    return os.path.join(SNAPSHOT_DIR, "history", name)
+
+
+def atomic_write_json(path: str, payload: dict):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # A temp file of its own per writer, so concurrent saves never interleave
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), prefix=f"{os.path.basename(path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(payload, f, default=str)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def save_snapshot(name: str, df: pd.DataFrame, saved_at: float = None) -> float:
+    """
+    Write `df` as a new version and as the latest good snapshot for `name`.
+    Returns the timestamp recorded with the snapshot.
+    """
+    saved_at = saved_at or time.time()
+    version = time.strftime("%Y%m%dT%H%M%S", time.gmtime(saved_at)) + f".{int(saved_at % 1 * 1000):03d}"
+    payload = {
+        "version": version,
+        "saved_at": saved_at,
+        "columns": list(df.columns),
+        "dtypes": [str(t) for t in df.dtypes],
+        # Python scalars and null for every missing value (NaN, NaT, pd.NA), so JSON keeps numbers as numbers
+        "rows": df.astype(object).where(df.notna(), None).values.tolist(),
+    }
+    atomic_write_json(os.path.join(_history_dir(name), f"{version}.json"), payload)
+    atomic_write_json(_snapshot_path(name), payload)
+    _prune_history(name)
+    return saved_at
+
+
+def _prune_history(name: str):
+    for old in list_versions(name)[:-SNAPSHOT_KEEP_VERSIONS]:
+        try:
+            os.remove(os.path.join(_history_dir(name), f"{old}.json"))
+        except OSError:
+            pass
+
+
+def list_versions(name: str) -> list:
+    """Kept versions of `name`, oldest first."""
+    try:
+        files = os.listdir(_history_dir(name))
+    except OSError:
+        return []
+    return sorted(f[:-5] for f in files if f.endswith(".json"))
+
+
+def snapshot_mtime(name: str):
+    """Modification time of the latest snapshot, or None; cheap change check."""
+    try:
+        return os.stat(_snapshot_path(name)).st_mtime
+    except OSError:
+        return None
+
+
+def _restore_dtypes(df: pd.DataFrame, dtypes: list) -> pd.DataFrame:
+    """Cast each column back to its saved dtype; columns that no longer fit keep the inferred one."""
+    for i, dtype in enumerate(dtypes):
+        try:
+            df.isetitem(i, df.iloc[:, i].astype(dtype))
+        except (TypeError, ValueError):
+            pass
+    return df
+
+
+def load_snapshot(name: str, version: str = None):
+    """
+    Returns (DataFrame, saved_at) for the latest (or a specific) version of
+    `name`, or (None, None) if nothing is saved or the file is unreadable.
+    """
+    path = _snapshot_path(name) if version is None else os.path.join(_history_dir(name), f"{version}.json")
+    try:
+        with open(path) as f:
+            payload = json.load(f)
+        df = pd.DataFrame(payload["rows"], columns=payload["columns"])
+        # Snapshots written before dtypes were recorded load with inferred dtypes
+        if len(payload.get("dtypes", ())) == len(df.columns):
+            df = _restore_dtypes(df, payload["dtypes"])
+        return df, float(payload["saved_at"])
+    except (OSError, ValueError, KeyError):
+        return None, None
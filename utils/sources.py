@@ -0,0 +1,158 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        sources.py
+Purpose:     Resilient wrapper around third-party data sources. Each render
+             waits at most a fixed time budget for a live fetch; if the budget
+             runs out or the fetch fails, the last good snapshot is served
+             (tagged with its age) while the fetch keeps running in the
+             background. Failed or empty fetches are never cached.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+from config import SOURCE_BUDGET_SEC, REFRESHER_MANAGED
+from utils.metrics import record_cache
+from utils.snapshots import save_snapshot, load_snapshot, snapshot_mtime
+from utils.tracing import span
+
+# Shared by every source; fetches outlive the render that started them.
+_EXECUTOR = ThreadPoolExecutor(max_workers=4, thread_name_prefix="brok-source")
+
+
+class ResilientSource:
+    """
+    A named data source backed by a `loader` that returns a DataFrame or raises.
+
+    read() never blocks longer than `budget` seconds. Results younger than
+    `ttl` are served from memory without touching the network; after a
+    failed refresh the next one waits `retry_after` seconds. This is the
+    only cache in front of a scraper, so every read carries its true
+    age_sec/stale. With
+    REFRESHER_MANAGED set, read() only follows the snapshot store written by
+    services/refresher.py and never calls `loader` itself.
+    """
+
+    def __init__(self, name, loader, columns, ttl=3600, budget=SOURCE_BUDGET_SEC, retry_after=60):
+        self.name = name
+        self.loader = loader
+        self.columns = list(columns)
+        self.ttl = ttl
+        self.budget = budget
+        self.retry_after = retry_after
+        self._retry_at = 0.0
+        self._lock = threading.Lock()
+        self._future = None
+        self._frame = None
+        self._fetched_at = None
+        self._disk_mtime = None
+
+    # ---- background refresh ----
+    def _refresh(self):
+        with span(f"fetch:{self.name}"):
+            df = self.loader()
+        if df is None or df.empty:
+            raise ValueError("source returned no rows")
+        fetched_at = save_snapshot(self.name, df)
+        mtime = snapshot_mtime(self.name)
+        with self._lock:
+            self._frame, self._fetched_at = df, fetched_at
+            self._disk_mtime = mtime
+        return df
+
+    def _on_done(self, fut):
+        err = fut.exception()
+        with self._lock:
+            self._future = None
+            if err is not None:
+                self._retry_at = time.time() + self.retry_after
+        if err is not None:
+            print(f"[{self.name}] Refresh failed: {err}")
+
+    def refresh_async(self):
+        """Start a refresh unless one is already in flight; returns its future."""
+        with self._lock:
+            if self._future is None:
+                # Run in a copy of the caller's context so the fetch shows up
+                # in the caller's rerun trace
+                self._future = _EXECUTOR.submit(contextvars.copy_context().run, self._refresh)
+                self._future.add_done_callback(self._on_done)
+            return self._future
+
+    # ---- reads ----
+    def _sync_from_disk(self):
+        """Pick up snapshots written by another process (e.g. the refresher)."""
+        mtime = snapshot_mtime(self.name)
+        with self._lock:
+            if mtime is None or mtime == self._disk_mtime:
+                return
+        df, saved_at = load_snapshot(self.name)
+        if df is None:
+            return
+        with self._lock:
+            self._disk_mtime = mtime
+            if self._fetched_at is None or saved_at > self._fetched_at:
+                self._frame, self._fetched_at = df, saved_at
+
+    def _is_fresh(self):
+        return self._frame is not None and time.time() - self._fetched_at < self.ttl
+
+    def _tagged(self):
+        with self._lock:
+            frame, fetched_at = self._frame, self._fetched_at
+        if frame is None:
+            out = pd.DataFrame(columns=self.columns)
+            out.attrs.update({"source": self.name, "as_of": None, "age_sec": None, "stale": True})
+            return out
+        age = time.time() - fetched_at
+        # Copy so callers that rename/add columns can't corrupt the shared frame
+        out = frame.copy()
+        out.attrs.update({"source": self.name, "as_of": fetched_at, "age_sec": age, "stale": age >= self.ttl})
+        return out
+
+    def read(self) -> pd.DataFrame:
+        self._sync_from_disk()
+        if REFRESHER_MANAGED:
+            return self._tagged()
+        with self._lock:
+            fresh = self._is_fresh()
+            have_frame = self._frame is not None
+            backing_off = self._future is None and time.time() < self._retry_at
+        record_cache(self.name, "hit" if fresh else "stale" if have_frame else "miss")
+        if not fresh and not backing_off:
+            fut = self.refresh_async()
+            with span(f"wait:{self.name}", budget=self.budget):
+                try:
+                    fut.result(timeout=self.budget)
+                except Exception:
+                    # Timed out or failed: keep serving the last good snapshot
+                    pass
+        return self._tagged()
+
+
+def describe_age(df: pd.DataFrame):
+    """Human-readable note for stale frames, e.g. 'Showing data from 3h ago'."""
+    if not df.attrs.get("stale"):
+        return None
+    age = df.attrs.get("age_sec")
+    if age is None:
+        return "Live data is unavailable right now; retrying in the background."
+    if age < 3600:
+        ago = f"{int(age // 60)}m"
+    elif age < 86400:
+        ago = f"{int(age // 3600)}h"
+    else:
+        ago = f"{int(age // 86400)}d"
+    return f"Showing last saved data from {ago} ago; refreshing in the background."
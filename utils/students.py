@@ -0,0 +1,61 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        students.py
+Purpose:     Helpers for the mock student records shared by the dashboard,
+             the news relevance engine and batch services: loading the JSON
+             files and deriving keyword / segment sets from a student's
+             school, department, level and courses.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import json
+import re
+
+from config import STUDENTS_PATH, EXPENSES_PATH
+
+
+def load_students(path=STUDENTS_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_expenses(path=EXPENSES_PATH):
+    with open(path) as f:
+        return json.load(f)
+
+
+def get_student_keywords(student):
+    p = student.get("program", {})
+    kws = set()
+    for key in ["school", "department", "level"]:
+        v = p.get(key)
+        if v:
+            kws.add(v.lower())
+    for c in p.get("courses", []):
+        kws.add(re.sub(r"\W+", " ", c.lower()))
+    return list(kws)
+
+
+def student_segments(student):
+    """
+    Segment ids a student belongs to, e.g. 'school:college of engineering'.
+    Every student also belongs to the 'all' segment.
+    """
+    p = student.get("program", {})
+    segs = ["all"]
+    for key in ["school", "department", "level"]:
+        v = p.get(key)
+        if v:
+            segs.append(f"{key}:{v.lower().strip()}")
+    for c in p.get("courses", []):
+        norm = re.sub(r"\W+", " ", c.lower()).strip()
+        segs.append(f"course:{norm}")
+    return segs
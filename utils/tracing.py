@@ -0,0 +1,189 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        tracing.py
+Purpose:     Lightweight per-rerun tracing. `span()` (context manager) and
+             `traced()` (decorator) record nested, timed spans into the trace
+             of the current Streamlit rerun; outside a trace they cost one
+             context-variable lookup. A finished trace can be shown as a
+             flame-style table (indented by nesting, with self time) in the
+             sidebar and, when TRACE_ENABLED is set, a sampled share of
+             traces is appended to a local JSONL file, one line per span, for
+             offline analysis (`python -m utils.tracing`).
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import contextvars
+import functools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+
+import pandas as pd
+from config import TRACE_ENABLED, TRACE_PATH, TRACE_MAX_MB, TRACE_SAMPLE_RATE
+
+_TRACE = contextvars.ContextVar("brok_trace", default=None)
+_PARENT = contextvars.ContextVar("brok_span", default=(None, -1))  # (span id, depth)
+_FILE_LOCK = threading.Lock()
+
+
+class Trace:
+    """Spans of one rerun. Worker threads may add spans until it is finished."""
+
+    def __init__(self, label):
+        self.label = label
+        self.trace_id = uuid.uuid4().hex[:12]
+        self.started_at = time.time()
+        self.t0 = time.perf_counter()
+        self.spans = []
+        self.finished = False
+        self._lock = threading.Lock()
+        self._ids = 0
+        self._root = None
+
+    def next_id(self):
+        with self._lock:
+            self._ids += 1
+            return self._ids
+
+    def record(self, span):
+        with self._lock:
+            if not self.finished:
+                self.spans.append(span)
+
+    @property
+    def duration(self):
+        root = next((s for s in self.spans if s["parent"] is None), None)
+        return root["duration"] if root else 0.0
+
+
+@contextmanager
+def span(name, **attrs):
+    """Time the enclosed block as a child of the current span."""
+    trace = _TRACE.get()
+    if trace is None:
+        yield
+        return
+    parent, depth = _PARENT.get()
+    span_id = trace.next_id()
+    token = _PARENT.set((span_id, depth + 1))
+    start = time.perf_counter()
+    error = None
+    try:
+        yield
+    except BaseException as e:
+        error = type(e).__name__
+        raise
+    finally:
+        end = time.perf_counter()
+        _PARENT.reset(token)
+        trace.record({
+            "id": span_id, "parent": parent, "depth": depth + 1, "name": name,
+            "start": start - trace.t0, "duration": end - start,
+            "thread": threading.current_thread().name, "error": error, "attrs": attrs or None,
+        })
+
+
+def traced(name=None):
+    """Decorator form of `span`; the span is named after the function by default."""
+    def wrap(fn):
+        label = name or f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}"
+
+        @functools.wraps(fn)
+        def caller(*args, **kwargs):
+            with span(label):
+                return fn(*args, **kwargs)
+        return caller
+    return wrap
+
+
+def start_trace(label="rerun") -> Trace:
+    """Begin the trace for this rerun; everything until finish_trace() nests under it."""
+    trace = Trace(label)
+    _TRACE.set(trace)
+    _PARENT.set((None, -1))
+    trace._root = span(label)
+    trace._root.__enter__()
+    return trace
+
+
+def finish_trace(trace: Trace, path=TRACE_PATH) -> Trace:
+    """
+    Close the root span and stop recording. With TRACE_ENABLED, a
+    TRACE_SAMPLE_RATE share of traces is appended to the JSONL file.
+    """
+    trace._root.__exit__(None, None, None)
+    with trace._lock:
+        trace.finished = True
+    _TRACE.set(None)
+    if TRACE_ENABLED and path and random.random() < TRACE_SAMPLE_RATE:
+        write_trace(trace, path)
+    return trace
+
+
+def write_trace(trace: Trace, path=TRACE_PATH):
+    lines = [json.dumps({"trace_id": trace.trace_id, "label": trace.label, "ts": trace.started_at, **s},
+                        default=str) for s in trace.spans]
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    with _FILE_LOCK:
+        # Keep one rotated file so the trace log can't grow without bound
+        if os.path.exists(path) and os.path.getsize(path) > TRACE_MAX_MB * 1024 * 1024:
+            os.replace(path, path + ".1")
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+
+
+def trace_frame(trace: Trace) -> pd.DataFrame:
+    """Spans in call order with indented names, total and self milliseconds and % of the rerun."""
+    spans = sorted(trace.spans, key=lambda s: s["start"])
+    if not spans:
+        return pd.DataFrame(columns=["span", "ms", "self_ms", "share"])
+    child_time = {}
+    for s in spans:
+        child_time[s["parent"]] = child_time.get(s["parent"], 0.0) + s["duration"]
+    total = trace.duration or max(s["start"] + s["duration"] for s in spans)
+    return pd.DataFrame({
+        "span": [" " * s["depth"] + ("└ " if s["depth"] else "") + s["name"]
+                 + (f" ⚠ {s['error']}" if s["error"] else "") for s in spans],
+        "ms": [s["duration"] * 1e3 for s in spans],
+        "self_ms": [max(s["duration"] - child_time.get(s["id"], 0.0), 0.0) * 1e3 for s in spans],
+        "share": [s["duration"] / total * 100.0 if total else 0.0 for s in spans],
+    })
+
+
+def load_traces(path=TRACE_PATH) -> pd.DataFrame:
+    """Every recorded span from the JSONL file (and its rotated predecessor)."""
+    frames = [pd.read_json(p, lines=True) for p in (path + ".1", path)
+              if os.path.exists(p) and os.path.getsize(p)]
+    return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+
+def summarize_traces(df: pd.DataFrame) -> pd.DataFrame:
+    """Per span name: count and p50/p95/max milliseconds, slowest p95 first."""
+    if df.empty:
+        return df
+    ms = df.assign(ms=df["duration"] * 1e3).groupby("name")["ms"]
+    out = pd.DataFrame({"count": ms.size(), "p50_ms": ms.median(), "p95_ms": ms.quantile(0.95), "max_ms": ms.max()})
+    return out.sort_values("p95_ms", ascending=False)
+
+
+if __name__ == "__main__":
+    df = load_traces(sys.argv[1] if len(sys.argv) > 1 else TRACE_PATH)
+    if df.empty:
+        print("No traces recorded yet.")
+    else:
+        print(f"{df['trace_id'].nunique()} reruns, {len(df)} spans\n")
+        print(summarize_traces(df).round(1).to_string())
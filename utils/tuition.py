@@ -6,6 +6,8 @@ Purpose:     Provides data utilities for loading, cleaning, and matching CMU
              tuition datasets. Supports preprocessing of multi-sheet Excel files,
              normalization of tuition units, and fuzzy-matching logic to map
              student records to corresponding tuition information.
+             `load_tuition` serves the latest crawl saved by the background
+             refresher, falling back to the preprocessed Excel file.
 
 Course:      95-888 Data Focused Python (Fall 2025, Section B1)
 Team:        Pink Team
@@ -16,14 +18,24 @@ Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
 '''
 
 
+import os
+import threading
+
 import pandas as pd
 import re
 import difflib
 
+from config import TUITION_PATH
+from utils.row_keys import hash_rows
+from utils.snapshots import load_snapshot, snapshot_mtime
+from utils.students import get_student_keywords
+from utils.tracing import traced
+
 # ----------------------------
 #  Tuition Utilities
 # ----------------------------
 
+@traced()
 def load_tuition_excel(path: str) -> pd.DataFrame:
     """
     Load your manually preprocessed tuition Excel (can contain multiple sheets).
@@ -47,6 +59,39 @@ def load_tuition_excel(path: str) -> pd.DataFrame:
     return df
 
 
+_TUITION_LOCK = threading.Lock()
+_TUITION = (None, None)   # (source key, cleaned frame)
+
+
+@traced()
+def load_tuition(path=TUITION_PATH) -> pd.DataFrame:
+    """
+    Normalized, deduplicated tuition rows from the latest crawl snapshot
+    (written by services/refresher.py), or from the Excel file at `path` when
+    no crawl has been saved. Re-read only when the source file changes; the
+    frame is shared, so treat it as read-only. attrs['source'] is 'crawl'
+    or 'excel', attrs['as_of'] the crawl time.
+    """
+    global _TUITION
+    mtime = snapshot_mtime("tuition")
+    key = ("crawl", mtime) if mtime is not None else ("excel", path, os.path.getmtime(path))
+    with _TUITION_LOCK:
+        if _TUITION[0] == key:
+            return _TUITION[1]
+    df, saved_at = load_snapshot("tuition") if mtime is not None else (None, None)
+    if df is None or df.empty:
+        df, saved_at, key = load_tuition_excel(path), None, ("excel", path, os.path.getmtime(path))
+        df.attrs["source"] = "excel"
+    else:
+        df.attrs["source"] = "crawl"
+    df.attrs["as_of"] = saved_at
+    clean = dedupe_tuition(normalize_tuition_units(df))
+    with _TUITION_LOCK:
+        _TUITION = (key, clean)
+    return clean
+
+
+@traced()
 def normalize_tuition_units(df: pd.DataFrame) -> pd.DataFrame:
     """Normalize unit text into consistent categories."""
     if df.empty:
@@ -67,6 +112,26 @@ def normalize_tuition_units(df: pd.DataFrame) -> pd.DataFrame:
     return df
 
 
+# What identifies one fee across academic years and crawls (compared as normalized text)
+FEE_KEY_COLUMNS = ["school", "program", "item", "unit"]
+
+
+# Years and terms ("2025-2026", "Fall 2025") the pages put into school and item labels
+_YEAR_RE = re.compile(r"\b(?:(?:fall|spring|summer)\s+)?(?:19|20)\d{2}(?:\s*[-–/]\s*(?:19|20)?\d{2})?\b")
+
+
+def _fee_key_text(values):
+    """Lower-cased, whitespace-collapsed text without years and terms, so one fee matches across academic years."""
+    text = pd.Series(values, dtype=object).astype(str).str.lower()
+    return text.str.replace(_YEAR_RE, "", regex=True).str.replace(r"\s+", " ", regex=True).str.strip().to_numpy(dtype=object)
+
+
+def fee_keys(df: pd.DataFrame):
+    """uint64 key per row from the normalized FEE_KEY_COLUMNS (see utils/tuition_diff.py)."""
+    return hash_rows(df, FEE_KEY_COLUMNS, normalize=True, normalizer=_fee_key_text)
+
+
+@traced()
 def dedupe_tuition(df: pd.DataFrame) -> pd.DataFrame:
     """Remove duplicates."""
     if df.empty:
@@ -90,6 +155,7 @@ def normalize_school_name(name: str) -> str:
     return s.strip()
 
 
+@traced()
 def filter_by_school_and_known_units(df: pd.DataFrame, school: str, department: str = None):
     """
     Match tuition data by student's school (robust fuzzy match, fallback to department).
@@ -122,4 +188,22 @@ def filter_by_school_and_known_units(df: pd.DataFrame, school: str, department:
     subset = subset.drop_duplicates()
     subset = subset.sort_values(by=["unit","amount"], ascending=[True, False])
 
-    return subset
\ No newline at end of file
+    return subset
+
+
+@traced("tuition match")
+def get_tuition_for_student(df, student):
+    """
+    Tuition rows for a student's school (see filter_by_school_and_known_units),
+    else the first program-keyword match. Returns (rows, matched key).
+    """
+    p = student.get("program", {})
+    school, dept = p.get("school", ""), p.get("department", "")
+    subset = filter_by_school_and_known_units(df, school, dept)
+    if not subset.empty:
+        return subset, school
+    for kw in get_student_keywords(student):
+        match = df[df["program"].astype(str).str.contains(kw, case=False, na=False)]
+        if not match.empty:
+            return match, kw
+    return pd.DataFrame(columns=df.columns), "—"
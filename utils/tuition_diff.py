@@ -0,0 +1,167 @@
+'''
+-----------------------------------------------------------------------------
+Project:     brok@CMU
+File:        tuition_diff.py
+Purpose:     Year-over-year (or crawl-over-crawl) tuition diffs. Both sides
+             are keyed by hashing the normalized (school, program, item, unit)
+             of every row into one uint64 (utils/row_keys.py), and the join is
+             a hash lookup over those integers, so comparing two snapshots
+             never compares strings row by row. Rows sharing a key on one
+             side (e.g. several per-credit tiers) are paired in amount order.
+             The result lists added, removed and changed fees with their old
+             and new amounts and the percent change; it powers the "What
+             changed this year" view on the tuition tab.
+
+Course:      95-888 Data Focused Python (Fall 2025, Section B1)
+Team:        Pink Team
+Members:     Meghana Dhruv (meghanad), Yiying Lu (yiyinglu),
+             Shreya Verma (shreyave), Mengzhang Yin (mengzhay),
+             Malikah Nathani (mnathani)
+-----------------------------------------------------------------------------
+'''
+
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from utils.row_keys import combine_keys
+from utils.snapshots import list_versions, load_snapshot
+from utils.tracing import traced
+from utils.tuition import FEE_KEY_COLUMNS, fee_keys, normalize_tuition_units
+
+DIFF_COLUMNS = ["status", *FEE_KEY_COLUMNS, "old_amount", "new_amount", "change", "pct_change"]
+_STATUS_ORDER = {"changed": 0, "added": 1, "removed": 2, "unchanged": 3}
+_ACADEMIC_YEAR_RX = re.compile(r"^(\d{4})-(\d{2})$")
+
+
+def _paired_keys(df: pd.DataFrame) -> np.ndarray:
+    """Fee keys made unique per side: the k-th row (by amount) sharing a key is mixed with k."""
+    keys = fee_keys(df)
+    order = np.argsort(keys, kind="stable")
+    repeat = keys[order][1:] == keys[order][:-1]
+    if not repeat.any():
+        return keys
+    in_run = np.zeros(len(keys), dtype=bool)
+    in_run[1:] |= repeat
+    in_run[:-1] |= repeat
+    rows = order[in_run]
+    amount = pd.to_numeric(df["amount"].iloc[rows], errors="coerce").to_numpy(dtype=float)
+    rows = rows[np.lexsort((amount, keys[rows]))]
+    run_keys = keys[rows]
+    idx = np.arange(len(rows))
+    run_start = np.maximum.accumulate(np.where(np.r_[True, run_keys[1:] != run_keys[:-1]], idx, 0))
+    ordinal = (idx - run_start).astype(np.uint64)
+    out = keys.copy()
+    out[rows] = np.where(ordinal == 0, run_keys, combine_keys(run_keys, ordinal))
+    return out
+
+
+def _side(df, rows, amount_col):
+    out = df.iloc[rows][FEE_KEY_COLUMNS].reset_index(drop=True)
+    out[amount_col] = pd.to_numeric(df["amount"].iloc[rows], errors="coerce").to_numpy(dtype=float)
+    return out
+
+
+@traced()
+def diff_tuition(old: pd.DataFrame, new: pd.DataFrame, include_unchanged=False) -> pd.DataFrame:
+    """
+    Fees added, removed and changed between two tuition frames (DIFF_COLUMNS).
+    Changed rows come first, largest absolute percent change first;
+    pct_change is NaN when the old amount is 0 or missing.
+    """
+    if old.empty and new.empty:
+        return pd.DataFrame(columns=DIFF_COLUMNS)
+    old_keys, new_keys = _paired_keys(old), _paired_keys(new)
+
+    index = pd.Index(old_keys)
+    if index.is_unique:
+        pos = index.get_indexer(new_keys)
+    else:   # a 64-bit collision; match the first of the colliding rows
+        first = np.flatnonzero(~index.duplicated())
+        pos = index[first].get_indexer(new_keys)
+        pos = np.where(pos >= 0, first[np.maximum(pos, 0)], -1)
+    matched = pos >= 0
+    old_rows = pos[matched]
+    new_rows = np.flatnonzero(matched)
+    old_seen = np.zeros(len(old_keys), dtype=bool)
+    old_seen[old_rows] = True
+
+    pairs = _side(new, new_rows, "new_amount")
+    pairs["old_amount"] = pd.to_numeric(old["amount"].iloc[old_rows], errors="coerce").to_numpy(dtype=float)
+    same = np.isclose(pairs["old_amount"], pairs["new_amount"]) | (pairs["old_amount"].isna() & pairs["new_amount"].isna())
+    pairs["status"] = np.where(same, "unchanged", "changed")
+    if not include_unchanged:
+        pairs = pairs[~same]
+
+    added = _side(new, np.flatnonzero(~matched), "new_amount").assign(status="added", old_amount=np.nan)
+    removed = _side(old, np.flatnonzero(~old_seen), "old_amount").assign(status="removed", new_amount=np.nan)
+
+    out = pd.concat([pairs, added, removed], ignore_index=True)
+    out["change"] = out["new_amount"] - out["old_amount"]
+    base = out["old_amount"].where(out["old_amount"] != 0)
+    out["pct_change"] = out["change"] / base * 100
+    rank = out["status"].map(_STATUS_ORDER)
+    out = out.assign(_rank=rank, _abs=out["pct_change"].abs()).sort_values(
+        ["_rank", "_abs", "school", "program", "item"], ascending=[True, False, True, True, True], na_position="last")
+    return out[DIFF_COLUMNS].reset_index(drop=True)
+
+
+def _is_academic_year(label) -> bool:
+    """'2025-26': YYYY-YY naming two consecutive years."""
+    m = _ACADEMIC_YEAR_RX.match(label)
+    return bool(m) and (int(m.group(1)) + 1) % 100 == int(m.group(2))
+
+
+def academic_years(df: pd.DataFrame) -> list:
+    """
+    Well-formed academic years (consecutive YYYY-YY) present in `df`, oldest
+    first. Crawler labels such as '2020-25' span several years and are left
+    out; they are not one year's price list.
+    """
+    if "academic_year" not in df.columns:
+        return []
+    return sorted(y for y in df["academic_year"].dropna().astype(str).unique() if _is_academic_year(y))
+
+
+def shares_fees(diff: pd.DataFrame) -> bool:
+    """Whether the two sides of a diff built with include_unchanged=True have any fee in common."""
+    return bool(diff["status"].isin(["changed", "unchanged"]).any())
+
+
+def diff_academic_years(df: pd.DataFrame, old_year: str, new_year: str, **kwargs) -> pd.DataFrame:
+    """diff_tuition between two academic years of one tuition frame."""
+    year = df["academic_year"].astype(str)
+    return diff_tuition(df[year == old_year], df[year == new_year], **kwargs)
+
+
+def diff_crawls(old_version=None, new_version=None, name="tuition", **kwargs):
+    """
+    diff_tuition between two saved crawls (utils/snapshots.py versions;
+    defaults to the latest two). Returns (diff, (old_version, new_version)),
+    or (None, None) when fewer than two crawls are kept.
+    """
+    versions = list_versions(name)
+    if len(versions) < 2 and not (old_version and new_version):
+        return None, None
+    old_version = old_version or versions[-2]
+    new_version = new_version or versions[-1]
+    old, _ = load_snapshot(name, old_version)
+    new, _ = load_snapshot(name, new_version)
+    if old is None or new is None:
+        return None, None
+    diff = diff_tuition(normalize_tuition_units(old), normalize_tuition_units(new), **kwargs)
+    return diff, (old_version, new_version)
+
+
+def summarize_diff(diff: pd.DataFrame) -> dict:
+    """Counts per status and the median percent change of changed fees."""
+    counts = diff["status"].value_counts()
+    changed = diff.loc[diff["status"] == "changed", "pct_change"].dropna()
+    return {
+        "added": int(counts.get("added", 0)),
+        "removed": int(counts.get("removed", 0)),
+        "changed": int(counts.get("changed", 0)),
+        "median_pct_change": float(changed.median()) if not changed.empty else None,
+    }